@@ -1,10 +1,233 @@
-from flask import Flask, render_template
-# from utils import
+import os
+from itertools import chain
+
+from flask import Flask, Response, jsonify, render_template, request, send_file, stream_with_context
+
+import leakcheck
+import mutations
+import wordlists
+from cache import SizedLRUCache, StrategyMemo
+from jobqueue import DONE, JobQueue, QueueFull
+
 app = Flask(__name__)
+app.config.update(
+    LETHE_MAX_DEPTH=3,
+    LETHE_DEFAULT_MAX_MUTATIONS=10_000,
+    LETHE_MAX_MUTATIONS=1_000_000,
+    LETHE_CACHE_BYTES=256 * 2**20,
+    LETHE_CACHE_ENTRY_BYTES=16 * 2**20,
+    LETHE_MEMO_BYTES=64 * 2**20,
+    LETHE_STREAM_CHUNK=2000,
+    LETHE_JOB_DIR=None,  # defaults to <instance path>/jobs
+    LETHE_JOB_WORKERS=2,
+    LETHE_JOB_MAX_PENDING=16,
+    LETHE_JOB_MAX_PASSWORDS=10_000,
+    LETHE_JOB_MAX_MUTATIONS=100_000_000,
+    LETHE_LEAK_INDEX=leakcheck.DEFAULT_INDEX,  # built with `cli.py leak-index`
+    LETHE_LEAKCHECK_MAX_CANDIDATES=1_000_000,
+)
+
+# Finished responses keyed by (password, depth, max_mutations, wordlist version).
+result_cache = SizedLRUCache(app.config['LETHE_CACHE_BYTES'], app.config['LETHE_CACHE_ENTRY_BYTES'])
+
+# Capitalization and leetspeak results, shared by every request: requests
+# that miss the response cache still reuse the strings they have in common.
+strategy_memo = StrategyMemo(app.config['LETHE_MEMO_BYTES']) if app.config['LETHE_MEMO_BYTES'] else None
+
+# Created on first use so importing the app does not start a process pool.
+job_queue = None
+
+leak_index = None
+
+
+def get_leak_index():
+    global leak_index
+    if leak_index is None:
+        leak_index = leakcheck.LeakIndex(app.config['LETHE_LEAK_INDEX'])
+    return leak_index
+
+
+def get_job_queue():
+    global job_queue
+    if job_queue is None:
+        job_queue = JobQueue(app.config['LETHE_JOB_DIR'] or os.path.join(app.instance_path, 'jobs'),
+                             workers=app.config['LETHE_JOB_WORKERS'],
+                             max_pending=app.config['LETHE_JOB_MAX_PENDING'])
+    return job_queue
+
 
 @app.route('/')
 def index():
     return render_template('index.html')
 
+
+def _int_arg(name, default, maximum, args=None):
+    value = (request.args if args is None else args).get(name, default)
+    try:
+        value = int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be an integer")
+    if not 0 <= value <= maximum:
+        raise ValueError(f"{name} must be between 0 and {maximum}")
+    return value
+
+
+def _stream_mutations(password, lists, depth, max_mutations, key):
+    """Yields newline-separated chunks and caches the body if it stays small enough."""
+    suffixes, prefixes, base_words = lists
+    candidates = mutations.iter_mutations(password, suffixes, prefixes, base_words, depth=depth,
+                                          max_mutations=max_mutations, memo=strategy_memo)
+    chunk_size = app.config['LETHE_STREAM_CHUNK']
+    parts = []
+    size = 0
+    chunk = []
+    for candidate in chain(candidates, [None]):
+        if candidate is not None:
+            chunk.append(candidate)
+            if len(chunk) < chunk_size:
+                continue
+        if not chunk:
+            break
+        data = ('\n'.join(chunk) + '\n').encode('utf-8')
+        chunk = []
+        if parts is not None:
+            size += len(data)
+            if size <= result_cache.max_entry_size:
+                parts.append(data)
+            else:
+                parts = None
+        yield data
+    # Only complete responses are cached; a client that disconnects early
+    # closes this generator before we get here.
+    if parts is not None:
+        result_cache.put(key, b''.join(parts), size)
+
+
+@app.route('/api/mutations')
+def mutations_api():
+    """
+    Streams the mutations of ``password`` as text/plain, one per line.
+
+    Query parameters: password (required), depth, max_mutations (0 means the
+    configured maximum). Repeated requests are served from an LRU cache.
+    """
+    password = request.args.get('password')
+    if password is None:
+        return jsonify(error="password is required"), 400
+    try:
+        depth = _int_arg('depth', 1, app.config['LETHE_MAX_DEPTH'])
+        max_mutations = _int_arg('max_mutations', app.config['LETHE_DEFAULT_MAX_MUTATIONS'],
+                                 app.config['LETHE_MAX_MUTATIONS'])
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+    max_mutations = max_mutations or app.config['LETHE_MAX_MUTATIONS']
+
+    # refresh() rereads the lists when a source changed, so the version in
+    # the key is the one the candidates are generated from.
+    registry = wordlists.registry
+    key = (password, depth, max_mutations, registry.refresh())
+    body = result_cache.get(key)
+    if body is not None:
+        return Response(body, mimetype='text/plain', headers={'X-Cache': 'HIT'})
+    lists = (registry.unique('suffix'), registry.unique('prefix'), registry.unique('baseword'))
+    return Response(stream_with_context(_stream_mutations(password, lists, depth, max_mutations, key)),
+                    mimetype='text/plain', headers={'X-Cache': 'MISS'})
+
+
+@app.route('/api/cache')
+def cache_stats():
+    stats = result_cache.stats()
+    if strategy_memo is not None:
+        stats['strategy_memo'] = strategy_memo.stats()
+    return jsonify(stats)
+
+
+@app.route('/api/leakcheck', methods=['POST'])
+def leakcheck_api():
+    """
+    Checks a batch of candidates against the leak index.
+
+    The body is text/plain with one candidate per line, read as a stream.
+    Lines are looked up as raw bytes, like the corpus the index was built
+    from, so entries that are not valid UTF-8 are found too. Returns JSON
+    with the number checked and the candidates found; hits that are not
+    valid UTF-8 are returned as $HEX[...].
+    """
+    try:
+        index = get_leak_index()
+    except (OSError, ValueError):
+        return jsonify(error="no leak index is configured"), 503
+    limit = app.config['LETHE_LEAKCHECK_MAX_CANDIDATES']
+    candidates = []
+    for line in request.stream:
+        line = line.rstrip(b'\r\n')
+        if line:
+            if len(candidates) >= limit:
+                return jsonify(error=f"at most {limit} candidates per request"), 413
+            candidates.append(line)
+    hits = [_hit_text(hit) for hit in index.check(candidates)]
+    return jsonify(checked=len(candidates), found=len(hits), hits=hits)
+
+
+def _hit_text(raw):
+    try:
+        return raw.decode('utf-8')
+    except UnicodeDecodeError:
+        return '$HEX[' + raw.hex() + ']'
+
+
+
+@app.route('/api/jobs', methods=['POST'])
+def submit_job():
+    """
+    Queues a mutation job and returns its id with status 202.
+
+    JSON body: passwords (list) or password, depth, max_mutations (per
+    password; 0 means the configured maximum). Returns 503 when the queue is full.
+    """
+    body = request.get_json(silent=True)
+    if not isinstance(body, dict):
+        return jsonify(error="expected a JSON object"), 400
+    passwords = body.get('passwords', [body['password']] if 'password' in body else None)
+    if (not isinstance(passwords, list) or not passwords
+            or not all(isinstance(p, str) for p in passwords)):
+        return jsonify(error="password or passwords (a list of strings) is required"), 400
+    if len(passwords) > app.config['LETHE_JOB_MAX_PASSWORDS']:
+        return jsonify(error=f"at most {app.config['LETHE_JOB_MAX_PASSWORDS']} passwords per job"), 400
+    try:
+        depth = _int_arg('depth', 2, app.config['LETHE_MAX_DEPTH'], body)
+        max_mutations = _int_arg('max_mutations', 0, app.config['LETHE_JOB_MAX_MUTATIONS'], body)
+    except ValueError as e:
+        return jsonify(error=str(e)), 400
+    max_mutations = max_mutations or app.config['LETHE_JOB_MAX_MUTATIONS']
+
+    try:
+        job_id = get_job_queue().submit(passwords, depth=depth, max_mutations=max_mutations)
+    except QueueFull as e:
+        return jsonify(error=str(e)), 503, {'Retry-After': '30'}
+    return jsonify(id=job_id, status=f"/api/jobs/{job_id}"), 202
+
+
+@app.route('/api/jobs/<job_id>')
+def job_status(job_id):
+    try:
+        return jsonify(get_job_queue().status(job_id))
+    except KeyError:
+        return jsonify(error="unknown job"), 404
+
+
+@app.route('/api/jobs/<job_id>/output')
+def job_output(job_id):
+    queue = get_job_queue()
+    try:
+        status = queue.status(job_id)
+    except KeyError:
+        return jsonify(error="unknown job"), 404
+    if status['state'] != DONE:
+        return jsonify(error=f"job is {status['state']}"), 409
+    return send_file(queue.get(job_id).output_path, mimetype='text/plain',
+                     as_attachment=True, download_name=f"{job_id}.txt")
+
+
 if __name__ == '__main__':
     app.run(debug=True)
@@ -0,0 +1,244 @@
+# batch.py
+"""
+Batch mutation of many input passwords across a process pool.
+
+Workers open the memory-mapped wordlist store (see wordstore.py) once, in
+the pool initializer, so the prefix/suffix/baseword lists are shared
+read-only pages and never pickled per task. Each task is one password, or
+one shard of a password's keyspace. Its candidates are streamed back
+while the task runs, so a worker never holds more than a chunk of output
+however large the expansion is.
+
+All tasks share one bounded queue, and the parent drains it as chunks
+arrive, whichever task sent them. Chunks of the task at the head of the
+input order are yielded at once. Later tasks' chunks wait in the parent
+until their turn: the first few in memory, the rest pickled to a temporary
+file. A long task at the head therefore never stalls the tasks behind it,
+and a slow consumer still bounds the workers, since the queue fills up
+when nothing drains it.
+"""
+import os
+import pickle
+import tempfile
+from collections import deque
+from itertools import count
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import Manager
+from queue import Empty, Full
+
+import wordstore
+from cache import StrategyMemo
+from dedupe import make_dedupe
+from mutations import iter_mutations
+
+# Set in each worker by _init_worker: (suffixes, prefixes, base_words)
+_worker_lists = None
+# Strategy memo kept for the worker's lifetime, so inputs that share
+# strings reuse each other's capitalization and leetspeak results.
+_worker_memo = None
+
+
+def _init_worker(store_path, memo_bytes=0):
+    global _worker_lists, _worker_memo
+    store = wordstore.WordStore(store_path)
+    _worker_lists = (store['suffix'], store['prefix'], store['baseword'])
+    _worker_memo = StrategyMemo(memo_bytes) if memo_bytes else None
+
+
+# Chunks per worker that may wait on the shared queue before tasks block,
+# and chunks a waiting task keeps in memory before it spills to disk.
+QUEUED_CHUNKS = 2
+
+
+def _put(queue, stop, item):
+    """Waits for room on ``queue``; False if the parent gave up meanwhile."""
+    while not stop.is_set():
+        try:
+            queue.put(item, timeout=0.1)
+            return True
+        except Full:
+            pass
+    return False
+
+
+def _mutate_task(task_id, password, depth, max_mutations, shard, chunk_size, queue, stop):
+    """Puts (task_id, chunk) on ``queue`` for each chunk of candidates, then (task_id, None)."""
+    suffixes, prefixes, base_words = _worker_lists
+    chunk = []
+    for m in iter_mutations(password, suffixes, prefixes, base_words, depth,
+                            max_mutations, shard=shard, memo=_worker_memo):
+        chunk.append(m)
+        if len(chunk) >= chunk_size:
+            if not _put(queue, stop, (task_id, chunk)):
+                return
+            chunk = []
+    if chunk and not _put(queue, stop, (task_id, chunk)):
+        return
+    _put(queue, stop, (task_id, None))
+
+
+class _PendingTask:
+    """
+    A submitted task and the chunks it has sent before reaching the head
+    of the input order. Up to ``memory_chunks`` stay in memory; the rest
+    are pickled to a temporary file in arrival order.
+    """
+
+    def __init__(self, task_id, future, memory_chunks=QUEUED_CHUNKS):
+        self.task_id = task_id
+        self.future = future
+        self.memory_chunks = memory_chunks
+        # Set once the end marker arrived or the task failed without one.
+        self.finished = False
+        self._memory = deque()
+        self._file = None
+        self._spilled = 0
+
+    def append(self, chunk):
+        if self._file is None and len(self._memory) < self.memory_chunks:
+            self._memory.append(chunk)
+            return
+        if self._file is None:
+            self._file = tempfile.TemporaryFile(prefix='lethe-batch-')
+        pickle.dump(chunk, self._file, pickle.HIGHEST_PROTOCOL)
+        self._spilled += 1
+
+    def drain(self):
+        """Yields and forgets the buffered chunks, oldest first."""
+        while self._memory:
+            yield self._memory.popleft()
+        if self._file is not None:
+            self._file.seek(0)
+            for _ in range(self._spilled):
+                yield pickle.load(self._file)
+            self.close()
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            self._spilled = 0
+
+
+def _tasks(passwords, shards):
+    for password in passwords:
+        if shards > 1:
+            for index in range(shards):
+                yield password, (index, shards)
+        else:
+            yield password, None
+
+
+def iter_batch_mutations(passwords, depth=1, max_mutations=None, workers=None, shards=1,
+                         dedupe=False, chunk_size=10000, store_path=wordstore.DEFAULT_STORE,
+                         memo_bytes=0):
+    """
+    Mutates every password in ``passwords`` on a process pool.
+
+    Parameters:
+        passwords (iterable): Input passwords; consumed lazily.
+        depth (int): Mutation depth passed to iter_mutations.
+        max_mutations (int): Optional cap per password (per shard when sharded).
+        workers (int): Pool size, defaults to os.cpu_count().
+        shards (int): Split each password's first-layer frontier into this many
+            independent tasks, for inputs where one password dominates.
+        dedupe: Drop candidates already yielded for any earlier task. True or
+            'set' for an exact set, 'bloom' or 'spill' for the backends in
+            dedupe.py, or any object with ``in`` and ``add()``.
+        chunk_size (int): Maximum number of candidates per yielded chunk.
+        store_path (str): Compiled wordlist store; rebuilt first if stale.
+        memo_bytes (int): Size of each worker's strategy memo (see
+            cache.StrategyMemo), worth enabling when inputs share many
+            strings; 0 (the default) disables it.
+
+    Yields:
+        list: Chunks of candidates, in input order.
+    """
+    wordstore.open_store(store_path).close()
+    workers = workers or os.cpu_count() or 1
+    if dedupe is True:
+        seen = set()
+    elif isinstance(dedupe, str):
+        seen = make_dedupe(dedupe)
+    elif dedupe is None or dedupe is False:
+        seen = None
+    else:
+        seen = dedupe
+    tasks = _tasks(passwords, shards)
+
+    try:
+        with Manager() as manager, ProcessPoolExecutor(workers, initializer=_init_worker,
+                                                       initargs=(store_path, memo_bytes)) as pool:
+            pending = deque()
+            by_id = {}
+            task_ids = count()
+            # Set when the consumer stops early, so tasks blocked on a full
+            # queue return instead of keeping the pool from shutting down.
+            stop = manager.Event()
+            queue = manager.Queue(workers * QUEUED_CHUNKS)
+
+            def submit():
+                for password, shard in tasks:
+                    task_id = next(task_ids)
+                    future = pool.submit(_mutate_task, task_id, password, depth, max_mutations,
+                                         shard, chunk_size, queue, stop)
+                    by_id[task_id] = task = _PendingTask(task_id, future)
+                    pending.append(task)
+                    return True
+                return False
+
+            def fresh(results):
+                if seen is None:
+                    return results
+                new = []
+                for m in results:
+                    if m not in seen:
+                        seen.add(m)
+                        new.append(m)
+                return new
+
+            # Keep a bounded number of tasks in flight, which also bounds
+            # how many of them can be buffering output at once.
+            while len(pending) < workers * 2 and submit():
+                pass
+
+            try:
+                while pending:
+                    head = pending[0]
+                    for results in head.drain():
+                        results = fresh(results)
+                        if results:
+                            yield results
+                    if head.finished:
+                        # Raises if the task failed.
+                        head.future.result()
+                        pending.popleft()
+                        del by_id[head.task_id]
+                        submit()
+                        continue
+                    try:
+                        task_id, results = queue.get(timeout=0.1)
+                    except Empty:
+                        # A task that failed never sends its end marker.
+                        for task in pending:
+                            if task.future.done() and task.future.exception() is not None:
+                                task.finished = True
+                        continue
+                    task = by_id[task_id]
+                    if results is None:
+                        task.finished = True
+                    elif task is head:
+                        results = fresh(results)
+                        if results:
+                            yield results
+                    else:
+                        task.append(results)
+            finally:
+                stop.set()
+                for task in pending:
+                    task.future.cancel()
+                    task.close()
+    finally:
+        # Backends built here from a name are ours to clean up.
+        if isinstance(dedupe, str) and hasattr(seen, 'close'):
+            seen.close()
@@ -0,0 +1,48 @@
+"""
+Throughput of batch.iter_batch_mutations for increasing worker counts.
+
+    python benchmarks/bench_batch.py --passwords 200 --max-mutations 20000
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import wordlists  # noqa: E402
+import wordstore  # noqa: E402
+from batch import iter_batch_mutations  # noqa: E402
+
+
+def run(passwords, workers, depth, max_mutations):
+    start = time.perf_counter()
+    produced = sum(len(chunk) for chunk in iter_batch_mutations(
+        passwords, depth=depth, max_mutations=max_mutations, workers=workers))
+    return produced, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--passwords', type=int, default=200)
+    parser.add_argument('--depth', type=int, default=1)
+    parser.add_argument('--max-mutations', type=int, default=20000)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    wordstore.open_store().close()
+    passwords = wordlists.registry.unique('baseword')[:args.passwords]
+    baseline = None
+    workers = 1
+    while workers <= args.max_workers:
+        produced, elapsed = run(passwords, workers, args.depth, args.max_mutations)
+        rate = produced / elapsed
+        baseline = baseline or rate
+        print(f"workers={workers:<3} {produced} candidates in {elapsed:.2f}s "
+              f"= {rate:,.0f}/s (x{rate / baseline:.2f})")
+        workers *= 2
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""
+Memory and speed per million candidates for each dedupe backend.
+
+'external' is extdedupe.ExternalDedupe: candidates go in by chunk and the
+time includes reading the sorted unique stream back out.
+
+    python benchmarks/bench_dedupe.py --candidates 1000000
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+from itertools import islice
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dedupe import BloomFilter, SpillSet  # noqa: E402
+from extdedupe import ExternalDedupe  # noqa: E402
+
+
+def candidates(n):
+    # Realistic shapes: word + digits, the bulk of suffix-layer output.
+    words = ['password', 'dragon', 'letmein', 'sunshine', 'monkey']
+    for i in range(n):
+        yield f"{words[i % len(words)]}{i}"
+
+
+def fill(backend, n):
+    if isinstance(backend, ExternalDedupe):
+        stream = candidates(n)
+        for chunk in iter(lambda: list(islice(stream, 65536)), []):
+            backend.update(chunk)
+        for _ in backend.iter_raw():
+            pass
+        return
+    for c in candidates(n):
+        if c not in backend:
+            backend.add(c)
+
+
+def measure(name, factory, n):
+    # Memory and speed are measured in separate passes because tracemalloc
+    # slows allocation-heavy code down by an order of magnitude.
+    tracemalloc.start()
+    backend = factory()
+    fill(backend, n)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    close(backend)
+
+    backend = factory()
+    start = time.perf_counter()
+    fill(backend, n)
+    elapsed = time.perf_counter() - start
+
+    millions = n / 1_000_000
+    line = f"{name:<24} {peak / 2**20 / millions:8.1f} MiB/M  {n / elapsed:12,.0f} candidates/s"
+    if isinstance(backend, SpillSet):
+        backend.flush()
+        line += f"  (+{os.path.getsize(backend.path) / 2**20 / millions:.1f} MiB/M on disk)"
+    if isinstance(backend, ExternalDedupe):
+        line += f"  (+{backend.spilled_bytes / 2**20 / millions:.1f} MiB/M spilled, gzip)"
+    close(backend)
+    print(line)
+
+
+def close(backend):
+    if hasattr(backend, 'close'):
+        backend.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--candidates', type=int, default=1_000_000)
+    args = parser.parse_args(argv)
+    n = args.candidates
+
+    measure('set', set, n)
+    for rate in (0.01, 0.001):
+        measure(f'bloom(p={rate})', lambda: BloomFilter(capacity=n, error_rate=rate), n)
+    measure('spill(10% in memory)', lambda: SpillSet(memory_items=max(1, n // 10)), n)
+    measure('external(10% in memory)', lambda: ExternalDedupe(max_items=max(1, n // 10)), n)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,60 @@
+"""
+Export throughput: CandidateWriter vs a print()-per-line loop.
+
+Candidates are generated up front so only the writing is timed.
+
+    python benchmarks/bench_export.py --candidates 2000000 --target /dev/null
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import wordlists  # noqa: E402
+from export import CandidateWriter  # noqa: E402
+from mutations import iter_mutations  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--candidates', type=int, default=2_000_000)
+    parser.add_argument('--target', default=os.devnull, help="file or device to write to")
+    args = parser.parse_args(argv)
+
+    candidates = list(iter_mutations('password', wordlists.registry.unique('suffix'),
+                                     wordlists.registry.unique('prefix'),
+                                     wordlists.registry.unique('baseword'),
+                                     depth=2, max_mutations=args.candidates))
+    size = sum(len(c.encode('utf-8')) + 1 for c in candidates)
+    print(f"{len(candidates):,} candidates, {size / 2**20:.1f} MiB")
+
+    def report(name, elapsed):
+        print(f"  {name:<22} {elapsed:6.2f}s  {size / 2**20 / elapsed:8.1f} MiB/s  "
+              f"{len(candidates) / elapsed:12,.0f} lines/s")
+
+    with open(args.target, 'w', encoding='utf-8') as f:
+        start = time.perf_counter()
+        for candidate in candidates:
+            print(candidate, file=f)
+        report('print() per line', time.perf_counter() - start)
+
+    for name, options in (('writer plain', {}), ('writer hex', {'format': 'hex'})):
+        start = time.perf_counter()
+        with CandidateWriter(args.target, **options) as writer:
+            writer.write_many(candidates)
+        report(name, time.perf_counter() - start)
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        start = time.perf_counter()
+        with CandidateWriter(os.path.join(tmpdir, 'out.txt.gz')) as writer:
+            writer.write_many(candidates)
+        report('writer gzip level 1', time.perf_counter() - start)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,63 @@
+"""
+Hash-matching throughput per mode, per core and across the pool.
+
+    python benchmarks/bench_hashmatch.py --candidates 1000000 --salts 4 --workers 8
+"""
+import argparse
+import hashlib
+import os
+import random
+import string
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import hashmatch  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--candidates', type=int, default=1_000_000)
+    parser.add_argument('--hashes', type=int, default=100_000, help="target hashes per mode")
+    parser.add_argument('--salts', type=int, default=4, help="distinct salts in salted modes")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--batch-size', type=int, default=50_000)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    alphabet = string.ascii_lowercase + string.digits
+    candidates = [''.join(rng.choices(alphabet, k=rng.randint(6, 12))) for _ in range(args.candidates)]
+    salts = [f"s{i:04d}" for i in range(args.salts)]
+
+    print(f"{args.candidates:,} candidates, {args.hashes:,} hashes per mode, {args.salts} salts")
+    with tempfile.TemporaryDirectory() as tmpdir:
+        for algorithm in hashmatch.ALGORITHMS:
+            for mode in (algorithm, f"{algorithm}(pass.salt)", f"{algorithm}(salt.pass)"):
+                _, position = hashmatch.parse_mode(mode)
+                new = getattr(hashlib, algorithm)
+                path = os.path.join(tmpdir, 'hashes.txt')
+                with open(path, 'w') as f:
+                    for i in range(args.hashes):
+                        # Every 100th target is a real candidate so there are hits to report.
+                        word = candidates[i * 100 % len(candidates)] if i % 100 == 0 else f"#{i}"
+                        salt = salts[i % len(salts)]
+                        if position is None:
+                            f.write(new(word.encode()).hexdigest() + '\n')
+                        elif position == 'prefix':
+                            f.write(new((salt + word).encode()).hexdigest() + f":{salt}\n")
+                        else:
+                            f.write(new((word + salt).encode()).hexdigest() + f":{salt}\n")
+                for workers in sorted({1, args.workers}):
+                    stats = hashmatch.MatchStats()
+                    for _ in hashmatch.iter_matches(candidates, path, mode, workers=workers,
+                                                    batch_size=args.batch_size, stats=stats):
+                        pass
+                    print(f"{mode:<18} {workers:>3} worker(s) {stats.rate:14,.0f} H/s  "
+                          f"{stats.per_core_rate:12,.0f} H/s per core  ({stats.hits:,} hits)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
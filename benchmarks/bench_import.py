@@ -0,0 +1,47 @@
+"""
+Cold-import benchmark for the mutations module.
+
+Each run starts a fresh interpreter so nothing is cached between samples.
+
+    python benchmarks/bench_import.py --runs 10 --target 0.25
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROBE = (
+    "import time; start = time.perf_counter(); import mutations; "
+    "print(time.perf_counter() - start)"
+)
+
+
+def cold_import_time(module_probe=PROBE):
+    """Seconds spent importing mutations in a brand new interpreter."""
+    out = subprocess.run(
+        [sys.executable, '-c', module_probe],
+        cwd=ROOT, capture_output=True, text=True, check=True
+    )
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10)
+    parser.add_argument('--target', type=float, default=0.25,
+                        help="maximum acceptable median import time in seconds")
+    args = parser.parse_args(argv)
+
+    samples = [cold_import_time() for _ in range(args.runs)]
+    median = statistics.median(samples)
+    print(f"import mutations: median {median * 1000:.1f}ms, "
+          f"min {min(samples) * 1000:.1f}ms, max {max(samples) * 1000:.1f}ms "
+          f"over {args.runs} runs (target {args.target * 1000:.0f}ms)")
+    return 0 if median <= args.target else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
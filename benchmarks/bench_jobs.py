@@ -0,0 +1,56 @@
+"""
+Checkpoint overhead of jobs.MutationJob against writing iter_mutations output directly.
+
+    python benchmarks/bench_jobs.py --max-mutations 2000000
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import wordlists  # noqa: E402
+from jobs import MutationJob  # noqa: E402
+from mutations import iter_mutations  # noqa: E402
+
+
+def plain_run(passwords, path, depth, max_mutations, lists):
+    start = time.perf_counter()
+    emitted = 0
+    with open(path, 'wb') as out:
+        for password in passwords:
+            for candidate in iter_mutations(password, depth=depth, max_mutations=max_mutations, **lists):
+                out.write((candidate + '\n').encode('utf-8'))
+                emitted += 1
+    return emitted, time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--passwords', nargs='+', default=['password', 'dragon'])
+    parser.add_argument('--depth', type=int, default=1)
+    parser.add_argument('--max-mutations', type=int, default=2_000_000)
+    args = parser.parse_args(argv)
+
+    lists = {'suffixes': wordlists.registry.unique('suffix'),
+             'prefixes': wordlists.registry.unique('prefix'),
+             'base_words': wordlists.registry.unique('baseword')}
+    with tempfile.TemporaryDirectory() as tmpdir:
+        emitted, baseline = plain_run(args.passwords, os.path.join(tmpdir, 'plain.txt'),
+                                      args.depth, args.max_mutations, lists)
+        print(f"plain        {emitted / baseline:12,.0f} candidates/s")
+        for every, seconds in ((1_000_000, 10.0), (100_000, 1.0), (10_000, 0.0)):
+            job = MutationJob(args.passwords, os.path.join(tmpdir, f'job-{every}.txt'),
+                              depth=args.depth, max_mutations=args.max_mutations,
+                              checkpoint_every=every, checkpoint_seconds=seconds, **lists)
+            stats = job.run()
+            print(f"job/{every:<8} {stats['emitted'] / stats['elapsed']:12,.0f} candidates/s  "
+                  f"{stats['checkpoints']:5} checkpoints  {stats['overhead']:.2%} checkpointing  "
+                  f"({stats['elapsed'] / baseline - 1:+.1%} vs plain)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
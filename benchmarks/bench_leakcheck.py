@@ -0,0 +1,83 @@
+"""
+Leak index build time, open time and lookup throughput on a synthetic corpus.
+
+    python benchmarks/bench_leakcheck.py --entries 5000000 --queries 1000000
+"""
+import argparse
+import os
+import random
+import string
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import leakcheck  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--entries', type=int, default=5_000_000)
+    parser.add_argument('--queries', type=int, default=1_000_000)
+    parser.add_argument('--run-items', type=int, default=20_000_000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    alphabet = string.ascii_lowercase + string.digits
+
+    def word():
+        return ''.join(rng.choices(alphabet, k=rng.randint(6, 12)))
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        corpus = os.path.join(tmpdir, 'corpus.txt')
+        sample = []
+        with open(corpus, 'w') as f:
+            for i in range(args.entries):
+                w = word()
+                if i % max(1, args.entries // (args.queries // 2 or 1)) == 0:
+                    sample.append(w)
+                f.write(w + '\n')
+        queries = sample[:args.queries // 2] + [word() + '#' for _ in range(args.queries - len(sample[:args.queries // 2]))]
+        rng.shuffle(queries)
+        index_path = os.path.join(tmpdir, 'corpus.lki')
+
+        start = time.perf_counter()
+        header = leakcheck.build_index(corpus, index_path, run_items=args.run_items)
+        build = time.perf_counter() - start
+        print(f"build  {header['count']:,} entries in {build:.2f}s ({header['count'] / build:,.0f}/s), "
+              f"{os.path.getsize(index_path) / 2**20:.1f} MiB")
+
+        start = time.perf_counter()
+        index = leakcheck.LeakIndex(index_path)
+        print(f"open   {(time.perf_counter() - start) * 1000:.2f}ms")
+
+        modes = [('numpy' if leakcheck.np is not None else 'bisect', index)]
+        for name, idx in modes:
+            start = time.perf_counter()
+            found = sum(1 for _ in idx.check(queries))
+            elapsed = time.perf_counter() - start
+            print(f"check  {name:<8} {len(queries) / elapsed:12,.0f}/s  ({found:,} hits)")
+        if leakcheck.np is not None:
+            np, leakcheck.np = leakcheck.np, None
+            fallback = leakcheck.LeakIndex(index_path)
+            leakcheck.np = np
+            start = time.perf_counter()
+            found = sum(1 for _ in fallback.check(queries))
+            elapsed = time.perf_counter() - start
+            print(f"check  {'bisect':<8} {len(queries) / elapsed:12,.0f}/s  ({found:,} hits)")
+            fallback.close()
+        index.close()
+
+        if args.workers > 1:
+            start = time.perf_counter()
+            found = sum(1 for _ in leakcheck.iter_check_parallel(queries, index_path, workers=args.workers))
+            elapsed = time.perf_counter() - start
+            print(f"check  {args.workers} workers {len(queries) / elapsed:12,.0f}/s  ({found:,} hits)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,61 @@
+"""
+Word + 5-digit suffix: the zipcode list versus the ?d?d?d?d?d mask.
+
+    python benchmarks/bench_mask.py --words 50
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from mask import Mask, iter_hybrid  # noqa: E402
+from mutations import iter_suffixes  # noqa: E402
+
+
+def load_zipcodes():
+    with open(os.path.join(ROOT, 'data', 'zipcodes.txt'), 'r', encoding='utf-8') as f:
+        return [line.strip() for line in f if line.strip()]
+
+
+def from_list(words):
+    zipcodes = load_zipcodes()
+    count = 0
+    for word in words:
+        for _ in iter_suffixes(word, zipcodes):
+            count += 1
+    return count
+
+
+def from_mask(words):
+    return sum(map(len, iter_hybrid(words, Mask('?d?d?d?d?d'))))
+
+
+def measure(label, function, words):
+    start = time.perf_counter()
+    count = function(words)
+    seconds = time.perf_counter() - start
+    tracemalloc.start()
+    function(words[:1])
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"  {label:<22} {seconds:8.3f}s  {count / seconds:14,.0f} candidates/s  peak {peak / 2**20:6.1f} MiB")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--words', type=int, default=50)
+    args = parser.parse_args(argv)
+
+    words = [f"password{i}" for i in range(args.words)]
+    print(f"{args.words} words x 100,000 suffixes")
+    measure("zipcodes.txt list", from_list, words)
+    measure("mask ?d?d?d?d?d", from_mask, words)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,79 @@
+"""
+Reverse classification vs forward expansion for "is this a mutated base word?".
+
+Builds leaked-looking candidates from random base words (leet + case + affix),
+then times ReverseIndex.classify over them. For contrast it times the forward
+approach for a few base words: expanding each with iter_mutations until the
+candidate turns up.
+
+    python benchmarks/bench_reverse.py --candidates 50000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from itertools import islice
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import wordlists  # noqa: E402
+from mutations import iter_leetspeak, iter_mutations  # noqa: E402
+from reverse import ReverseIndex  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--candidates', type=int, default=50_000)
+    parser.add_argument('--forward', type=int, default=5, help="base words to check the forward way")
+    parser.add_argument('--forward-budget', type=int, default=2_000_000)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    base_words = [w for w in wordlists.registry.unique('baseword') if w.isalpha() and 5 <= len(w) <= 10]
+    prefixes = list(wordlists.registry.unique('prefix'))
+    suffixes = list(wordlists.registry.unique('suffix'))
+
+    start = time.perf_counter()
+    index = ReverseIndex.from_wordlists()
+    print(f"build  {time.perf_counter() - start:.2f}s, {index.trie.node_count:,} trie nodes")
+
+    candidates = []
+    for _ in range(args.candidates):
+        word = rng.choice(base_words)
+        leet = list(islice(iter_leetspeak(word), 50))
+        candidate = rng.choice(leet)
+        candidate = candidate.capitalize() if rng.random() < 0.5 else candidate
+        if rng.random() < 0.3:
+            candidate = rng.choice(prefixes) + candidate
+        if rng.random() < 0.7:
+            candidate += rng.choice(suffixes)
+        candidates.append((word, candidate))
+
+    start = time.perf_counter()
+    matches = [match for _, match in index.classify(c for _, c in candidates)]
+    elapsed = time.perf_counter() - start
+    found = sum(1 for match in matches if match)
+    exact = sum(1 for (word, _), match in zip(candidates, matches) if match and match.base == word.lower())
+    print(f"reverse  {len(candidates) / elapsed:10,.0f} candidates/s  "
+          f"({found:,}/{len(candidates):,} matched, {exact:,} to the seeding word)")
+
+    lists = (suffixes, prefixes, list(wordlists.registry.unique('baseword')))
+    for word, candidate in candidates[:args.forward]:
+        start = time.perf_counter()
+        expanded = 0
+        hit = False
+        for expanded, mutation in enumerate(iter_mutations(word, *lists, depth=2,
+                                                           max_mutations=args.forward_budget), 1):
+            if mutation == candidate:
+                hit = True
+                break
+        elapsed = time.perf_counter() - start
+        print(f"forward  {candidate!r}: {'found' if hit else 'not found'} after {expanded:,} "
+              f"mutations, {elapsed:.2f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
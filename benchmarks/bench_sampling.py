@@ -0,0 +1,70 @@
+"""
+Sampling k lines from a large wordlist: full list, streaming reservoir, seek.
+
+    python benchmarks/bench_sampling.py --lines 5000000 --k 1000
+"""
+import argparse
+import os
+import random
+import secrets
+import string
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from utils.sampling import sample_lines  # noqa: E402
+
+
+def per_item_sample(path, k):
+    """The previous approach: the whole file in a list, one CSPRNG call per item."""
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        population = [line.strip() for line in f if line.strip()]
+    reservoir = []
+    for i, item in enumerate(population):
+        if i < k:
+            reservoir.append(item)
+        else:
+            j = secrets.randbelow(i + 1)
+            if j < k:
+                reservoir[j] = item
+    return reservoir
+
+
+def measure(label, function):
+    start = time.perf_counter()
+    sample = function()
+    seconds = time.perf_counter() - start
+    # Tracing slows allocation down, so memory is measured on a second run.
+    tracemalloc.start()
+    function()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(f"  {label:<24} {seconds:8.3f}s  peak {peak / 2**20:8.1f} MiB  ({len(sample)} lines)")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--lines', type=int, default=5_000_000)
+    parser.add_argument('--k', type=int, default=1000)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(0)
+    alphabet = string.ascii_lowercase + string.digits
+    with tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'corpus.txt')
+        with open(path, 'w') as f:
+            for _ in range(args.lines):
+                f.write(''.join(rng.choices(alphabet, k=rng.randint(6, 14))) + '\n')
+        print(f"{args.lines:,} lines ({os.path.getsize(path) / 2**20:.0f} MiB), k={args.k}")
+        measure('list + per-item draws', lambda: per_item_sample(path, args.k))
+        measure('streaming (Algorithm L)', lambda: sample_lines(path, args.k))
+        measure('seek (mmap)', lambda: sample_lines(path, args.k, seek=True))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
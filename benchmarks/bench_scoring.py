@@ -0,0 +1,72 @@
+"""
+Strength scoring of engine output: per-candidate Python versus numpy batches.
+
+    python benchmarks/bench_scoring.py --candidates 500000
+"""
+import argparse
+import math
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import wordlists  # noqa: E402
+from mutations import iter_mutations  # noqa: E402
+from scoring import Scorer, iter_scores  # noqa: E402
+
+
+def python_charset_bits(candidates):
+    """Charset entropy one candidate at a time, the straightforward way."""
+    bits = []
+    for candidate in candidates:
+        pool = 0
+        if any(c.islower() for c in candidate):
+            pool += 26
+        if any(c.isupper() for c in candidate):
+            pool += 26
+        if any(c.isdigit() for c in candidate):
+            pool += 10
+        if any(not c.isalnum() for c in candidate):
+            pool += 33
+        bits.append(len(candidate) * math.log2(pool) if pool else 0.0)
+    return bits
+
+
+def measure(label, function, count):
+    start = time.perf_counter()
+    function()
+    seconds = time.perf_counter() - start
+    print(f"  {label:<28} {seconds:8.3f}s  {count / seconds:12,.0f} candidates/s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--candidates', type=int, default=500_000)
+    parser.add_argument('--chunk-size', type=int, default=65536)
+    args = parser.parse_args(argv)
+
+    lists = (wordlists.registry.unique('suffix'), wordlists.registry.unique('prefix'),
+             wordlists.registry.unique('baseword'))
+    candidates = []
+    for seed in ('dragon', 'monkey', 'sunshine', 'letmein'):
+        candidates.extend(iter_mutations(seed, *lists, depth=2, max_mutations=args.candidates // 4))
+    count = len(candidates)
+    start = time.perf_counter()
+    scorer = Scorer()
+    print(f"{count:,} candidates; scorer built in {time.perf_counter() - start:.2f}s "
+          f"({scorer.word_count:,} words)")
+
+    def consume(patterns):
+        for _ in iter_scores(candidates, scorer, patterns, args.chunk_size):
+            pass
+
+    measure("python charset entropy", lambda: python_charset_bits(candidates), count)
+    measure("numpy charset entropy", lambda: consume(False), count)
+    measure("numpy with patterns", lambda: consume(True), count)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
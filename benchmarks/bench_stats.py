@@ -0,0 +1,110 @@
+"""
+Cost of engine instrumentation: iter_mutations with stats off and on.
+
+Both are compared with plain_mutations below: the engine's layered loop
+as it was before instrumentation, with the same per-candidate resume
+bookkeeping but no stats or policy hooks. The disabled path should be
+close to it; the enabled path pays a per-candidate clock read.
+
+    python benchmarks/bench_stats.py --depth 2 --runs 5
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+from types import SimpleNamespace
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import wordlists  # noqa: E402
+from mutations import (iter_base_words, iter_capitalization, iter_leetspeak,  # noqa: E402
+                       iter_mutations, iter_prefixes, iter_suffixes)
+from stats import EngineStats  # noqa: E402
+
+
+def plain_mutations(password, suffixes, prefixes, base_words, depth=2):
+    """The same candidates as iter_mutations, from a loop with no hooks at all."""
+    strategies = [
+        iter_capitalization,
+        lambda pwd: iter_suffixes(pwd, suffixes),
+        lambda pwd: iter_prefixes(pwd, prefixes),
+        lambda pwd: iter_base_words(pwd, base_words),
+    ]
+    # Stands in for MutationRun's resumable position, updated per candidate.
+    run = SimpleNamespace(item_index=0, count=1)
+    seen = {password}
+    yield password
+    frontier = [password]
+    count = 1
+    for i, m in enumerate(iter_leetspeak(password), 2):
+        if m not in seen:
+            seen.add(m)
+            frontier.append(m)
+            count += 1
+            run.item_index = i
+            run.count = count
+            yield m
+    for layer in range(1, depth + 1):
+        next_frontier = []
+        for pwd in frontier:
+            for strategy in strategies:
+                for i, m in enumerate(strategy(pwd), 1):
+                    if m not in seen:
+                        seen.add(m)
+                        if layer < depth:
+                            next_frontier.append(m)
+                        count += 1
+                        run.item_index = i
+                        run.count = count
+                        yield m
+        frontier = next_frontier
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--password', default='dragon')
+    parser.add_argument('--depth', type=int, default=2)
+    parser.add_argument('--list-size', type=int, default=10, help="entries taken from each wordlist")
+    parser.add_argument('--runs', type=int, default=5)
+    args = parser.parse_args(argv)
+
+    lists = [list(wordlists.registry.unique(category))[:args.list_size]
+             for category in ('suffix', 'prefix', 'baseword')]
+
+    def run(make_stats):
+        start = time.perf_counter()
+        stats = make_stats()
+        count = sum(1 for _ in iter_mutations(args.password, *lists, depth=args.depth, stats=stats))
+        return time.perf_counter() - start, count, stats
+
+    def run_plain():
+        start = time.perf_counter()
+        count = sum(1 for _ in plain_mutations(args.password, *lists, depth=args.depth))
+        return time.perf_counter() - start, count
+
+    run(lambda: None)  # warmup
+    plain, off, on = [], [], []
+    # Interleave the modes so drift affects all of them equally.
+    for _ in range(args.runs):
+        elapsed, plain_count = run_plain()
+        plain.append(elapsed)
+        off.append(run(lambda: None)[0])
+        elapsed, count, stats = run(EngineStats)
+        on.append(elapsed)
+    if plain_count != count:
+        raise SystemExit(f"plain loop produced {plain_count:,} candidates, the engine {count:,}")
+
+    plain, off, on = statistics.median(plain), statistics.median(off), statistics.median(on)
+    print(f"{count:,} candidates, depth {args.depth}")
+    print(f"  plain loop          {plain:.3f}s  {count / plain:12,.0f}/s")
+    print(f"  stats=None          {off:.3f}s  {count / off:12,.0f}/s  ({off / plain - 1:+.1%})")
+    print(f"  stats=EngineStats() {on:.3f}s  {count / on:12,.0f}/s  ({on / plain - 1:+.1%})")
+    print()
+    print(stats.format())
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
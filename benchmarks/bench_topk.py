@@ -0,0 +1,66 @@
+"""
+Hits per guess of best-first generation vs iter_mutations order, at a fixed budget.
+
+The corpus is split in two: weights are learned from one half and guesses
+are scored against the other.
+
+    python benchmarks/bench_topk.py data/commoncredentials.txt --budget 10000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from itertools import islice
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import wordlists  # noqa: E402
+from mutations import iter_mutations  # noqa: E402
+from topk import CandidateModel, iter_top_candidates  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('corpus', nargs='?', default=os.path.join(ROOT, 'data', 'commoncredentials.txt'))
+    parser.add_argument('--seeds', nargs='+', default=['password', 'dragon', 'monkey', 'love', 'sunshine'])
+    parser.add_argument('--budget', type=int, default=10_000, help="guesses per seed")
+    parser.add_argument('--depth', type=int, default=1)
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.corpus):
+        print(f"{args.corpus} not found; pass a password corpus (one per line)", file=sys.stderr)
+        return 2
+    with open(args.corpus, 'r', encoding='utf-8', errors='ignore') as f:
+        corpus = [line.strip() for line in f if line.strip()]
+    random.Random(0).shuffle(corpus)
+    train, test = corpus[::2], set(corpus[1::2])
+
+    lists = {'suffixes': wordlists.registry.unique('suffix'),
+             'prefixes': wordlists.registry.unique('prefix'),
+             'base_words': wordlists.registry.unique('baseword')}
+    start = time.perf_counter()
+    model = CandidateModel.learn(train, lists['prefixes'], lists['suffixes'], lists['base_words'])
+    print(f"learned weights from {len(train)} passwords in {time.perf_counter() - start:.1f}s; "
+          f"scoring against {len(test)}")
+
+    generators = {
+        'iter_mutations': lambda seed: iter_mutations(seed, depth=args.depth, **lists),
+        'best-first': lambda seed: iter_top_candidates(seed, depth=args.depth, model=model, **lists),
+    }
+    for name, generate in generators.items():
+        start = time.perf_counter()
+        hits = guesses = 0
+        for seed in args.seeds:
+            for candidate in islice(generate(seed), args.budget):
+                guesses += 1
+                hits += candidate in test
+        elapsed = time.perf_counter() - start
+        print(f"{name:<15} {hits:6} hits / {guesses} guesses = {1000 * hits / guesses:6.2f} per 1k  "
+              f"({guesses / elapsed:,.0f} guesses/s)")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,78 @@
+"""
+Trie vs CompactTrie: insert/build, search, enumeration, memory and load time.
+
+    python benchmarks/bench_trie.py data/commoncredentials.txt
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from trie import CompactTrie, Trie  # noqa: E402
+
+DEFAULT_WORDLIST = os.path.join(ROOT, 'data', 'commoncredentials.txt')
+# commoncredentials.txt is not shipped with the repo; fall back to a list that is.
+FALLBACK_WORDLIST = os.path.join(ROOT, 'data', 'basewords', 'cities.txt')
+
+
+def timed(func):
+    start = time.perf_counter()
+    result = func()
+    return result, time.perf_counter() - start
+
+
+def build_trie(words):
+    trie = Trie()
+    for word in words:
+        trie.insert(word)
+    return trie
+
+
+def memory(func):
+    """(result, bytes still held by the result, peak bytes while building it)"""
+    tracemalloc.start()
+    result = func()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, peak
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('wordlist', nargs='?', default=DEFAULT_WORDLIST)
+    args = parser.parse_args(argv)
+
+    path = args.wordlist if os.path.exists(args.wordlist) else FALLBACK_WORDLIST
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        words = [line.strip() for line in f if line.strip()]
+    misses = [word + '\x00' for word in words[::10]]
+    print(f"{path}: {len(words)} words, {os.path.getsize(path) / 2**20:.1f} MiB raw")
+
+    for name, build in (('Trie', build_trie), ('CompactTrie', CompactTrie.from_words)):
+        _, resident, peak = memory(lambda: build(words))
+        trie, build_time = timed(lambda: build(words))
+        _, search_time = timed(lambda: [trie.search(w) for w in words] + [trie.search(w) for w in misses])
+        enumerated, enum_time = timed(lambda: sum(1 for _ in trie.list_all()))
+        lookups = len(words) + len(misses)
+        print(f"{name:<12} build {build_time:6.2f}s  search {lookups / search_time:10,.0f}/s  "
+              f"enumerate {enumerated / enum_time:10,.0f}/s  "
+              f"memory {resident / 2**20:6.1f} MiB (peak {peak / 2**20:.1f} MiB)")
+
+    compact = CompactTrie.from_words(words)
+    with tempfile.TemporaryDirectory() as tmpdir:
+        dawg_path = os.path.join(tmpdir, 'words.dawg')
+        compact.save(dawg_path)
+        loaded, load_time = timed(lambda: CompactTrie.load(dawg_path))
+        _, search_time = timed(lambda: [loaded.search(w) for w in words])
+        print(f"CompactTrie.load {load_time * 1000:.2f}ms for {os.path.getsize(dawg_path) / 2**20:.1f} MiB "
+              f"({compact.node_count} nodes), then {len(words) / search_time:,.0f} searches/s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
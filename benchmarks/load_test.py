@@ -0,0 +1,99 @@
+"""
+Concurrent load test for the /api/mutations streaming endpoint.
+
+Runs the Flask app on a threaded local server and hits it from N client
+threads, reporting requests/sec, latency percentiles, cache hit rate and
+server memory. ``--background-jobs`` first queues that many heavy jobs
+through /api/jobs, to check that streaming latency holds while they run.
+
+    python benchmarks/load_test.py --clients 8 --requests 200 --max-mutations 10000
+"""
+import argparse
+import logging
+import os
+import resource
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import urllib.request
+from urllib.parse import urlencode
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from werkzeug.serving import make_server  # noqa: E402
+
+import app as app_module  # noqa: E402
+from app import app, result_cache  # noqa: E402
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=200, help="total requests")
+    parser.add_argument('--passwords', nargs='+', default=['password', 'dragon', 'monkey', 'love'])
+    parser.add_argument('--depth', type=int, default=1)
+    parser.add_argument('--max-mutations', type=int, default=10_000)
+    parser.add_argument('--background-jobs', type=int, default=0,
+                        help="depth-3 jobs to queue before the load starts")
+    args = parser.parse_args(argv)
+
+    logging.getLogger('werkzeug').setLevel(logging.ERROR)
+    result_cache.clear()
+    job_dir = tempfile.mkdtemp()
+    app.config['LETHE_JOB_DIR'] = job_dir
+    server = make_server('127.0.0.1', 0, app, threaded=True)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_port}/api/mutations?"
+
+    client = app.test_client()
+    for i in range(args.background_jobs):
+        client.post('/api/jobs', json={'password': args.passwords[i % len(args.passwords)],
+                                       'depth': 3, 'max_mutations': 0})
+
+    latencies = []
+    nbytes = [0]
+    lock = threading.Lock()
+    counter = iter(range(args.requests))
+
+    def run_client():
+        for i in counter:
+            query = urlencode({'password': args.passwords[i % len(args.passwords)],
+                               'depth': args.depth, 'max_mutations': args.max_mutations})
+            start = time.perf_counter()
+            with urllib.request.urlopen(base + query) as response:
+                size = len(response.read())
+            elapsed = time.perf_counter() - start
+            with lock:
+                latencies.append(elapsed)
+                nbytes[0] += size
+
+    threads = [threading.Thread(target=run_client) for _ in range(args.clients)]
+    start = time.perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - start
+    server.shutdown()
+    if app_module.job_queue is not None:
+        app_module.job_queue.shutdown(wait=False)
+    shutil.rmtree(job_dir)
+
+    latencies.sort()
+    stats = result_cache.stats()
+    print(f"{len(latencies)} requests, {args.clients} clients, {wall:.2f}s")
+    print(f"  {len(latencies) / wall:,.1f} req/s, {nbytes[0] / wall / 1e6:,.1f} MB/s")
+    print(f"  latency p50 {statistics.median(latencies) * 1000:.1f}ms"
+          f"  p95 {latencies[int(len(latencies) * 0.95) - 1] * 1000:.1f}ms"
+          f"  max {latencies[-1] * 1000:.1f}ms")
+    print(f"  cache: {stats['hits']} hits, {stats['misses']} misses, {stats['size'] / 1e6:.1f} MB held")
+    print(f"  peak RSS {resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.1f} MB")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,289 @@
+"""
+Benchmark suite for the mutation strategies, engine, wordlist loading and tries.
+
+Each benchmark is warmed up, then timed over several repeats; the median
+run gives candidates (or operations) per second. Peak memory is measured
+in a separate tracemalloc pass so tracing does not slow the timed runs.
+Results can be saved as a JSON baseline and later runs compared against
+it:
+
+    python benchmarks/suite.py run --save baseline.json
+    python benchmarks/suite.py run --compare baseline.json --threshold 0.1
+    python benchmarks/suite.py compare baseline.json current.json
+
+``compare`` (and ``run --compare``) exit with status 1 if any benchmark
+got slower, or used more memory, by more than the threshold.
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import wordlists  # noqa: E402
+import wordstore  # noqa: E402
+from mutations import (  # noqa: E402
+    base_words_mutation, capitalization_mutations, leetspeak_mutations, mutation_engine,
+    prefix_mutations, suffix_mutations,
+)
+from policy import PasswordPolicy  # noqa: E402
+from stats import EngineStats  # noqa: E402
+from trie import CompactTrie, Trie  # noqa: E402
+
+BASELINE_VERSION = 1
+
+
+class Benchmark:
+    """
+    Parameters:
+        name (str): Unique name, used as the key in baselines.
+        run (callable): Called with the result of ``setup``; returns the
+            number of items (candidates, lookups, words) it produced.
+        setup (callable): Untimed preparation, run once before the warmup.
+    """
+
+    def __init__(self, name, run, setup=None):
+        self.name = name
+        self.run = run
+        self.setup = setup or (lambda: None)
+
+
+def _lists():
+    return (wordlists.registry.unique('suffix'), wordlists.registry.unique('prefix'),
+            wordlists.registry.unique('baseword'))
+
+
+def _load_wordlists(_):
+    wordlists.registry.clear()
+    return sum(len(wordlists.registry.unique(category)) for category in wordlists.registry)
+
+
+def _open_store(path):
+    with wordstore.WordStore(path) as store:
+        return sum(len(store[category]) for category in store.categories())
+
+
+def _engine_lists():
+    # Short lists so that every layer is reached before the cap.
+    return tuple(list(words)[:10] for words in _lists())
+
+
+def _trie_state():
+    words = list(_lists()[2])[:50_000]
+    trie = Trie()
+    for word in words:
+        trie.insert(word)
+    return {'words': words, 'trie': trie, 'compact': CompactTrie.from_words(words)}
+
+
+def _trie_insert(state):
+    trie = Trie()
+    for word in state['words']:
+        trie.insert(word)
+    return len(state['words'])
+
+
+def _trie_search(trie, words):
+    for word in words:
+        trie.search(word)
+        trie.starts_with(word[:3])
+    return 2 * len(words)
+
+
+def default_benchmarks(password='password123', engine_password='dragon'):
+    """
+    The standard suite, in the order it is reported.
+
+    ``password`` feeds the single strategies. The engine benchmarks use
+    ``engine_password`` and ten entries per wordlist, which keeps a depth-3
+    run to a couple of million candidates.
+    """
+    benchmarks = [
+        Benchmark('leetspeak_mutations', lambda _: len(leetspeak_mutations(password))),
+        Benchmark('capitalization_mutations', lambda _: len(capitalization_mutations(password))),
+        Benchmark('prefix_mutations', lambda lists: len(prefix_mutations(password, lists[1])), _lists),
+        Benchmark('suffix_mutations', lambda lists: len(suffix_mutations(password, lists[0])), _lists),
+        Benchmark('base_words_mutation', lambda lists: len(base_words_mutation(password, lists[2])), _lists),
+    ]
+    for depth, cap in ((1, None), (2, None), (3, 2_000_000)):
+        benchmarks.append(Benchmark(
+            f'mutation_engine[depth={depth}]',
+            lambda lists, depth=depth, cap=cap: len(mutation_engine(
+                engine_password, *lists, depth=depth, max_mutations=cap)),
+            _engine_lists,
+        ))
+    benchmarks += [
+        Benchmark('mutation_engine[depth=2,stats]',
+                  lambda lists: len(mutation_engine(engine_password, *lists, depth=2, stats=EngineStats())),
+                  _engine_lists),
+        Benchmark('mutation_engine[depth=2,policy]',
+                  lambda lists: len(mutation_engine(engine_password, *lists, depth=2,
+                                                    policy=PasswordPolicy(8, 16, ['digit', 'upper']))),
+                  _engine_lists),
+        Benchmark('wordlists.load', _load_wordlists),
+        Benchmark('wordstore.open', _open_store,
+                  lambda: wordstore.open_store(wordstore.DEFAULT_STORE).close() or wordstore.DEFAULT_STORE),
+        Benchmark('Trie.insert', _trie_insert, _trie_state),
+        Benchmark('Trie.search', lambda state: _trie_search(state['trie'], state['words']), _trie_state),
+        Benchmark('Trie.iterate', lambda state: sum(1 for _ in state['trie']), _trie_state),
+        Benchmark('CompactTrie.from_words', lambda state: len(CompactTrie.from_words(state['words'])),
+                  _trie_state),
+        Benchmark('CompactTrie.search', lambda state: _trie_search(state['compact'], state['words']),
+                  _trie_state),
+        Benchmark('CompactTrie.iterate', lambda state: sum(1 for _ in state['compact']), _trie_state),
+    ]
+    return benchmarks
+
+
+def measure(benchmark, repeat=5, warmup=1, memory=True):
+    """
+    Times ``benchmark`` and returns its result record.
+
+    Returns:
+        dict: items per run, per-run seconds, median/min/stdev seconds,
+        items per second at the median and peak traced memory in bytes.
+    """
+    state = benchmark.setup()
+    for _ in range(warmup):
+        benchmark.run(state)
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        items = benchmark.run(state)
+        times.append(time.perf_counter() - start)
+    median = statistics.median(times)
+
+    peak = None
+    if memory:
+        tracemalloc.start()
+        try:
+            benchmark.run(state)
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+
+    return {
+        'items': items,
+        'times': times,
+        'median': median,
+        'min': min(times),
+        'stdev': statistics.stdev(times) if len(times) > 1 else 0.0,
+        'items_per_sec': items / median if median else float('inf'),
+        'peak_memory': peak,
+    }
+
+
+def run_suite(benchmarks, repeat=5, warmup=1, memory=True, report=None):
+    """Runs every benchmark and returns a baseline document."""
+    results = {}
+    for benchmark in benchmarks:
+        results[benchmark.name] = measure(benchmark, repeat, warmup, memory)
+        if report:
+            report(benchmark.name, results[benchmark.name])
+    return {
+        'version': BASELINE_VERSION,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'repeat': repeat,
+        'warmup': warmup,
+        'results': results,
+    }
+
+
+def compare(baseline, current, threshold=0.10):
+    """
+    Compares two baseline documents.
+
+    Returns:
+        list: (name, metric, baseline value, current value, relative change,
+        regressed) for every benchmark present in both. Throughput regresses
+        when it drops by more than ``threshold``; memory when it grows by more.
+    """
+    rows = []
+    for name, now in current['results'].items():
+        before = baseline['results'].get(name)
+        if before is None:
+            continue
+        old, new = before['items_per_sec'], now['items_per_sec']
+        change = new / old - 1 if old else 0.0
+        rows.append((name, 'items/s', old, new, change, change < -threshold))
+        old, new = before.get('peak_memory'), now.get('peak_memory')
+        if old and new is not None:
+            change = new / old - 1
+            rows.append((name, 'peak memory', old, new, change, change > threshold))
+    return rows
+
+
+def _print_result(name, result):
+    memory = f"{result['peak_memory'] / 2**20:8.2f} MiB" if result['peak_memory'] is not None else ''
+    print(f"{name:<30} {result['items_per_sec']:14,.0f} items/s  "
+          f"median {result['median'] * 1000:9.2f}ms ±{result['stdev'] * 1000:7.2f}  {memory}")
+
+
+def _print_comparison(rows, threshold):
+    regressions = 0
+    for name, metric, old, new, change, regressed in rows:
+        regressions += regressed
+        flag = 'REGRESSION' if regressed else ''
+        print(f"{name:<30} {metric:<12} {old:14,.0f} -> {new:14,.0f}  {change:+7.1%}  {flag}")
+    print(f"{regressions} regression(s) beyond {threshold:.0%}")
+    return 1 if regressions else 0
+
+
+def _load(path):
+    with open(path, 'r') as f:
+        document = json.load(f)
+    if document.get('version') != BASELINE_VERSION:
+        raise SystemExit(f"{path}: unsupported baseline version")
+    return document
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help="run the suite")
+    run.add_argument('--filter', help="only benchmarks whose name matches this regex")
+    run.add_argument('--password', default='password123')
+    run.add_argument('--engine-password', default='dragon')
+    run.add_argument('--repeat', type=int, default=5)
+    run.add_argument('--warmup', type=int, default=1)
+    run.add_argument('--no-memory', action='store_true', help="skip the tracemalloc pass")
+    run.add_argument('--save', help="write the results to this JSON file")
+    run.add_argument('--compare', help="baseline JSON to compare against")
+    run.add_argument('--threshold', type=float, default=0.10)
+
+    cmp = commands.add_parser('compare', help="compare two saved runs")
+    cmp.add_argument('baseline')
+    cmp.add_argument('current')
+    cmp.add_argument('--threshold', type=float, default=0.10)
+
+    args = parser.parse_args(argv)
+
+    if args.command == 'compare':
+        return _print_comparison(compare(_load(args.baseline), _load(args.current), args.threshold),
+                                 args.threshold)
+
+    benchmarks = default_benchmarks(args.password, args.engine_password)
+    if args.filter:
+        benchmarks = [b for b in benchmarks if re.search(args.filter, b.name)]
+    document = run_suite(benchmarks, args.repeat, args.warmup, not args.no_memory, _print_result)
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump(document, f, indent=2)
+    if args.compare:
+        print()
+        return _print_comparison(compare(_load(args.compare), document, args.threshold), args.threshold)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
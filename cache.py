@@ -0,0 +1,150 @@
+# cache.py
+"""Size-bounded LRU cache shared by the web app and the strategy memoizer."""
+import threading
+from collections import OrderedDict
+
+
+class SizedLRUCache:
+    """
+    LRU cache that evicts by total size rather than by entry count.
+
+    Every entry is stored with a size (bytes, or any unit the caller uses
+    consistently). Once the total exceeds ``max_size`` the least recently
+    used entries are dropped. Entries larger than ``max_entry_size`` are not
+    stored at all. All operations take a lock so the cache can be shared
+    between request threads.
+    """
+
+    def __init__(self, max_size, max_entry_size=None):
+        self.max_size = max_size
+        self.max_entry_size = max_size if max_entry_size is None else min(max_entry_size, max_size)
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, value, size):
+        """Stores ``value``; returns False if it was too large to cache."""
+        if size > self.max_entry_size:
+            return False
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.size -= old[1]
+            self._entries[key] = (value, size)
+            self.size += size
+            while self.size > self.max_size:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.size -= evicted_size
+                self.evictions += 1
+        return True
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.size = 0
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._entries),
+            'size': self.size,
+            'max_size': self.max_size,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+
+def _result_size(result):
+    # Approximate CPython footprint: tuple header and slots, plus about 49
+    # bytes of header per ASCII str (wider strings cost more).
+    return 56 + 57 * len(result) + sum(map(len, result))
+
+
+class StrategyMemo:
+    """
+    Bounded memo for per-string strategy functions (capitalization, leetspeak).
+
+    Within one engine run every frontier string is expanded once, since
+    ``seen`` already drops strings reached again. Across runs, however,
+    the same strings recur. Every seed's layer-1 frontier holds the same
+    bare base words, and batch seeds and repeated requests overlap. The
+    memo stores each result as a tuple in a SizedLRUCache, evicting by
+    estimated memory size, and counts hits and misses per strategy.
+
+    Parameters:
+        max_size (int): Estimated bytes kept across all entries.
+        max_entry_size (int): Results larger than this are computed but
+            not stored; defaults to 1/16 of ``max_size``.
+    """
+
+    def __init__(self, max_size=64 * 2**20, max_entry_size=None):
+        self.cache = SizedLRUCache(max_size, max_size // 16 if max_entry_size is None else max_entry_size)
+        self.calls = {}  # strategy name -> [hits, misses]
+        # Guards ``calls``, which request threads update concurrently.
+        self._lock = threading.Lock()
+
+    def get(self, name, text, function):
+        """``function(text)`` as a tuple, from the memo when possible."""
+        return self.wrap(name, function)(text)
+
+    def wrap(self, name, function):
+        """A memoized version of a one-argument strategy function."""
+        with self._lock:
+            counts = self.calls.setdefault(name, [0, 0])
+        get, put = self.cache.get, self.cache.put
+        lock = self._lock
+
+        def memoized(text):
+            key = (name, text)
+            result = get(key)
+            if result is not None:
+                with lock:
+                    counts[0] += 1
+                return result
+            with lock:
+                counts[1] += 1
+            result = tuple(function(text))
+            put(key, result, _result_size(result))
+            return result
+
+        return memoized
+
+    def fits(self, estimated_items):
+        """False if a result of this many items could not be stored anyway."""
+        return estimated_items * 64 <= self.cache.max_entry_size
+
+    def clear(self):
+        self.cache.clear()
+
+    def stats(self):
+        stats = self.cache.stats()
+        with self._lock:
+            calls = [(name, tuple(counts)) for name, counts in self.calls.items()]
+        stats['strategies'] = {
+            name: {'hits': hits, 'misses': misses,
+                   'hit_rate': hits / (hits + misses) if hits + misses else 0.0}
+            for name, (hits, misses) in calls
+        }
+        return stats
@@ -0,0 +1,614 @@
+# cli.py
+"""Command-line interface for Lethe."""
+import argparse
+import os
+import sys
+from itertools import chain, compress
+
+import wordstore
+
+
+def read_passwords(path):
+    """Yields non-empty stripped lines from ``path`` ('-' for stdin)."""
+    f = sys.stdin if path == '-' else open(path, 'r', encoding='utf-8', errors='ignore')
+    try:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield line
+    finally:
+        if f is not sys.stdin:
+            f.close()
+
+
+def dedupe_from_args(args):
+    from dedupe import make_dedupe
+
+    if args.dedupe == 'bloom':
+        return make_dedupe('bloom', capacity=args.bloom_capacity, error_rate=args.bloom_error_rate)
+    if args.dedupe == 'spill':
+        return make_dedupe('spill', memory_items=args.spill_memory_items)
+    if args.dedupe:
+        return make_dedupe(args.dedupe)
+    return None
+
+
+def writer_from_args(args, format=None):
+    from export import CandidateWriter, parse_size
+
+    return CandidateWriter(args.output, format=format or args.format, compression=args.compress,
+                           rotate_bytes=parse_size(args.rotate) if args.rotate else None)
+
+
+def add_output_arguments(parser):
+    parser.add_argument('-o', '--output', default='-', help="output file, '-' for stdout (default)")
+    parser.add_argument('--format', choices=('plain', 'hex'), default='plain',
+                        help="'hex' writes non-ASCII candidates as $HEX[...] for hashcat/John")
+    parser.add_argument('--compress', choices=('gzip', 'zstd'),
+                        help="compress the output (inferred from a .gz/.zst file name)")
+    parser.add_argument('--rotate', metavar='SIZE', help="start a new numbered file every SIZE, e.g. 1G")
+
+
+def policy_from_args(args):
+    """A PasswordPolicy from --min-length/--max-length/--require, or None if none was given."""
+    if not (args.min_length or args.max_length is not None or args.require):
+        return None
+    from policy import PasswordPolicy
+
+    require = [name.strip() for name in args.require.split(',') if name.strip()] if args.require else ()
+    try:
+        return PasswordPolicy(args.min_length, args.max_length, require)
+    except ValueError as e:
+        raise SystemExit(f"error: {e}")
+
+
+def add_policy_arguments(parser):
+    parser.add_argument('--min-length', type=int, default=0, help="only candidates at least this long")
+    parser.add_argument('--max-length', type=int, default=None, help="only candidates at most this long")
+    parser.add_argument('--require', metavar='CLASSES',
+                        help="comma-separated classes each candidate must contain: lower,upper,digit,symbol")
+
+
+def add_score_arguments(parser):
+    parser.add_argument('--min-bits', type=float, default=None,
+                        help="only candidates scored at least this strong (see scoring.py)")
+    parser.add_argument('--max-bits', type=float, default=None, help="only candidates scored at most this strong")
+    parser.add_argument('--charset-only', action='store_true',
+                        help="score by charset entropy alone, skipping pattern detection (faster)")
+
+
+def score_filter_from_args(args, candidates):
+    """Chunks of ``candidates`` within --min-bits/--max-bits, or None if neither was given."""
+    if args.min_bits is None and args.max_bits is None:
+        return None
+    from scoring import filter_candidates
+
+    return filter_candidates(candidates, args.min_bits, args.max_bits, patterns=not args.charset_only)
+
+
+def format_pruning(policy, emitted):
+    report = policy.report()
+    return (f"policy {policy.min_length}-{policy.max_length or ''} {','.join(policy.require) or '-'}: "
+            f"{emitted:,} emitted, {report['skipped']:,} never generated, "
+            f"{report['rejected']:,} generated and rejected, {report['withheld']:,} kept only to expand")
+
+
+def cmd_batch(args):
+    from batch import iter_batch_mutations
+
+    if args.dedupe == 'external':
+        return _batch_external(args)
+    if args.exclude:
+        raise SystemExit("error: --exclude needs --dedupe external")
+    seen = dedupe_from_args(args)
+    try:
+        with writer_from_args(args) as writer:
+            for chunk in iter_batch_mutations(read_passwords(args.input), depth=args.depth,
+                                              max_mutations=args.max_mutations, workers=args.workers,
+                                              shards=args.shards, dedupe=seen,
+                                              store_path=args.store, memo_bytes=args.memo_mib * 2**20):
+                writer.write_chunk(chunk)
+    finally:
+        if hasattr(seen, 'close'):
+            seen.close()
+    return 0
+
+
+def _batch_external(args):
+    """Batch output deduplicated by external sort; written in sorted order once every input is done."""
+    from batch import iter_batch_mutations
+    from export import parse_size
+    from extdedupe import ExternalDedupe
+
+    with ExternalDedupe(memory_bytes=parse_size(args.dedupe_memory), tmp_dir=args.tmp_dir) as seen:
+        for chunk in iter_batch_mutations(read_passwords(args.input), depth=args.depth,
+                                          max_mutations=args.max_mutations, workers=args.workers,
+                                          shards=args.shards, store_path=args.store,
+                                          memo_bytes=args.memo_mib * 2**20):
+            seen.update(chunk)
+        with writer_from_args(args) as writer:
+            for chunk in seen.iter_chunks(exclude=args.exclude):
+                writer.write_chunk(chunk)
+        stats = seen.stats()
+    print(f"{stats['added']:,} candidates, {stats['emitted']:,} unique and new, "
+          f"{stats['runs_written']:,} runs spilled ({stats['spilled_bytes'] / 2**20:,.1f} MiB)",
+          file=sys.stderr)
+    return 0
+
+
+def cmd_export(args):
+    import wordlists
+    from cache import StrategyMemo
+    from mutations import iter_mutations
+
+    lists = (wordlists.registry.unique('suffix'), wordlists.registry.unique('prefix'),
+             wordlists.registry.unique('baseword'))
+    policy = policy_from_args(args)
+    memo = StrategyMemo(args.memo_mib * 2**20) if args.memo_mib else None
+    candidates = (candidate for password in read_passwords(args.input)
+                  for candidate in iter_mutations(password, *lists, depth=args.depth,
+                                                  max_mutations=args.max_mutations, policy=policy, memo=memo))
+    chunks = score_filter_from_args(args, candidates)
+    with writer_from_args(args) as writer:
+        if chunks is None:
+            writer.write_many(candidates)
+        else:
+            for chunk in chunks:
+                writer.write_chunk(chunk)
+    if policy is not None:
+        print(format_pruning(policy, writer.lines_written), file=sys.stderr)
+    if args.output != '-':
+        print(f"{writer.lines_written:,} candidates, {writer.bytes_written / 2**20:,.1f} MiB "
+              f"in {len(writer.files)} file(s)", file=sys.stderr)
+    return 0
+
+
+def cmd_job(args):
+    from jobs import MutationJob
+
+    class Passwords:
+        # Re-readable so a resumed job sees the same inputs again.
+        def __iter__(self):
+            return read_passwords(args.input)
+
+    job = MutationJob(Passwords(), args.output, checkpoint_path=args.checkpoint, depth=args.depth,
+                      max_mutations=args.max_mutations, dedupe=args.dedupe,
+                      checkpoint_every=args.checkpoint_every, checkpoint_seconds=args.checkpoint_seconds)
+    stats = job.run()
+    print(f"{stats['emitted']} candidates, {stats['checkpoints']} checkpoints, "
+          f"{stats['overhead']:.2%} of {stats['elapsed']:.1f}s spent checkpointing", file=sys.stderr)
+    return 0
+
+
+def cmd_rules(args):
+    import wordlists
+    from rules import RuleSet, apply_rules
+
+    lists = {category: wordlists.registry.unique(category) for category in wordlists.registry}
+    ruleset = RuleSet.from_file(args.rules, lists)
+    with writer_from_args(args) as writer:
+        writer.write_many(apply_rules(read_passwords(args.input), ruleset, max_mutations=args.max_mutations,
+                                      dedupe=not args.no_dedupe))
+    return 0
+
+
+def cmd_top(args):
+    import wordlists
+    from export import format_candidate
+    from topk import CandidateModel, iter_top_candidates
+
+    lists = {'suffixes': wordlists.registry.unique('suffix'),
+             'prefixes': wordlists.registry.unique('prefix'),
+             'base_words': wordlists.registry.unique('baseword')}
+    model = None
+    if args.learn:
+        model = CandidateModel.learn(read_passwords(args.learn), **lists)
+    ranked = iter_top_candidates(args.password, depth=args.depth, max_mutations=args.max_mutations,
+                                 model=model, scores=True, **lists)
+    if args.scores:
+        # The candidate column is encoded here, so the tab before the score
+        # does not send the whole line to $HEX[].
+        lines = (f"{format_candidate(candidate, args.format)}\t{logp:.4f}" for candidate, logp in ranked)
+        with writer_from_args(args, format='plain') as writer:
+            writer.write_many(lines)
+    else:
+        with writer_from_args(args) as writer:
+            writer.write_many(candidate for candidate, _ in ranked)
+    return 0
+
+
+def cmd_profile(args):
+    import json
+
+    import wordlists
+    from mutations import iter_mutations
+    from stats import EngineStats
+
+    stats = EngineStats()
+    policy = policy_from_args(args)
+    count = 0
+    for _ in iter_mutations(args.password, wordlists.registry.unique('suffix'),
+                            wordlists.registry.unique('prefix'), wordlists.registry.unique('baseword'),
+                            depth=args.depth, max_mutations=args.max_mutations, stats=stats,
+                            policy=policy):
+        count += 1
+    if args.json:
+        report = stats.report()
+        if policy is not None:
+            report['policy'] = policy.report()
+        json.dump(report, sys.stdout, indent=2)
+        print()
+    else:
+        print(f"{count:,} candidates")
+        print(stats.format())
+        if policy is not None:
+            print(format_pruning(policy, count))
+    return 0
+
+
+def cmd_leak_index(args):
+    import leakcheck
+
+    header = leakcheck.build_index(args.corpus, args.index, run_items=args.run_items)
+    print(f"wrote {args.index}: {header['count']:,} distinct entries", file=sys.stderr)
+    return 0
+
+
+def cmd_leakcheck(args):
+    import time
+
+    import leakcheck
+
+    if args.mutate:
+        import wordlists
+        from mutations import iter_mutations
+
+        lists = (wordlists.registry.unique('suffix'), wordlists.registry.unique('prefix'),
+                 wordlists.registry.unique('baseword'))
+        seeds = read_passwords(args.input)
+        candidates = (m for seed in seeds
+                      for m in iter_mutations(seed, *lists, depth=args.depth, max_mutations=args.max_mutations))
+    elif args.input == '-':
+        # Raw lines, read the way the corpus was, so entries that are not
+        # valid UTF-8 are found too.
+        candidates = (line for line in (raw.rstrip(b'\r\n') for raw in sys.stdin.buffer) if line)
+    else:
+        candidates = leakcheck.iter_corpus([args.input])
+
+    counted = 0
+
+    def counting(iterable):
+        nonlocal counted
+        for item in iterable:
+            counted += 1
+            yield item
+
+    start = time.perf_counter()
+    if args.workers and args.workers > 1:
+        hits = leakcheck.iter_check_parallel(counting(candidates), args.index, workers=args.workers)
+        index = None
+    else:
+        index = leakcheck.LeakIndex(args.index)
+        hits = index.check(counting(candidates))
+    found = 0
+    out = sys.stdout.buffer
+    for hit in hits:
+        found += 1
+        out.write((hit if isinstance(hit, bytes) else hit.encode('utf-8')) + b'\n')
+    elapsed = time.perf_counter() - start
+    if index is not None:
+        index.close()
+    print(f"{found:,} of {counted:,} candidates found in {elapsed:.2f}s "
+          f"({counted / elapsed if elapsed else 0:,.0f}/s)", file=sys.stderr)
+    return 0
+
+
+def cmd_hashmatch(args):
+    import hashmatch
+
+    hash_list = hashmatch.HashList.from_file(args.hashes, args.mode)
+    if hash_list.skipped:
+        print(f"skipped {hash_list.skipped:,} lines that are not {args.mode} hashes", file=sys.stderr)
+    stats = hashmatch.MatchStats()
+    inputs = read_passwords(args.input)
+    if args.mutate:
+        hits = hashmatch.iter_mutation_matches(inputs, hash_list, depth=args.depth,
+                                               max_mutations=args.max_mutations, workers=args.workers,
+                                               batch_size=args.batch_size, store_path=args.store,
+                                               stats=stats)
+    else:
+        hits = hashmatch.iter_matches(inputs, hash_list, workers=args.workers,
+                                      batch_size=args.batch_size, stats=stats)
+    out = sys.stdout
+    for hit in hits:
+        out.write(hashmatch.format_hit(hit) + '\n')
+    out.flush()
+    print(stats.format(), file=sys.stderr)
+    return 0
+
+
+def cmd_classify(args):
+    from reverse import ReverseIndex
+    from trie import CompactTrie
+
+    if args.dawg and not args.save_dawg:
+        import wordlists
+
+        index = ReverseIndex(CompactTrie.load(args.dawg), wordlists.registry.unique('prefix'),
+                             wordlists.registry.unique('suffix'), max_affixes=args.max_affixes)
+    else:
+        index = ReverseIndex.from_wordlists(max_affixes=args.max_affixes)
+        if args.save_dawg:
+            index.save(args.dawg)
+    total = matched = 0
+    out = sys.stdout
+    for candidate, match in index.classify(read_passwords(args.input)):
+        total += 1
+        if match is not None:
+            matched += 1
+            out.write(f"{candidate}\t{match.base}\t{match.prefix}\t{match.suffix}\n")
+        elif args.all:
+            out.write(f"{candidate}\t\t\t\n")
+    print(f"{matched:,} of {total:,} candidates are mutations of a known base word", file=sys.stderr)
+    return 0
+
+
+def cmd_keyspace(args):
+    import wordlists
+    from keyspace import LeetKeyspace
+
+    affixes = {}
+    if args.affixes:
+        affixes = {'prefixes': wordlists.registry.unique('prefix'),
+                   'suffixes': wordlists.registry.unique('suffix')}
+    space = LeetKeyspace(args.password, **affixes)
+    if args.size:
+        print(len(space))
+        return 0
+    start, stop = args.start, args.stop
+    if args.shard:
+        index, count = (int(part) for part in args.shard.split('/'))
+        start, stop = space.shard(index, count)
+    with writer_from_args(args) as writer:
+        writer.write_many(space.iter_range(start, stop))
+    return 0
+
+
+def cmd_mask(args):
+    from mask import HybridKeyspace, Mask, iter_hybrid
+
+    custom = {code: spec for code, spec in zip('1234', (args.custom1, args.custom2, args.custom3, args.custom4))
+              if spec is not None}
+    try:
+        mask = Mask(args.mask, custom)
+    except ValueError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    indexed = args.size or args.shard or args.start or args.stop is not None
+    if args.words is None:
+        space = mask
+    else:
+        words = read_passwords(args.words)
+        if args.depth:
+            import wordlists
+            from mutations import iter_mutations
+
+            lists = (wordlists.registry.unique('suffix'), wordlists.registry.unique('prefix'),
+                     wordlists.registry.unique('baseword'))
+            words = (candidate for word in words
+                     for candidate in iter_mutations(word, *lists, depth=args.depth,
+                                                     max_mutations=args.max_mutations))
+        if not indexed:
+            # Plain enumeration streams the words; only indexing needs them all.
+            return _write_chunks(args, iter_hybrid(words, mask, prepend=args.prepend))
+        space = HybridKeyspace(list(words), mask, prepend=args.prepend)
+    if args.size:
+        print(len(space))
+        return 0
+    start, stop = args.start, args.stop
+    if args.shard:
+        index, count = (int(part) for part in args.shard.split('/'))
+        start, stop = space.shard(index, count)
+    return _write_chunks(args, space.iter_chunks(start, stop))
+
+
+def _write_chunks(args, chunks):
+    filtered = score_filter_from_args(args, chain.from_iterable(chunks))
+    with writer_from_args(args) as writer:
+        for chunk in chunks if filtered is None else filtered:
+            writer.write_chunk(chunk)
+    return 0
+
+
+def cmd_score(args):
+    import numpy as np
+    from scoring import STRENGTH_NAMES, iter_scores, strength, within
+
+    levels = np.zeros(len(STRENGTH_NAMES), dtype=np.int64)
+    out = sys.stdout
+    for chunk, scores in iter_scores(read_passwords(args.input), patterns=not args.charset_only):
+        keep = within(scores.bits, args.min_bits, args.max_bits)
+        levels += np.bincount(strength(scores.bits[keep]), minlength=len(levels))
+        columns = [scores.bits.round(1).tolist()]
+        if args.details:
+            columns += [scores.baseword.tolist(), scores.leet.tolist(), scores.date.tolist(), scores.walk.tolist()]
+        rows = compress(zip(*columns, chunk), keep.tolist())
+        out.write(''.join('\t'.join(map(str, row)) + '\n' for row in rows))
+    total = int(levels.sum())
+    for name, count in zip(STRENGTH_NAMES, levels.tolist()):
+        print(f"{name:>12}: {count:,} ({count / max(total, 1):.1%})", file=sys.stderr)
+    return 0
+
+
+def cmd_compile_wordlists(args):
+    path = wordstore.compile_store(args.store)
+    print(f"wrote {path}", file=sys.stderr)
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='lethe', description="Password mutation toolkit.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    batch = commands.add_parser('batch', help="mutate a list of passwords on all cores")
+    batch.add_argument('input', help="file with one password per line, '-' for stdin")
+    batch.add_argument('--depth', type=int, default=1)
+    batch.add_argument('--max-mutations', type=int, default=None)
+    batch.add_argument('--workers', type=int, default=None)
+    batch.add_argument('--shards', type=int, default=1,
+                       help="split each password into this many tasks")
+    batch.add_argument('--dedupe', nargs='?', const='set', choices=['set', 'bloom', 'spill', 'external'],
+                       help="deduplicate candidates across all inputs (default backend: set); "
+                            "'external' sorts on disk and writes the output in sorted order")
+    batch.add_argument('--bloom-error-rate', type=float, default=0.001)
+    batch.add_argument('--bloom-capacity', type=int, default=10_000_000)
+    batch.add_argument('--spill-memory-items', type=int, default=1_000_000)
+    batch.add_argument('--dedupe-memory', metavar='SIZE', default='256M',
+                       help="memory for --dedupe external before sorted runs spill to disk")
+    batch.add_argument('--tmp-dir', help="where --dedupe external spills its runs")
+    batch.add_argument('--exclude', metavar='FILE', action='append', default=[],
+                       help="sorted wordlist from an earlier export; its candidates are left out "
+                            "(--dedupe external, repeatable)")
+    batch.add_argument('--store', default=wordstore.DEFAULT_STORE)
+    batch.add_argument('--memo-mib', type=int, default=0,
+                       help="per-worker memo of capitalization/leetspeak results, for inputs that overlap")
+    add_output_arguments(batch)
+    batch.set_defaults(func=cmd_batch)
+
+    export = commands.add_parser('export', help="stream mutations to stdout or files for a cracker")
+    export.add_argument('input', help="file with one password per line, '-' for stdin")
+    export.add_argument('--depth', type=int, default=2)
+    export.add_argument('--max-mutations', type=int, default=None, help="cap per input password")
+    add_policy_arguments(export)
+    add_score_arguments(export)
+    export.add_argument('--memo-mib', type=int, default=0,
+                        help="memo of capitalization/leetspeak results shared across inputs")
+    add_output_arguments(export)
+    export.set_defaults(func=cmd_export)
+
+    job = commands.add_parser('job', help="long-running generation that checkpoints and resumes")
+    job.add_argument('input', help="file with one password per line")
+    job.add_argument('output')
+    job.add_argument('--checkpoint', default=None, help="defaults to OUTPUT.ckpt")
+    job.add_argument('--depth', type=int, default=2)
+    job.add_argument('--max-mutations', type=int, default=None)
+    job.add_argument('--dedupe', choices=['password', 'global'], default='password')
+    job.add_argument('--checkpoint-every', type=int, default=100_000)
+    job.add_argument('--checkpoint-seconds', type=float, default=10.0)
+    job.set_defaults(func=cmd_job)
+
+    rules = commands.add_parser('rules', help="apply a rule file to a list of words")
+    rules.add_argument('rules', help="rule file, one rule per line (see rules.py)")
+    rules.add_argument('input', help="file with one word per line, '-' for stdin")
+    rules.add_argument('--max-mutations', type=int, default=None)
+    rules.add_argument('--no-dedupe', action='store_true', help="skip deduplication for raw speed")
+    add_output_arguments(rules)
+    rules.set_defaults(func=cmd_rules)
+
+    top = commands.add_parser('top', help="generate candidates in descending probability")
+    top.add_argument('password')
+    top.add_argument('--depth', type=int, default=2)
+    top.add_argument('--max-mutations', type=int, default=10_000)
+    top.add_argument('--learn', metavar='CORPUS', help="learn weights from a password corpus")
+    top.add_argument('--scores', action='store_true', help="print log-probabilities too")
+    add_output_arguments(top)
+    top.set_defaults(func=cmd_top)
+
+    profile = commands.add_parser('profile', help="per-layer, per-strategy engine statistics")
+    profile.add_argument('password')
+    profile.add_argument('--depth', type=int, default=2)
+    profile.add_argument('--max-mutations', type=int, default=1_000_000)
+    profile.add_argument('--json', action='store_true', help="print the structured report")
+    add_policy_arguments(profile)
+    profile.set_defaults(func=cmd_profile)
+
+    leak_index = commands.add_parser('leak-index', help="build an on-disk index of a breach corpus")
+    leak_index.add_argument('corpus', nargs='+', help="files with one password per line")
+    leak_index.add_argument('--index', required=True, help="index file to write")
+    leak_index.add_argument('--run-items', type=int, default=20_000_000,
+                            help="fingerprints sorted in memory before spilling a run to disk")
+    leak_index.set_defaults(func=cmd_leak_index)
+
+    leak = commands.add_parser('leakcheck', help="print the candidates that appear in a leak index")
+    leak.add_argument('input', help="file with one candidate per line, '-' for stdin")
+    leak.add_argument('--index', required=True, help="index built by leak-index")
+    leak.add_argument('--mutate', action='store_true', help="check the mutations of each input instead")
+    leak.add_argument('--depth', type=int, default=1)
+    leak.add_argument('--max-mutations', type=int, default=100_000)
+    leak.add_argument('--workers', type=int, default=1)
+    leak.set_defaults(func=cmd_leakcheck)
+
+    hashm = commands.add_parser('hashmatch', help="hash candidates and print the ones in a hash list")
+    hashm.add_argument('input', help="file with one candidate per line, '-' for stdin")
+    hashm.add_argument('--hashes', required=True, help="file with one hash (or hash:salt) per line")
+    hashm.add_argument('--mode', default='md5',
+                       help="md5, sha1, sha256, e.g. 'sha1(pass.salt)', or a hashcat mode number")
+    hashm.add_argument('--mutate', action='store_true', help="hash the mutations of each input instead")
+    hashm.add_argument('--depth', type=int, default=1)
+    hashm.add_argument('--max-mutations', type=int, default=1_000_000, help="cap per input password")
+    hashm.add_argument('--workers', type=int, default=None)
+    hashm.add_argument('--batch-size', type=int, default=50_000)
+    hashm.add_argument('--store', default=wordstore.DEFAULT_STORE)
+    hashm.set_defaults(func=cmd_hashmatch)
+
+    classify = commands.add_parser('classify', help="find the base word behind each leaked password")
+    classify.add_argument('input', help="file with one password per line, '-' for stdin")
+    classify.add_argument('--all', action='store_true', help="also print passwords with no match")
+    classify.add_argument('--max-affixes', type=int, default=2, help="prefixes/suffixes allowed per side")
+    classify.add_argument('--dawg', help="prebuilt base-word trie to load (or write, with --save-dawg)")
+    classify.add_argument('--save-dawg', action='store_true', help="build the trie and save it to --dawg")
+    classify.set_defaults(func=cmd_classify)
+
+    keyspace = commands.add_parser('keyspace', help="enumerate an indexed slice of the leet/case/affix keyspace")
+    keyspace.add_argument('password')
+    keyspace.add_argument('--affixes', action='store_true', help="include the prefix and suffix wordlists")
+    keyspace.add_argument('--size', action='store_true', help="print the keyspace size and exit")
+    keyspace.add_argument('--start', type=int, default=0, help="first index, e.g. a checkpoint offset")
+    keyspace.add_argument('--stop', type=int, default=None)
+    keyspace.add_argument('--shard', metavar='I/N', help="emit only shard I of N")
+    add_output_arguments(keyspace)
+    keyspace.set_defaults(func=cmd_keyspace)
+
+    mask = commands.add_parser('mask', help="enumerate a mask such as ?u?l?l?l?d?d, alone or after each word")
+    mask.add_argument('mask', help="?l ?u ?d ?s ?a ?h ?H, ?1-?4 for custom charsets, ?? for a literal '?'")
+    for code in '1234':
+        mask.add_argument(f'-{code}', f'--custom{code}', metavar='CHARSET', help=f"charset for ?{code}, e.g. ?l?d")
+    mask.add_argument('--words', metavar='FILE', help="hybrid mode: append the mask to each word of FILE")
+    mask.add_argument('--prepend', action='store_true', help="hybrid mode: put the mask before each word")
+    mask.add_argument('--depth', type=int, default=0, help="mutate each word to this depth first (0: as is)")
+    mask.add_argument('--max-mutations', type=int, default=None, help="cap per word with --depth")
+    mask.add_argument('--size', action='store_true', help="print the keyspace size and exit")
+    mask.add_argument('--start', type=int, default=0, help="first index, e.g. a checkpoint offset")
+    mask.add_argument('--stop', type=int, default=None)
+    mask.add_argument('--shard', metavar='I/N', help="emit only shard I of N")
+    add_score_arguments(mask)
+    add_output_arguments(mask)
+    mask.set_defaults(func=cmd_mask)
+
+    score = commands.add_parser('score', help="score candidates' strength in bits, for filtering or hygiene reports")
+    score.add_argument('input', help="file with one candidate per line, '-' for stdin")
+    score.add_argument('--details', action='store_true',
+                       help="also print base word, leet, date and keyboard walk characters")
+    add_score_arguments(score)
+    score.set_defaults(func=cmd_score)
+
+    compile_ = commands.add_parser('compile-wordlists', help="rebuild the binary wordlist store")
+    compile_.add_argument('--store', default=wordstore.DEFAULT_STORE)
+    compile_.set_defaults(func=cmd_compile_wordlists)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except BrokenPipeError:
+        # The reader (e.g. `| head`) went away; stop quietly like other Unix tools.
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
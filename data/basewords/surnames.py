@@ -1,13 +1,17 @@
 # lowercase_surnames.py
 
+def clean_surname(line):
+    return line.strip().lower() or None
+
+
 def lowercase_file_inplace(filepath):
     with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
-        lines = [line.strip().lower() for line in f if line.strip()]
+        lines = [clean_surname(line) for line in f if line.strip()]
 
     with open(filepath, 'w', encoding='utf-8') as f:
         for line in lines:
             f.write(line + '\n')
 
 
-# Usage
-lowercase_file_inplace('surnames.txt')
\ No newline at end of file
+if __name__ == "__main__":
+    lowercase_file_inplace('surnames.txt')
@@ -0,0 +1,334 @@
+# data/build.py
+"""
+Streaming, multi-process build of the wordlists under data/ from raw dumps.
+
+Each target is one output wordlist, built from one or more raw sources by
+one of the existing cleaners:
+
+    phrases        basewords/phrases.txt       rockyou.txt, clean_phrase
+    world_cities   basewords/world_cities.txt  geonames cities15000.txt, clean_city_name
+    uscities       basewords/uscities.txt      us-cities.txt, clean_city_name
+    books          basewords/books.txt         books.csv titles, clean_title (first 2500)
+    surnames       basewords/surnames.txt      itself, lowercased in place
+
+Raw line files are split into byte ranges that end on a newline. Workers
+read and clean their own range, so only cleaned words travel back to the
+parent. The parent takes results in input order and deduplicates with
+bounded memory:
+
+- Sorted targets go through an extdedupe.ExternalDedupe. It holds up
+  to ``run_items`` distinct words in memory and spills sorted, compressed
+  runs to disk beyond that.
+- 'first' targets keep the first occurrence of each word, in input
+  order. Each word is checked against a dedupe.SpillSet and written out
+  straight away.
+- 'all' targets keep every word in input order, like the scripts they
+  replace (the registry deduplicates when loading anyway).
+
+A manifest next to the wordlists (build-manifest.json) records each
+target's source signatures and settings, and only targets whose sources
+or settings changed are rebuilt. An output whose content comes out the
+same is left untouched, so the compiled wordlist store (wordstore.py) is
+only recompiled when a list really changed. Targets whose raw sources are
+not present (rockyou.txt and the geonames dumps are not shipped) are
+skipped.
+
+    python -m data.build [--workers N] [--raw-dir DIR] [--force] [target ...]
+"""
+import argparse
+import csv
+import filecmp
+import json
+import os
+import sys
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+
+import wordlists
+from data.basewords.book_re import clean_title
+from data.basewords.cities import clean_city_name
+from data.basewords.surnames import clean_surname
+from data.phrases import clean_phrase
+from dedupe import SpillSet
+from extdedupe import ExternalDedupe
+
+FORMAT_VERSION = 1
+DEFAULT_MANIFEST = os.path.join(wordlists.DATA_DIR, 'build-manifest.json')
+
+# reader: 'lines' (one entry per line), 'geonames' (name column of a
+# geonames TSV) or 'csv_titles' (original_title, else title, of each row).
+# order: 'sorted', 'first' or 'all' (see above). limit: stop after this many words.
+Target = namedtuple('Target', 'output sources reader cleaner order limit', defaults=('sorted', None))
+
+TARGETS = {
+    'phrases': Target('basewords/phrases.txt', ('rockyou.txt',), 'lines', clean_phrase),
+    'world_cities': Target('basewords/world_cities.txt', ('basewords/cities15000.txt',), 'geonames',
+                           clean_city_name),
+    'uscities': Target('basewords/uscities.txt', ('basewords/us-cities.txt',), 'lines',
+                       clean_city_name, 'all'),
+    'books': Target('basewords/books.txt', ('basewords/books.csv',), 'csv_titles',
+                    clean_title, 'first', 2500),
+    'surnames': Target('basewords/surnames.txt', ('basewords/surnames.txt',), 'lines',
+                       clean_surname, 'all'),
+}
+
+
+def _lines(lines):
+    return [line.strip() for line in lines]
+
+
+def _geonames_names(lines):
+    return [parts[1].strip() for parts in (line.split('\t', 2) for line in lines) if len(parts) > 1]
+
+
+READERS = {'lines': _lines, 'geonames': _geonames_names}
+
+
+def _clean(raw_items, cleaner, order):
+    words = [word for word in map(cleaner, filter(None, raw_items)) if word]
+    # Duplicates within a chunk are dropped here, in parallel.
+    if order == 'sorted':
+        return list(set(words))
+    if order == 'first':
+        return list(dict.fromkeys(words))
+    return words
+
+
+def _clean_range(path, start, end, reader, cleaner, order):
+    """Cleans the lines in bytes [start, end) of ``path``."""
+    with open(path, 'rb') as f:
+        f.seek(start)
+        text = f.read(end - start).decode('utf-8', 'ignore')
+    return _clean(READERS[reader](text.split('\n')), cleaner, order)
+
+
+def _line_ranges(path, chunk_bytes):
+    """(start, end) byte ranges of ``path`` of about ``chunk_bytes`` each, ending on a newline."""
+    size = os.path.getsize(path)
+    with open(path, 'rb') as f:
+        start = 0
+        while start < size:
+            f.seek(min(start + chunk_bytes, size))
+            f.readline()
+            end = min(f.tell(), size)
+            yield start, end
+            start = end
+
+
+def _csv_titles(path, batch_items):
+    with open(path, encoding='utf-8', newline='') as f:
+        batch = []
+        for row in csv.DictReader(f):
+            batch.append(row.get('original_title') or row.get('title'))
+            if len(batch) >= batch_items:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
+
+
+def _tasks(target, paths, chunk_bytes):
+    """(function, args) pairs covering every source, in input order."""
+    for path in paths:
+        if target.reader == 'csv_titles':
+            for batch in _csv_titles(path, 10_000):
+                yield _clean, (batch, target.cleaner, target.order)
+        else:
+            for start, end in _line_ranges(path, chunk_bytes):
+                yield _clean_range, (path, start, end, target.reader, target.cleaner, target.order)
+
+
+def _results(pool, tasks, workers):
+    """Results of ``tasks`` in order, with a bounded number in flight."""
+    if pool is None:
+        for function, args in tasks:
+            yield function(*args)
+        return
+    pending = deque()
+    for function, args in tasks:
+        pending.append(pool.submit(function, *args))
+        if len(pending) >= workers * 2:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+
+def _write_sorted(chunks, out, run_items, tmp_dir):
+    """Writes the sorted union of ``chunks``, spilling sorted runs past ``run_items`` words."""
+    with ExternalDedupe(tmp_dir=tmp_dir, max_items=run_items) as dedupe:
+        for chunk in chunks:
+            dedupe.update(chunk)
+        for chunk in dedupe.iter_chunks():
+            out.write('\n'.join(chunk) + '\n')
+        return dedupe.emitted
+
+
+def _write_in_order(chunks, out, run_items, tmp_dir, limit, dedupe):
+    """Writes the words in order, each only once if ``dedupe``, stopping after ``limit``."""
+    seen = SpillSet(memory_items=run_items, directory=tmp_dir) if dedupe else None
+    count = 0
+    try:
+        for chunk in chunks:
+            for word in chunk:
+                if seen is not None:
+                    if word in seen:
+                        continue
+                    seen.add(word)
+                out.write(word + '\n')
+                count += 1
+                if count == limit:
+                    return count
+        return count
+    finally:
+        if seen is not None:
+            seen.close()
+
+
+def _settings(target):
+    cleaner = target.cleaner
+    return {'format': FORMAT_VERSION, 'reader': target.reader, 'order': target.order,
+            'limit': target.limit, 'cleaner': f"{cleaner.__module__}.{cleaner.__qualname__}"}
+
+
+def _signature(paths):
+    signature = []
+    for path in paths:
+        st = os.stat(path)
+        signature.append([os.path.abspath(path), st.st_size, st.st_mtime_ns])
+    return signature
+
+
+def _load_manifest(path):
+    try:
+        with open(path, encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def build_target(name, target, data_dir=wordlists.DATA_DIR, raw_dir=None, pool=None, workers=1,
+                 chunk_bytes=16 * 2**20, run_items=2_000_000, tmp_dir=None):
+    """
+    Builds one target's output file from its raw sources.
+
+    Returns:
+        dict: 'target', 'status' ('built' or 'unchanged' when the new
+        content matched the old file), 'words' written and 'seconds'.
+    """
+    start = time.perf_counter()
+    raw_dir = raw_dir or data_dir
+    paths = [os.path.join(raw_dir, source) for source in target.sources]
+    output = os.path.join(data_dir, target.output)
+    tmp_dir = tmp_dir or os.path.dirname(output)
+    chunks = _results(pool, _tasks(target, paths, chunk_bytes), workers)
+
+    tmp_path = f"{output}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8', newline='\n') as out:
+            if target.order == 'sorted':
+                count = _write_sorted(chunks, out, run_items, tmp_dir)
+            else:
+                count = _write_in_order(chunks, out, run_items, tmp_dir, target.limit,
+                                        target.order == 'first')
+        if os.path.exists(output) and filecmp.cmp(tmp_path, output, shallow=False):
+            status = 'unchanged'
+            os.remove(tmp_path)
+        else:
+            status = 'built'
+            os.replace(tmp_path, output)
+    finally:
+        chunks.close()
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return {'target': name, 'status': status, 'words': count, 'seconds': time.perf_counter() - start}
+
+
+def build(names=None, data_dir=wordlists.DATA_DIR, raw_dir=None, workers=None, force=False,
+          chunk_bytes=16 * 2**20, run_items=2_000_000, tmp_dir=None, manifest=None, targets=TARGETS):
+    """
+    Rebuilds the targets whose sources or settings changed since the last build.
+
+    Parameters:
+        names (list): Targets to consider, all of them by default.
+        data_dir (str): Where the outputs (and by default the sources) live.
+        raw_dir (str): Where the raw sources are looked up, ``data_dir``
+            by default. Source names are relative to it.
+        workers (int): Cleaning processes, os.cpu_count() by default;
+            1 cleans in this process.
+        force (bool): Rebuild even targets that look up to date.
+        chunk_bytes (int): Size of the byte range each task cleans.
+        run_items (int): Distinct words held in memory per target before
+            they spill to disk (as a sorted run, or into a SpillSet).
+        tmp_dir (str): Where spilled runs go, next to each output by default.
+        manifest (str): Build manifest, build-manifest.json in ``data_dir``
+            by default.
+
+    Returns:
+        list: One dict per target, see build_target. Targets that were not
+        rebuilt have status 'up to date' or 'missing source'.
+    """
+    names = list(targets) if names is None else names
+    unknown = set(names) - set(targets)
+    if unknown:
+        raise ValueError(f"unknown targets: {', '.join(sorted(unknown))}")
+    manifest = manifest or os.path.join(data_dir, os.path.basename(DEFAULT_MANIFEST))
+    recorded = _load_manifest(manifest)
+    raw_dir = raw_dir or data_dir
+    workers = workers or os.cpu_count() or 1
+
+    results = []
+    pool = ProcessPoolExecutor(workers) if workers > 1 else None
+    try:
+        for name in names:
+            target = targets[name]
+            paths = [os.path.join(raw_dir, source) for source in target.sources]
+            if not all(os.path.exists(path) for path in paths):
+                results.append({'target': name, 'status': 'missing source', 'words': 0, 'seconds': 0.0})
+                continue
+            entry = {'settings': _settings(target), 'sources': _signature(paths)}
+            if (not force and recorded.get(name) == entry
+                    and os.path.exists(os.path.join(data_dir, target.output))):
+                results.append({'target': name, 'status': 'up to date', 'words': 0, 'seconds': 0.0})
+                continue
+            results.append(build_target(name, target, data_dir, raw_dir, pool, workers,
+                                        chunk_bytes, run_items, tmp_dir))
+            # A source may be the output itself (surnames), so sign it after writing.
+            entry['sources'] = _signature(paths)
+            recorded[name] = entry
+            tmp_manifest = f"{manifest}.{os.getpid()}.tmp"
+            with open(tmp_manifest, 'w', encoding='utf-8') as f:
+                json.dump(recorded, f, indent=1)
+            os.replace(tmp_manifest, manifest)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Rebuild wordlists from raw dumps.")
+    parser.add_argument('targets', nargs='*', help=f"targets to build: {', '.join(TARGETS)} (default: all)")
+    parser.add_argument('--raw-dir', help="directory holding the raw sources (default: data/)")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--force', action='store_true', help="rebuild even if nothing changed")
+    parser.add_argument('--run-items', type=int, default=2_000_000,
+                        help="distinct words kept in memory per target before spilling to disk")
+    parser.add_argument('--tmp-dir', help="where spilled runs go (default: next to each output)")
+    args = parser.parse_args(argv)
+
+    try:
+        results = build(args.targets or None, raw_dir=args.raw_dir, workers=args.workers, force=args.force,
+                        run_items=args.run_items, tmp_dir=args.tmp_dir)
+    except ValueError as e:
+        parser.error(str(e))
+    for result in results:
+        line = f"{result['target']:<13} {result['status']}"
+        if result['status'] in ('built', 'unchanged'):
+            line += f", {result['words']:,} words in {result['seconds']:.1f}s"
+        print(line)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,18 +1,34 @@
 import re
 
+PHRASE = re.compile(r'^[a-z0-9\s\-_!?\.]+$')  # simple passphrase-ish
+WORD = re.compile(r'[a-z]+')
+
+
+def clean_phrase(line, min_length=8, max_words=3):
+    """The lowercased line if it looks like a short passphrase, else None."""
+    if len(line) < min_length:
+        return None
+    pwd = line.strip().lower()
+    if len(pwd) < min_length or not pwd.isascii():
+        return None
+    if PHRASE.match(pwd):
+        words = WORD.findall(pwd)
+        if 1 < len(words) <= max_words:
+            return pwd
+    return None
+
+
 def extract_phrases(rockyou_path, output_path, min_length=8, max_words=3):
     phrases = set()
     with open(rockyou_path, 'r', encoding='utf-8', errors='ignore') as f:
         for line in f:
-            pwd = line.strip().lower()
-            if len(pwd) < min_length or not pwd.isascii():
-                continue
-            if re.match(r'^[a-z0-9\s\-_!?\.]+$', pwd):  # simple passphrase-ish
-                words = re.findall(r'[a-z]+', pwd)
-                if 1 < len(words) <= max_words:
-                    phrases.add(pwd)
+            phrase = clean_phrase(line, min_length, max_words)
+            if phrase:
+                phrases.add(phrase)
     with open(output_path, 'w', encoding='utf-8') as out:
         for phrase in sorted(phrases):
             out.write(phrase + '\n')
 
-extract_phrases('rockyou.txt', 'basewords/phrases.txt')
\ No newline at end of file
+
+if __name__ == "__main__":
+    extract_phrases('rockyou.txt', 'basewords/phrases.txt')
@@ -0,0 +1,154 @@
+# dedupe.py
+"""
+Dedupe backends for the mutation engine.
+
+Every backend supports ``in`` and ``add()`` so any of them can be passed as
+``seen`` to mutations.iter_mutations or as ``dedupe`` to
+batch.iter_batch_mutations:
+
+    set          exact, one Python str plus hash slot per candidate
+    BloomFilter  fixed-size bit array, may drop a few unique candidates
+                 (false positives) at the configured rate
+    SpillSet     exact, keeps a bounded in-memory set and spills the rest
+                 to an on-disk SQLite table
+
+Use make_dedupe() to build one by name.
+"""
+import hashlib
+import math
+import os
+import sqlite3
+import tempfile
+
+
+class BloomFilter:
+    """
+    Bit-array Bloom filter sized for ``capacity`` items at ``error_rate``.
+
+    Probe positions are 64-bit words taken from salted blake2b digests,
+    so up to eight probes cost a single hash call.
+    """
+
+    def __init__(self, capacity=10_000_000, error_rate=0.001):
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        if not 0 < error_rate < 1:
+            raise ValueError("error_rate must be between 0 and 1")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(8, math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.num_hashes = max(1, round(self.num_bits / capacity * math.log(2)))
+        self.bits = bytearray((self.num_bits + 7) // 8)
+        # Number of add() calls, an upper bound on the distinct items stored.
+        self.count = 0
+
+    def _probes(self, item):
+        data = item.encode('utf-8', 'surrogatepass')
+        num_bits = self.num_bits
+        probes = []
+        # Each blake2b call yields up to eight independent 64-bit probes.
+        for salt in range(0, self.num_hashes, 8):
+            size = 8 * min(8, self.num_hashes - salt)
+            digest = hashlib.blake2b(data, digest_size=size, salt=salt.to_bytes(16, 'little')).digest()
+            probes.extend(x % num_bits for x in memoryview(digest).cast('Q'))
+        return probes
+
+    def add(self, item):
+        bits = self.bits
+        for bit in self._probes(item):
+            bits[bit >> 3] |= 1 << (bit & 7)
+        self.count += 1
+
+    def __contains__(self, item):
+        bits = self.bits
+        for bit in self._probes(item):
+            if not bits[bit >> 3] & (1 << (bit & 7)):
+                return False
+        return True
+
+    @property
+    def nbytes(self):
+        return len(self.bits)
+
+
+class SpillSet:
+    """
+    Exact dedupe that holds at most ``memory_items`` strings in RAM.
+
+    When the in-memory set fills up it is flushed into a SQLite table in
+    ``directory`` (a temporary file by default) and cleared, so memory stays
+    flat while lookups fall back to an indexed on-disk probe.
+    """
+
+    def __init__(self, memory_items=1_000_000, directory=None, path=None):
+        self.memory_items = memory_items
+        self._owns_path = path is None
+        if path is None:
+            fd, path = tempfile.mkstemp(prefix='lethe-seen-', suffix='.sqlite', dir=directory)
+            os.close(fd)
+        self.path = path
+        self._db = sqlite3.connect(path)
+        self._db.execute('PRAGMA journal_mode=OFF')
+        self._db.execute('PRAGMA synchronous=OFF')
+        self._db.execute('CREATE TABLE IF NOT EXISTS seen (s TEXT PRIMARY KEY) WITHOUT ROWID')
+        self._memory = set()
+        # Rows on disk, kept up to date by flush() without rescanning the table.
+        self._spilled = 0
+        if not self._owns_path:
+            self._spilled = self._db.execute('SELECT COUNT(*) FROM seen').fetchone()[0]
+
+    def __contains__(self, item):
+        if item in self._memory:
+            return True
+        if not self._spilled:
+            return False
+        return self._db.execute('SELECT 1 FROM seen WHERE s = ?', (item,)).fetchone() is not None
+
+    def add(self, item):
+        self._memory.add(item)
+        if len(self._memory) >= self.memory_items:
+            self.flush()
+
+    def flush(self):
+        """Moves the in-memory items to disk."""
+        if self._memory:
+            cursor = self._db.executemany('INSERT OR IGNORE INTO seen VALUES (?)',
+                                          ((s,) for s in self._memory))
+            self._db.commit()
+            # Ignored duplicates are not counted in rowcount.
+            self._spilled += cursor.rowcount
+            self._memory.clear()
+
+    def close(self):
+        self._db.close()
+        if self._owns_path and os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+BACKENDS = {
+    'set': set,
+    'bloom': BloomFilter,
+    'spill': SpillSet,
+}
+
+
+def make_dedupe(kind='set', **options):
+    """
+    Builds a dedupe backend by name.
+
+    Parameters:
+        kind (str): 'set', 'bloom' or 'spill'.
+        **options: Passed to the backend, e.g. capacity/error_rate for
+            'bloom' or memory_items/directory for 'spill'.
+    """
+    try:
+        backend = BACKENDS[kind]
+    except KeyError:
+        raise ValueError(f"unknown dedupe backend {kind!r}, expected one of {sorted(BACKENDS)}") from None
+    return backend(**options)
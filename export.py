@@ -0,0 +1,283 @@
+# export.py
+"""
+Streaming candidate export for crackers (hashcat, John the Ripper).
+
+CandidateWriter takes candidates in chunks, encodes each chunk with a
+single join + encode, and writes it as one large byte string, so Python's
+per-line overhead never reaches the file or pipe. Output can go to stdout,
+a file, gzip or zstd, and can be rotated into numbered files by size.
+
+Formats:
+
+    plain   utf-8, one candidate per line
+    hex     as plain, except candidates that are not printable ASCII
+            (e.g. 'ß' or '€' from LEET_MAP, or control characters) are
+            written as $HEX[...] of their utf-8 bytes, which hashcat and
+            John both decode. Candidates that literally start with
+            '$HEX[' are encoded too, so they are not misread.
+"""
+import gzip
+import os
+import re
+import sys
+
+FORMATS = ('plain', 'hex')
+COMPRESSIONS = (None, 'gzip', 'zstd')
+
+# Anything outside printable ASCII, or a literal '$HEX[', needs encoding.
+_NEEDS_HEX = re.compile(r'[^\x20-\x7e\n]|\$HEX\[')
+_PLAIN_BYTES = bytes(range(0x20, 0x7f)) + b'\n'
+_SIZE_UNITS = {'': 1, 'K': 2**10, 'M': 2**20, 'G': 2**30, 'T': 2**40}
+
+
+def parse_size(text):
+    """'512M' -> 536870912. Accepts K, M, G, T suffixes (binary) and plain integers."""
+    match = re.fullmatch(r'\s*(\d+)\s*([KMGT]?)i?B?\s*', str(text), re.IGNORECASE)
+    if not match:
+        raise ValueError(f"invalid size: {text!r}")
+    return int(match.group(1)) * _SIZE_UNITS[match.group(2).upper()]
+
+
+def hex_encode(candidate):
+    return '$HEX[' + candidate.encode('utf-8').hex() + ']'
+
+
+def format_candidate(candidate, format='plain'):
+    """One candidate as ``format`` writes it, for callers that add columns to the line."""
+    if format == 'hex' and (_NEEDS_HEX.search(candidate) or '\n' in candidate):
+        return hex_encode(candidate)
+    return candidate
+
+
+def _hex_lines(text, offenders):
+    """
+    Rewrites only the lines of ``text`` that contain one of ``offenders``.
+
+    Each offender is located with str.find, which runs at memchr speed,
+    instead of one regex pass over the whole chunk; a chunk holds only a
+    handful of distinct offending characters.
+    """
+    starts = set()
+    find, rfind = text.find, text.rfind
+    for needle in offenders:
+        pos = find(needle)
+        while pos >= 0:
+            start = rfind('\n', 0, pos) + 1
+            end = find('\n', pos)
+            if end < 0:
+                end = len(text)
+            starts.add(start)
+            pos = find(needle, end)
+    parts = []
+    done = 0
+    for start in sorted(starts):
+        end = find('\n', start)
+        if end < 0:
+            end = len(text)
+        parts.append(text[done:start])
+        parts.append(hex_encode(text[start:end]))
+        done = end
+    parts.append(text[done:])
+    return ''.join(parts)
+
+
+def encode_chunk(candidates, format='plain'):
+    """Newline-terminated bytes for a list of candidates."""
+    if not candidates:
+        return b''
+    text = '\n'.join(candidates)
+    data = (text + '\n').encode('utf-8')
+    if format != 'hex':
+        return data
+    # Deleting every printable byte leaves only what needs encoding; the
+    # common all-ASCII chunk costs one C-level pass and no regex.
+    rest = data.translate(None, _PLAIN_BYTES)
+    if not rest and b'$HEX[' not in data:
+        return data
+    if text.count('\n') == len(candidates) - 1:
+        # Non-ASCII characters survive the translate intact, so the rest
+        # decodes to exactly the offending characters.
+        offenders = set(rest.decode('utf-8'))
+        if b'$HEX[' in data:
+            offenders.add('$HEX[')
+        text = _hex_lines(text, offenders)
+    else:
+        # Some candidate contains a newline, so lines and candidates differ.
+        text = '\n'.join(hex_encode(c) if _NEEDS_HEX.search(c) or '\n' in c else c
+                         for c in candidates)
+    return (text + '\n').encode('utf-8')
+
+
+def compression_for(path):
+    """Compression implied by a file name's extension."""
+    if path.endswith('.gz'):
+        return 'gzip'
+    if path.endswith('.zst'):
+        return 'zstd'
+    return None
+
+
+def _zstd_open(fileobj, level):
+    try:
+        from compression import zstd  # Python 3.14+
+        return zstd.ZstdFile(fileobj, 'wb', level=level)
+    except ImportError:
+        pass
+    try:
+        import zstandard
+    except ImportError:
+        raise RuntimeError("zstd compression needs Python 3.14 or the 'zstandard' package") from None
+    return zstandard.ZstdCompressor(level=level).stream_writer(fileobj, closefd=False)
+
+
+def open_candidates(path):
+    """Binary reader for a wordlist written by CandidateWriter, decompressed by extension."""
+    compression = compression_for(path)
+    if compression == 'gzip':
+        return gzip.open(path, 'rb')
+    if compression == 'zstd':
+        try:
+            from compression import zstd  # Python 3.14+
+            return zstd.open(path, 'rb')
+        except ImportError:
+            pass
+        try:
+            import zstandard
+        except ImportError:
+            raise RuntimeError("zstd decompression needs Python 3.14 or the 'zstandard' package") from None
+        return zstandard.open(path, 'rb')
+    return open(path, 'rb')
+
+
+class CandidateWriter:
+    """
+    Parameters:
+        path (str): Output file, or '-' for stdout.
+        format (str): 'plain' or 'hex', see the module docstring.
+        compression (str): None, 'gzip' or 'zstd'; inferred from the
+            extension of ``path`` when not given.
+        level (int): Compression level. Defaults favour speed (gzip 1, zstd 3).
+        rotate_bytes (int): Start a new numbered file once this many
+            uncompressed bytes were written to the current one. Rotation
+            happens between chunks, so no line is ever split across files.
+            ``out.txt.gz`` becomes ``out.0000.txt.gz``, ``out.0001.txt.gz``...
+        buffer_size (int): Bytes buffered before a write system call.
+        chunk_lines (int): Candidates joined per write by ``write_many``.
+    """
+
+    def __init__(self, path='-', format='plain', compression=None, level=None, rotate_bytes=None,
+                 buffer_size=1 << 20, chunk_lines=65536):
+        if format not in FORMATS:
+            raise ValueError(f"format must be one of {FORMATS}")
+        if compression is None and path != '-':
+            compression = compression_for(path)
+        if compression not in COMPRESSIONS:
+            raise ValueError(f"compression must be one of {COMPRESSIONS}")
+        if rotate_bytes and path == '-':
+            raise ValueError("rotation needs a file path, not stdout")
+        self.path = path
+        self.format = format
+        self.compression = compression
+        self.level = level
+        self.rotate_bytes = rotate_bytes
+        self.buffer_size = buffer_size
+        self.chunk_lines = chunk_lines
+
+        self.files = []          # every path written, in order
+        self.bytes_written = 0   # uncompressed, across all files
+        self.lines_written = 0
+        self._raw = None
+        self._out = None
+        self._file_bytes = 0
+        self._pending = []
+        self._open_next()
+
+    def _next_path(self):
+        if not self.rotate_bytes:
+            return self.path
+        directory, name = os.path.split(self.path)
+        stem, dot, rest = name.partition('.')
+        return os.path.join(directory, f"{stem}.{len(self.files):04d}{dot}{rest}")
+
+    def _open_next(self):
+        if self.path == '-':
+            self._raw = sys.stdout.buffer
+        else:
+            path = self._next_path()
+            self._raw = open(path, 'wb', buffering=self.buffer_size)
+            self.files.append(path)
+        if self.compression == 'gzip':
+            self._out = gzip.GzipFile(fileobj=self._raw, mode='wb',
+                                      compresslevel=1 if self.level is None else self.level)
+        elif self.compression == 'zstd':
+            self._out = _zstd_open(self._raw, 3 if self.level is None else self.level)
+        else:
+            self._out = self._raw
+        self._file_bytes = 0
+
+    def _close_current(self):
+        if self._out is not self._raw:
+            self._out.close()
+        if self._raw is sys.stdout.buffer:
+            self._raw.flush()
+        else:
+            self._raw.close()
+        self._out = self._raw = None
+
+    def write_chunk(self, candidates):
+        """Writes a list of candidates as one encoded block."""
+        self._flush_pending()
+        self._write(candidates)
+
+    def _write(self, candidates):
+        data = encode_chunk(candidates, self.format)
+        if not data:
+            return
+        if self.rotate_bytes and self._file_bytes and self._file_bytes + len(data) > self.rotate_bytes:
+            self._close_current()
+            self._open_next()
+        self._out.write(data)
+        self._file_bytes += len(data)
+        self.bytes_written += len(data)
+        self.lines_written += len(candidates)
+
+    def write(self, candidate):
+        """Buffers a single candidate; prefer write_many/write_chunk for speed."""
+        self._pending.append(candidate)
+        if len(self._pending) >= self.chunk_lines:
+            self._flush_pending()
+
+    def _flush_pending(self):
+        if self._pending:
+            pending, self._pending = self._pending, []
+            self._write(pending)
+
+    def write_many(self, candidates):
+        """Writes every candidate from an iterable, ``chunk_lines`` at a time."""
+        self._flush_pending()
+        chunk = []
+        append = chunk.append
+        limit = self.chunk_lines
+        for candidate in candidates:
+            append(candidate)
+            if len(chunk) >= limit:
+                self._write(chunk)
+                chunk = []
+                append = chunk.append
+        self._write(chunk)
+
+    def flush(self):
+        self._flush_pending()
+        self._out.flush()
+
+    def close(self):
+        if self._out is None:
+            return
+        self._flush_pending()
+        self._close_current()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,289 @@
+# extdedupe.py
+"""
+Disk-backed global deduplication of candidate streams by external sort.
+
+The backends in dedupe.py answer "seen before?" one candidate at a time
+and keep the generation order. ExternalDedupe instead collects candidates
+into an in-memory set up to a memory budget. When the budget is reached,
+the set is written out as a sorted, compressed run in a temporary
+directory. Reading the result k-way merges the runs, so the unique
+candidates come out in sorted order. Memory stays at the budget
+regardless of how many billions of candidates go in, and disk holds
+each distinct candidate about once per run it appears in.
+
+Runs are gzip level 1 by default, which typically shrinks
+newline-separated candidates three- to fivefold. Runs are merged in
+tiers: once ``fan_in`` runs of the same tier exist, they are merged into
+one run of the next tier. Each candidate is then rewritten only about
+log_fan_in(runs) times, and the final merge opens few files.
+
+Incremental use: output from here is a sorted, duplicate-free wordlist.
+To deduplicate a new batch against earlier exports without sorting them
+again, pass those files as ``exclude``. They are read once, in step with
+the merge, and anything they already contain is dropped:
+
+    with ExternalDedupe(memory_bytes=512 * 2**20) as dedupe:
+        for chunk in iter_batch_mutations(seeds):
+            dedupe.update(chunk)
+        with CandidateWriter('batch2.txt.gz') as out:
+            for chunk in dedupe.iter_chunks(exclude=['batch1.txt.gz']):
+                out.write_chunk(chunk)
+
+Sorting is by code point, which for utf-8 is the same as sorting by
+bytes, so plain-text exports and `LC_ALL=C sort -u` output of plain text
+can be excluded directly. $HEX[...] lines are decoded before they are
+compared, so a file that has them must be sorted by the decoded bytes, as
+an ExternalDedupe export written with format='hex' is. `sort` orders them
+by their hex text instead, and such a file is rejected as unsorted.
+"""
+import gzip
+import heapq
+import os
+import shutil
+import tempfile
+from itertools import groupby, islice
+from operator import itemgetter
+
+from export import open_candidates
+
+# Approximate CPython cost of one buffered str beyond its characters:
+# object header plus its share of the set's hash table.
+_ITEM_OVERHEAD = 80
+
+
+def _read_lines(f, strip_cr=True, block_size=1 << 20):
+    """
+    Yields the lines of a binary file as bytes, without line ends.
+
+    Blocks are split with bytes.split rather than read line by line,
+    which for gzip files is several times faster.
+    """
+    tail = b''
+    while True:
+        data = f.read(block_size)
+        if not data:
+            break
+        data = tail + data
+        lines = data.split(b'\n')
+        tail = lines.pop()
+        # The '\r' of a CRLF may have arrived with the previous block.
+        if strip_cr and b'\r' in data:
+            lines = [line.rstrip(b'\r') for line in lines]
+        yield from lines
+    if tail:
+        yield tail.rstrip(b'\r') if strip_cr else tail
+
+
+def _check_sorted(lines, path):
+    """Passes (raw, decoded) pairs through as decoded lines, checking their order."""
+    last = last_raw = None
+    for raw, line in lines:
+        if last is not None and line < last:
+            if raw.startswith(b'$HEX[') or last_raw.startswith(b'$HEX['):
+                hint = ("$HEX[...] lines must be sorted by their decoded bytes, so export the file "
+                        "through ExternalDedupe instead of sorting it with `sort`")
+            else:
+                hint = "sort it with `LC_ALL=C sort -u` or export it through ExternalDedupe"
+            raise ValueError(f"{path} is not sorted (found {raw!r} after {last_raw!r}); {hint}")
+        last, last_raw = line, raw
+        yield line
+
+
+def _decode_hex(lines):
+    """Yields (line, decoded line) pairs, decoding $HEX[...] lines."""
+    for line in lines:
+        if line.startswith(b'$HEX[') and line.endswith(b']'):
+            yield line, bytes.fromhex(line[5:-1].decode('ascii'))
+        else:
+            yield line, line
+
+
+def _unique(merged):
+    return map(itemgetter(0), groupby(merged))
+
+
+def _subtract(lines, excluded):
+    """Yields the items of sorted ``lines`` that are not in sorted ``excluded``."""
+    excluded = iter(excluded)
+    skip = next(excluded, None)
+    for line in lines:
+        while skip is not None and skip < line:
+            skip = next(excluded, None)
+        if line != skip:
+            yield line
+
+
+class ExternalDedupe:
+    """
+    Parameters:
+        memory_bytes (int): Estimated memory for buffered candidates before
+            a run is spilled to disk.
+        tmp_dir (str): Where runs are written; a new temporary directory
+            inside it (or the system default) is used and removed on close.
+        compression (str): 'gzip' (default) or None for uncompressed runs.
+        level (int): gzip level for runs.
+        fan_in (int): Runs merged at a time; see the module docstring.
+        max_items (int): Optional cap on buffered candidates, on top of
+            ``memory_bytes``.
+
+    Attributes:
+        added (int): Candidates passed in, duplicates included.
+        emitted (int): Unique candidates read out.
+        runs_written (int): Runs spilled, including merged ones.
+        spilled_bytes (int): Bytes written to disk for runs (compressed).
+    """
+
+    def __init__(self, memory_bytes=256 * 2**20, tmp_dir=None, compression='gzip', level=1, fan_in=64,
+                 max_items=None):
+        if compression not in (None, 'gzip'):
+            raise ValueError("run compression must be 'gzip' or None")
+        if fan_in < 2:
+            raise ValueError("fan_in must be at least 2")
+        self.memory_bytes = memory_bytes
+        self.compression = compression
+        self.level = level
+        self.fan_in = fan_in
+        self.max_items = max_items
+        self.directory = tempfile.mkdtemp(prefix='lethe-dedupe-', dir=tmp_dir)
+        self.runs = []  # [tier, path], oldest first
+        self.added = 0
+        self.emitted = 0
+        self.runs_written = 0
+        self.spilled_bytes = 0
+        self._buffer = set()
+        self._buffer_bytes = 0
+
+    def add(self, candidate):
+        self.update((candidate,))
+
+    def update(self, candidates):
+        """Adds a chunk (any iterable) of candidates."""
+        if not isinstance(candidates, (list, tuple)):
+            candidates = list(candidates)
+        if not candidates:
+            return
+        buffer = self._buffer
+        before = len(buffer)
+        buffer.update(candidates)
+        new = len(buffer) - before
+        self.added += len(candidates)
+        # Characters are estimated from the chunk's average length.
+        self._buffer_bytes += new * (_ITEM_OVERHEAD + sum(map(len, candidates)) // len(candidates))
+        if self._buffer_bytes >= self.memory_bytes or (self.max_items and len(buffer) >= self.max_items):
+            self.spill()
+
+    def _write_run(self, blocks, tier):
+        path = os.path.join(self.directory, f"run{self.runs_written:06d}")
+        f = gzip.open(path, 'wb', compresslevel=self.level) if self.compression == 'gzip' else open(path, 'wb')
+        with f:
+            for block in blocks:
+                f.write(block)
+        self.runs.append([tier, path])
+        self.runs_written += 1
+        self.spilled_bytes += os.path.getsize(path)
+
+    def _read_run(self, path):
+        f = gzip.open(path, 'rb') if self.compression == 'gzip' else open(path, 'rb')
+        with f:
+            yield from _read_lines(f, strip_cr=False, block_size=1 << 16)
+
+    def spill(self):
+        """Writes the buffered candidates out as a sorted run."""
+        if not self._buffer:
+            return
+        words = sorted(self._buffer)
+        self._buffer.clear()
+        self._buffer_bytes = 0
+        self._write_run((('\n'.join(words[i:i + 65536]) + '\n').encode('utf-8', 'surrogatepass')
+                         for i in range(0, len(words), 65536)), 0)
+        # Tiers only grow towards the front, so the newest runs share the lowest tier.
+        while len(self.runs) >= self.fan_in and self.runs[-self.fan_in][0] == self.runs[-1][0]:
+            self._merge_runs(self.fan_in)
+
+    def _merge_runs(self, count):
+        """Merges the newest ``count`` runs into one run of the next tier."""
+        runs = self.runs[-count:]
+        del self.runs[-count:]
+        merged = _unique(heapq.merge(*(self._read_run(path) for _, path in runs)))
+        blocks = iter(lambda: list(islice(merged, 65536)), [])
+        self._write_run((b'\n'.join(block) + b'\n' for block in blocks), runs[0][0] + 1)
+        for _, path in runs:
+            os.remove(path)
+
+    def iter_blocks(self, exclude=(), chunk_size=65536):
+        """
+        Unique candidates as lists of utf-8 bytes, in sorted order.
+
+        Parameters:
+            exclude: Paths of sorted wordlists (plain, .gz or .zst, as
+                written by CandidateWriter); candidates they contain are
+                left out. See the module docstring for $HEX[...] lines.
+            chunk_size (int): Candidates per list.
+        """
+        buffered = sorted(self._buffer)
+        lines = (word.encode('utf-8', 'surrogatepass') for word in buffered)
+        if self.runs:
+            sources = [self._read_run(path) for _, path in self.runs]
+            lines = _unique(heapq.merge(lines, *sources))
+        files = []
+        try:
+            if exclude:
+                excluded = []
+                for path in exclude:
+                    f = open_candidates(path)
+                    files.append(f)
+                    excluded.append(_check_sorted(_decode_hex(_read_lines(f)), path))
+                lines = _subtract(lines, heapq.merge(*excluded))
+            while True:
+                block = list(islice(lines, chunk_size))
+                if not block:
+                    return
+                self.emitted += len(block)
+                yield block
+        finally:
+            for f in files:
+                f.close()
+
+    def iter_raw(self, exclude=()):
+        """Unique candidates as utf-8 bytes, in sorted order; see iter_blocks."""
+        for block in self.iter_blocks(exclude):
+            yield from block
+
+    def iter_chunks(self, exclude=(), chunk_size=65536):
+        """Unique candidates as lists of str, in sorted order; see iter_blocks."""
+        if not self.runs and not exclude:
+            # Everything is still in memory: no need to go through bytes.
+            words = sorted(self._buffer)
+            for start in range(0, len(words), chunk_size):
+                chunk = words[start:start + chunk_size]
+                self.emitted += len(chunk)
+                yield chunk
+            return
+        for block in self.iter_blocks(exclude, chunk_size):
+            yield b'\n'.join(block).decode('utf-8', 'surrogatepass').split('\n')
+
+    def __iter__(self):
+        for chunk in self.iter_chunks():
+            yield from chunk
+
+    def stats(self):
+        return {
+            'added': self.added,
+            'emitted': self.emitted,
+            'buffered': len(self._buffer),
+            'runs': len(self.runs),
+            'runs_written': self.runs_written,
+            'spilled_bytes': self.spilled_bytes,
+        }
+
+    def close(self):
+        self._buffer.clear()
+        self.runs = []
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
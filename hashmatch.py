@@ -0,0 +1,325 @@
+# hashmatch.py
+"""
+Offline hash matching: hash candidates and keep the ones in a dumped hash list.
+
+Skips the round trip of piping candidates into another tool when all we
+want are the hits. A HashList holds the target digests in memory as raw
+bytes, grouped by salt. Workers in a process pool each load it once, hash
+their batches with hashlib, and send back only the matching candidates.
+
+Modes use hashcat's names, and its mode numbers are accepted as aliases:
+
+    md5              0       md5(pass.salt)    10      md5(salt.pass)    20
+    sha1             100     sha1(pass.salt)   110     sha1(salt.pass)   120
+    sha256           1400    sha256(pass.salt) 1410    sha256(salt.pass) 1420
+
+A hash file holds one target per line: ``hash`` for unsalted modes and
+``hash:salt`` for salted ones. A salt may be written as ``$HEX[...]``.
+Hits are reported as ``hash:candidate`` or ``hash:salt:candidate``, in
+hashcat's potfile layout.
+
+Salted modes hash every candidate once per distinct salt, so their cost
+grows with the number of salts, not with the number of hashes.
+"""
+import hashlib
+import os
+import time
+from collections import deque, namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+import wordstore
+from mutations import iter_mutations
+
+Hit = namedtuple('Hit', 'hash salt candidate')
+
+ALGORITHMS = ('md5', 'sha1', 'sha256')
+HASHCAT_MODES = {
+    '0': 'md5', '10': 'md5(pass.salt)', '20': 'md5(salt.pass)',
+    '100': 'sha1', '110': 'sha1(pass.salt)', '120': 'sha1(salt.pass)',
+    '1400': 'sha256', '1410': 'sha256(pass.salt)', '1420': 'sha256(salt.pass)',
+}
+
+
+def parse_mode(mode):
+    """
+    'sha1(salt.pass)' or '120' -> ('sha1', 'prefix').
+
+    Returns:
+        tuple: The hashlib algorithm name and where the salt goes: None,
+        'prefix' (salt before the password) or 'suffix'.
+    """
+    name = HASHCAT_MODES.get(str(mode), str(mode)).lower()
+    algorithm, paren, rest = name.partition('(')
+    salt = {'': None, 'pass.salt)': 'suffix', 'salt.pass)': 'prefix'}.get(rest if paren else '', False)
+    if algorithm not in ALGORITHMS or salt is False:
+        raise ValueError(f"unknown hash mode {mode!r}")
+    return algorithm, salt
+
+
+def format_hit(hit):
+    if hit.salt is None:
+        return f"{hit.hash}:{hit.candidate}"
+    return f"{hit.hash}:{hit.salt}:{hit.candidate}"
+
+
+def _decode_salt(text):
+    if text.startswith('$HEX[') and text.endswith(']'):
+        return bytes.fromhex(text[5:-1])
+    return text.encode('utf-8', 'surrogateescape')
+
+
+class HashList:
+    """
+    Target digests for one mode, held in memory.
+
+    Parameters:
+        lines (iterable): Hash file lines (see the module docstring).
+        mode (str): Hash mode, e.g. 'md5' or 'sha256(salt.pass)'.
+
+    Attributes:
+        skipped (int): Lines that were not a valid hash for ``mode``.
+    """
+
+    def __init__(self, lines, mode='md5'):
+        self.mode = mode
+        self.algorithm, self.salt_position = parse_mode(mode)
+        self._new = getattr(hashlib, self.algorithm)
+        digest_size = self._new().digest_size
+        self.targets = {}      # salt bytes -> set of raw digests
+        self.salt_text = {}    # salt bytes -> the salt as written in the file
+        self.skipped = 0
+        for line in lines:
+            # Only the line ending goes: spaces may belong to a salt.
+            line = line.rstrip('\r\n')
+            if not line:
+                continue
+            digest, sep, salt = line.partition(':')
+            if bool(sep) != bool(self.salt_position):
+                self.skipped += 1
+                continue
+            try:
+                raw = bytes.fromhex(digest)
+                raw_salt = _decode_salt(salt)
+            except ValueError:
+                raw = raw_salt = None
+            if raw is None or len(raw) != digest_size:
+                self.skipped += 1
+                continue
+            self.targets.setdefault(raw_salt, set()).add(raw)
+            self.salt_text.setdefault(raw_salt, salt if sep else None)
+
+    @classmethod
+    def from_file(cls, path, mode='md5'):
+        with open(path, 'r', encoding='utf-8', errors='surrogateescape') as f:
+            return cls(f, mode)
+
+    def __len__(self):
+        return sum(len(digests) for digests in self.targets.values())
+
+    def match(self, candidates):
+        """
+        Hashes a list of candidates against every salt.
+
+        Returns:
+            list: Hit tuples, grouped by salt, in candidate order within each.
+        """
+        new = self._new
+        encoded = [candidate.encode('utf-8') for candidate in candidates]
+        hits = []
+        for salt, digests in self.targets.items():
+            if self.salt_position == 'prefix':
+                hashed = [new(salt + raw).digest() for raw in encoded]
+            elif self.salt_position == 'suffix':
+                hashed = [new(raw + salt).digest() for raw in encoded]
+            else:
+                hashed = [new(raw).digest() for raw in encoded]
+            # The set intersection runs in C; only a batch with hits is rescanned.
+            found = digests.intersection(hashed)
+            if found:
+                salt_text = self.salt_text[salt]
+                hits.extend(Hit(digest.hex(), salt_text, candidates[i])
+                            for i, digest in enumerate(hashed) if digest in found)
+        return hits
+
+
+class MatchStats:
+    """
+    Throughput of a matching run, filled in as hits are consumed.
+
+    ``cpu_seconds`` is worker CPU time for whole tasks (including candidate
+    generation in mutate mode); ``hash_seconds`` is only the part spent
+    hashing and comparing. Dividing hashes by them gives the per-core rate
+    end to end and the per-core hashing ceiling.
+    """
+
+    def __init__(self):
+        self.candidates = 0
+        self.hashes = 0
+        self.hits = 0
+        self.cpu_seconds = 0.0
+        self.hash_seconds = 0.0
+        self.wall_seconds = 0.0
+        self.workers = 1
+
+    @property
+    def rate(self):
+        return self.hashes / self.wall_seconds if self.wall_seconds else 0.0
+
+    @property
+    def per_core_rate(self):
+        return self.hashes / self.cpu_seconds if self.cpu_seconds else 0.0
+
+    @property
+    def per_core_hash_rate(self):
+        return self.hashes / self.hash_seconds if self.hash_seconds else 0.0
+
+    def format(self):
+        return (f"{self.hits:,} hits; {self.hashes:,} hashes of {self.candidates:,} candidates "
+                f"in {self.wall_seconds:.2f}s on {self.workers} worker(s): {self.rate:,.0f} H/s total, "
+                f"{self.per_core_rate:,.0f} H/s per core ({self.per_core_hash_rate:,.0f} H/s hashing only)")
+
+
+def _match_batch(hash_list, batch):
+    start = time.process_time()
+    hits = hash_list.match(batch)
+    return hits, len(batch), time.process_time() - start
+
+
+def _match_seed(hash_list, lists, seed, depth, max_mutations, batch_size):
+    task_start = time.process_time()
+    hits, count, hash_seconds = [], 0, 0.0
+    candidates = iter_mutations(seed, *lists, depth=depth, max_mutations=max_mutations)
+    while True:
+        batch = list(islice(candidates, batch_size))
+        if not batch:
+            break
+        batch_hits, batch_count, seconds = _match_batch(hash_list, batch)
+        hits += batch_hits
+        count += batch_count
+        hash_seconds += seconds
+    return hits, count, count * len(hash_list.targets), hash_seconds, time.process_time() - task_start
+
+
+class _WorkerState:
+    """What the task functions need: the HashList and, for mutate mode, the wordlists."""
+
+    def __init__(self, hashes, mode, store_path):
+        self.hash_list = HashList.from_file(hashes, mode) if isinstance(hashes, str) else hashes
+        self.store = self.lists = None
+        if store_path is not None:
+            self.store = wordstore.WordStore(store_path)
+            self.lists = (self.store['suffix'], self.store['prefix'], self.store['baseword'])
+
+    def close(self):
+        if self.store is not None:
+            self.store.close()
+            self.store = None
+
+
+# Set in each pool worker by _init_worker; kept for the worker's lifetime.
+_worker_state = None
+
+
+def _init_worker(hashes, mode, store_path):
+    global _worker_state
+    _worker_state = _WorkerState(hashes, mode, store_path)
+
+
+def _call_in_worker(task, *args):
+    return task(_worker_state, *args)
+
+
+def _batch_task(state, batch):
+    hits, count, seconds = _match_batch(state.hash_list, batch)
+    return hits, count, count * len(state.hash_list.targets), seconds, seconds
+
+
+def _seed_task(state, seed, depth, max_mutations, batch_size):
+    return _match_seed(state.hash_list, state.lists, seed, depth, max_mutations, batch_size)
+
+
+def _run(tasks, hashes, mode, workers, store_path, stats):
+    stats = stats if stats is not None else MatchStats()
+    stats.workers = workers
+    start = time.perf_counter()
+
+    def account(result):
+        hits, count, hashes, hash_seconds, cpu_seconds = result
+        stats.candidates += count
+        stats.hashes += hashes
+        stats.hits += len(hits)
+        stats.hash_seconds += hash_seconds
+        stats.cpu_seconds += cpu_seconds
+        stats.wall_seconds = time.perf_counter() - start
+        return hits
+
+    if workers == 1:
+        # No pool: run the task functions here, against a state of our own,
+        # so concurrent or nested runs in this process never share one.
+        state = _WorkerState(hashes, mode, store_path)
+        try:
+            for task, *task_args in tasks:
+                yield from account(task(state, *task_args))
+        finally:
+            state.close()
+        return
+
+    with ProcessPoolExecutor(workers, initializer=_init_worker,
+                             initargs=(hashes, mode, store_path)) as pool:
+        pending = deque()
+        while True:
+            # A bounded window keeps memory flat and hits in input order.
+            while len(pending) < 2 * workers:
+                task = next(tasks, None)
+                if task is None:
+                    break
+                pending.append(pool.submit(_call_in_worker, *task))
+            if not pending:
+                return
+            yield from account(pending.popleft().result())
+
+
+def _batches(candidates, batch_size):
+    candidates = iter(candidates)
+    while True:
+        batch = list(islice(candidates, batch_size))
+        if not batch:
+            return
+        yield batch
+
+
+def iter_matches(candidates, hashes, mode='md5', workers=None, batch_size=50_000, stats=None):
+    """
+    Hashes ``candidates`` on a process pool and yields the Hits.
+
+    Parameters:
+        candidates (iterable): Candidate strings, consumed lazily in batches.
+        hashes (str or HashList): Hash file path, loaded by every worker,
+            or a HashList, which is pickled to each worker once.
+        mode (str): Hash mode; ignored when ``hashes`` is a HashList.
+        workers (int): Pool size, defaults to os.cpu_count(). 1 runs in
+            this process.
+        batch_size (int): Candidates per task.
+        stats (MatchStats): Updated as results arrive.
+    """
+    if isinstance(hashes, HashList):
+        mode = hashes.mode
+    tasks = ((_batch_task, batch) for batch in _batches(candidates, batch_size))
+    return _run(tasks, hashes, mode, workers or os.cpu_count() or 1, None, stats)
+
+
+def iter_mutation_matches(seeds, hashes, mode='md5', depth=1, max_mutations=None, workers=None,
+                          batch_size=50_000, store_path=wordstore.DEFAULT_STORE, stats=None):
+    """
+    Like iter_matches, for the mutations of each seed password.
+
+    The mutations are generated inside the workers from the memory-mapped
+    wordlist store (as in batch.py), so only seeds and hits cross process
+    boundaries.
+    """
+    if isinstance(hashes, HashList):
+        mode = hashes.mode
+    wordstore.open_store(store_path).close()
+    tasks = ((_seed_task, seed, depth, max_mutations, batch_size) for seed in seeds)
+    return _run(tasks, hashes, mode, workers or os.cpu_count() or 1, store_path, stats)
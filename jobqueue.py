@@ -0,0 +1,233 @@
+# jobqueue.py
+"""
+Background mutation jobs for the web app.
+
+JobQueue is a local, in-process stand-in for a job broker: jobs are queued
+on a bounded ProcessPoolExecutor and run as MutationJobs (see jobs.py), so
+heavy work never runs on a request thread and never holds the web
+process's GIL. Each job gets a directory holding its output file and the
+MutationJob checkpoint. Progress is read back from that checkpoint, so
+polling costs one small file read no matter how busy the workers are.
+
+Job records live in memory and are lost when the process exits; the
+output files are left on disk.
+"""
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+
+import wordlists
+import wordstore
+from jobs import MutationJob
+
+QUEUED, RUNNING, DONE, FAILED = 'queued', 'running', 'done', 'failed'
+
+
+class QueueFull(Exception):
+    """Raised by JobQueue.submit when ``max_pending`` jobs are already waiting or running."""
+
+
+# Set in each worker by _worker_lists: (wordlist version, WordStore, lists).
+_worker_store = None
+
+
+def _worker_lists(store_path, version):
+    """The worker's (suffixes, prefixes, base_words), reopened when ``version`` changes."""
+    global _worker_store
+    if _worker_store is None or _worker_store[0] != version:
+        if _worker_store is not None:
+            _worker_store[1].close()
+        store = wordstore.WordStore(store_path)
+        _worker_store = (version, store, (store['suffix'], store['prefix'], store['baseword']))
+    return _worker_store[2]
+
+
+def _run_job(job_dir, passwords, depth, max_mutations, checkpoint_seconds, store_path, version):
+    """Worker entry point; stops early, at a checkpoint, once the job's ``stop`` file exists."""
+    with open(os.path.join(job_dir, 'started'), 'w') as f:
+        f.write(repr(time.time()))
+    suffixes, prefixes, base_words = _worker_lists(store_path, version)
+    stop_path = os.path.join(job_dir, 'stop')
+    job = MutationJob(passwords, os.path.join(job_dir, 'output.txt'), depth=depth,
+                      max_mutations=max_mutations, checkpoint_every=10_000,
+                      checkpoint_seconds=checkpoint_seconds,
+                      suffixes=suffixes, prefixes=prefixes, base_words=base_words,
+                      should_stop=lambda: os.path.exists(stop_path))
+    return job.run()
+
+
+class JobRecord:
+    __slots__ = ('id', 'directory', 'passwords', 'depth', 'max_mutations',
+                 'submitted', 'finished', 'result', 'error', 'future')
+
+    def __init__(self, id, directory, passwords, depth, max_mutations):
+        self.id = id
+        self.directory = directory
+        self.passwords = passwords
+        self.depth = depth
+        self.max_mutations = max_mutations
+        self.submitted = time.time()
+        self.finished = None
+        self.result = None
+        self.error = None
+        self.future = None
+
+    @property
+    def output_path(self):
+        return os.path.join(self.directory, 'output.txt')
+
+    def started(self):
+        try:
+            with open(os.path.join(self.directory, 'started'), 'r') as f:
+                return float(f.read())
+        except (FileNotFoundError, ValueError):
+            return None
+
+    def checkpoint(self):
+        try:
+            with open(self.output_path + '.ckpt', 'r') as f:
+                return json.load(f)
+        except (FileNotFoundError, ValueError):
+            # ValueError: caught mid-replace on platforms without atomic rename.
+            return None
+
+
+class JobQueue:
+    """
+    Parameters:
+        directory (str): Where job directories are created.
+        workers (int): Jobs that run at the same time.
+        max_pending (int): Queued plus running jobs accepted before submit
+            raises QueueFull.
+        checkpoint_seconds (float): How often running jobs report progress.
+        store_path (str): Compiled wordlist store opened by every worker.
+            It is rebuilt when a source wordlist changes, and workers
+            reopen it for the next job they run.
+    """
+
+    def __init__(self, directory, workers=2, max_pending=16, checkpoint_seconds=1.0,
+                 store_path=wordstore.DEFAULT_STORE):
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.workers = workers
+        self.max_pending = max_pending
+        self.checkpoint_seconds = checkpoint_seconds
+        self.store_path = store_path
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._pool = None
+
+    def _executor(self):
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(self.workers)
+        return self._pool
+
+    def _pending(self):
+        return sum(1 for job in self._jobs.values() if job.finished is None)
+
+    def pending(self):
+        """Number of queued and running jobs."""
+        with self._lock:
+            return self._pending()
+
+    def submit(self, passwords, depth=2, max_mutations=None):
+        """Queues a job and returns its id."""
+        passwords = list(passwords)
+        with self._lock:
+            if self._pending() >= self.max_pending:
+                raise QueueFull(f"{self.max_pending} jobs already pending")
+            job_id = uuid.uuid4().hex
+            job = JobRecord(job_id, os.path.join(self.directory, job_id), passwords, depth, max_mutations)
+            os.makedirs(job.directory)
+            self._jobs[job_id] = job
+            # Rebuilt here if stale, not in every worker; the version tells
+            # workers holding an older store to reopen it.
+            wordstore.open_store(self.store_path).close()
+            job.future = self._executor().submit(_run_job, job.directory, passwords, depth,
+                                                 max_mutations, self.checkpoint_seconds,
+                                                 self.store_path, wordlists.registry.version())
+        job.future.add_done_callback(lambda future: self._finish(job, future))
+        return job_id
+
+    def _finish(self, job, future):
+        try:
+            job.result = future.result()
+        except Exception as e:
+            job.error = f"{type(e).__name__}: {e}"
+        else:
+            if job.result['stopped']:
+                job.error = "stopped by shutdown; resumable from its checkpoint"
+        job.finished = time.time()
+
+    def get(self, job_id):
+        """The JobRecord for ``job_id``; raises KeyError if unknown."""
+        with self._lock:
+            return self._jobs[job_id]
+
+    def status(self, job_id):
+        """
+        Progress of a job.
+
+        Returns:
+            dict: state, candidates emitted, inputs completed, rate in
+            candidates per second and, when ``max_mutations`` bounds the job,
+            an upper-bound ETA in seconds.
+        """
+        job = self.get(job_id)
+        finished = job.finished
+        started = job.started()
+        if finished is not None:
+            state = FAILED if job.error else DONE
+        else:
+            state = RUNNING if started is not None else QUEUED
+
+        checkpoint = job.checkpoint() or {}
+        emitted = job.result['emitted'] if job.result else checkpoint.get('emitted', 0)
+        if job.result:
+            elapsed = job.result['elapsed']
+        elif started is not None:
+            elapsed = time.time() - started
+        else:
+            elapsed = 0.0
+        rate = emitted / elapsed if elapsed else 0.0
+
+        eta = None
+        if state == RUNNING and job.max_mutations and rate:
+            remaining = len(job.passwords) * job.max_mutations - emitted
+            eta = max(remaining, 0) / rate
+        elif state in (DONE, FAILED):
+            eta = 0.0
+
+        return {
+            'id': job.id,
+            'state': state,
+            'error': job.error,
+            'passwords': len(job.passwords),
+            'inputs_done': len(job.passwords) if state == DONE else checkpoint.get('input_index', 0),
+            'depth': job.depth,
+            'max_mutations': job.max_mutations,
+            'emitted': emitted,
+            'elapsed': elapsed,
+            'rate': rate,
+            'eta': eta,
+            'submitted': job.submitted,
+        }
+
+    def shutdown(self, wait=True):
+        """
+        Stops the pool. With ``wait=False`` queued jobs are cancelled and
+        running ones are asked to stop; they do so at their next checkpoint
+        check, leaving the checkpoint behind.
+        """
+        if self._pool is None:
+            return
+        if not wait:
+            with self._lock:
+                running = [job for job in self._jobs.values() if job.finished is None]
+            for job in running:
+                open(os.path.join(job.directory, 'stop'), 'w').close()
+        self._pool.shutdown(wait=wait, cancel_futures=not wait)
+        self._pool = None
@@ -0,0 +1,250 @@
+# jobs.py
+"""
+Checkpointed, resumable mutation jobs.
+
+A MutationJob runs iter_mutations over a list of input passwords and writes
+the candidates to an output file, one per line. Every so often it flushes
+the output and atomically replaces a small JSON checkpoint next to it:
+
+    input_index        which input password is being mutated
+    password_offset    output offset where that password's candidates start
+    layer_offsets      output offset where each of its layers starts
+    layer, frontier_index, strategy_index, item_index, count
+                       the MutationRun position (see mutations.py)
+    output_offset      bytes of output covered by the checkpoint
+
+The frontier and the dedupe set are not stored separately. Both are exactly
+the candidates already written to the output, so on resume they are rebuilt
+by reading the output back between the recorded offsets. Anything written
+after the last checkpoint is truncated away, and the run continues from the
+saved position, so the final output is the same as an uninterrupted run.
+"""
+import json
+import os
+import time
+from itertools import islice
+
+import wordlists
+from mutations import MutationRun
+
+CHECKPOINT_VERSION = 1
+
+
+class MutationJob:
+    """
+    Parameters:
+        passwords (iterable): Input passwords. Must produce the same sequence
+            again when a job is resumed.
+        output_path (str): Where candidates are written.
+        checkpoint_path (str): Defaults to ``output_path + '.ckpt'``.
+        depth (int): Mutation depth.
+        max_mutations (int): Optional cap per input password.
+        dedupe (str): 'password' dedupes within each input password, as
+            mutation_engine does; 'global' dedupes across the whole output.
+        checkpoint_every (int): Candidates between checkpoint attempts.
+        checkpoint_seconds (float): Minimum time between checkpoints.
+        suffixes, prefixes, base_words: Wordlists, by default the shared registry's.
+        should_stop (callable): Asked every ``checkpoint_every`` candidates;
+            when it returns True the job writes a checkpoint and returns
+            early, to be resumed later.
+    """
+
+    def __init__(self, passwords, output_path, checkpoint_path=None, depth=2, max_mutations=None,
+                 dedupe='password', checkpoint_every=100_000, checkpoint_seconds=10.0,
+                 suffixes=None, prefixes=None, base_words=None, should_stop=None):
+        if dedupe not in ('password', 'global'):
+            raise ValueError("dedupe must be 'password' or 'global'")
+        self.passwords = passwords
+        self.output_path = output_path
+        self.checkpoint_path = checkpoint_path or output_path + '.ckpt'
+        self.depth = depth
+        self.max_mutations = max_mutations
+        self.dedupe = dedupe
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_seconds = checkpoint_seconds
+        self.suffixes = wordlists.registry.unique('suffix') if suffixes is None else suffixes
+        self.prefixes = wordlists.registry.unique('prefix') if prefixes is None else prefixes
+        self.base_words = wordlists.registry.unique('baseword') if base_words is None else base_words
+        self.should_stop = should_stop
+
+        self.checkpoints = 0
+        self.checkpoint_time = 0.0
+
+    def _params(self):
+        return {'depth': self.depth, 'max_mutations': self.max_mutations, 'dedupe': self.dedupe}
+
+    def load_checkpoint(self):
+        """The saved checkpoint, or None for a fresh job."""
+        try:
+            with open(self.checkpoint_path, 'r') as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return None
+        if state.get('version') != CHECKPOINT_VERSION:
+            raise ValueError(f"{self.checkpoint_path}: unsupported checkpoint version")
+        if state['params'] != self._params():
+            raise ValueError(f"{self.checkpoint_path} was written with different parameters: {state['params']}")
+        return state
+
+    def _write_checkpoint(self, out, state):
+        start = time.perf_counter()
+        out.flush()
+        os.fsync(out.fileno())
+        tmp_path = self.checkpoint_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(state, f)
+        os.replace(tmp_path, self.checkpoint_path)
+        self.checkpoints += 1
+        self.checkpoint_time += time.perf_counter() - start
+
+    def _read_lines(self, start, stop):
+        with open(self.output_path, 'rb') as f:
+            f.seek(start)
+            data = f.read(stop - start)
+        # Only '\n' ends a line; splitlines() would also split candidates
+        # on characters such as '\x0c' or '\u2028'.
+        return data.decode('utf-8').split('\n')[:-1]
+
+    def _resume_run(self, password, state, seen):
+        """Rebuilds the MutationRun described by ``state`` from the output file."""
+        run = MutationRun(password, self.suffixes, self.prefixes, self.base_words,
+                          self.depth, self.max_mutations, seen=seen)
+        offsets = state['layer_offsets'] + [state['output_offset']]
+
+        def layer_lines(layer):
+            lines = self._read_lines(offsets[layer], offsets[layer + 1])
+            if layer == 0:
+                # The first layer's frontier always starts with the password.
+                lines = [password] + [line for line in lines if line != password]
+            return lines
+
+        if state['password'] != password:
+            raise ValueError(f"input {state['input_index']} changed since the checkpoint was written")
+        seen.update(self._read_lines(state['password_offset'], state['output_offset']))
+
+        run.layer = state['layer']
+        if run.layer == 0:
+            run.next_frontier = layer_lines(0)
+        else:
+            run.frontier = layer_lines(run.layer - 1)
+            run.next_frontier = layer_lines(run.layer) if run.layer < self.depth else []
+        run.frontier_index = state['frontier_index']
+        run.strategy_index = state['strategy_index']
+        run.item_index = state['item_index']
+        run.count = state['count']
+        return run
+
+    def run(self):
+        """
+        Runs (or resumes) the job to completion.
+
+        Returns:
+            dict: emitted candidates, elapsed seconds, checkpoints written,
+            the fraction of the run spent writing them, and whether
+            ``should_stop`` ended it early.
+        """
+        state = self.load_checkpoint()
+        if state and state.get('done'):
+            return {'emitted': state['emitted'], 'elapsed': 0.0, 'checkpoints': 0, 'overhead': 0.0,
+                    'stopped': False}
+
+        if state:
+            try:
+                size = os.path.getsize(self.output_path)
+            except FileNotFoundError:
+                size = None
+            if size is None or size < state['output_offset']:
+                raise ValueError(f"{self.output_path} is missing or shorter than its checkpoint "
+                                 f"{self.checkpoint_path}; delete the checkpoint to start over")
+
+        started = time.perf_counter()
+        stopped = False
+        out = open(self.output_path, 'r+b' if state else 'wb')
+        try:
+            if state:
+                out.truncate(state['output_offset'])
+                out.seek(state['output_offset'])
+                offset = state['output_offset']
+                emitted = state['emitted']
+                input_index = state['input_index']
+            else:
+                offset = emitted = input_index = 0
+
+            global_seen = set() if self.dedupe == 'global' else None
+            if global_seen is not None and state:
+                global_seen.update(self._read_lines(0, state['password_offset']))
+
+            last_checkpoint = time.perf_counter()
+            countdown = self.checkpoint_every
+            for password in islice(self.passwords, input_index, None):
+                seen = global_seen if global_seen is not None else set()
+                if state:
+                    run = self._resume_run(password, state, seen)
+                    password_offset = state['password_offset']
+                    layer_offsets = state['layer_offsets']
+                    state = None
+                else:
+                    run = MutationRun(password, self.suffixes, self.prefixes, self.base_words,
+                                      self.depth, self.max_mutations, seen=seen)
+                    password_offset = offset
+                    layer_offsets = [offset]
+
+                layer = len(layer_offsets) - 1
+                write = out.write
+                for candidate in run:
+                    if run.layer != layer:
+                        while len(layer_offsets) <= run.layer:
+                            layer_offsets.append(offset)
+                        layer = run.layer
+                    line = (candidate + '\n').encode('utf-8')
+                    write(line)
+                    offset += len(line)
+                    emitted += 1
+
+                    countdown -= 1
+                    if not countdown:
+                        countdown = self.checkpoint_every
+                        now = time.perf_counter()
+                        stopped = self.should_stop is not None and self.should_stop()
+                        if stopped or now - last_checkpoint >= self.checkpoint_seconds:
+                            self._write_checkpoint(out, {
+                                'version': CHECKPOINT_VERSION,
+                                'params': self._params(),
+                                'input_index': input_index,
+                                'password': password,
+                                'password_offset': password_offset,
+                                'layer_offsets': layer_offsets,
+                                'layer': run.layer,
+                                'frontier_index': run.frontier_index,
+                                'strategy_index': run.strategy_index,
+                                'item_index': run.item_index,
+                                'count': run.count,
+                                'output_offset': offset,
+                                'emitted': emitted,
+                            })
+                            last_checkpoint = time.perf_counter()
+                            if stopped:
+                                break
+                if stopped:
+                    break
+                input_index += 1
+            else:
+                self._write_checkpoint(out, {
+                    'version': CHECKPOINT_VERSION,
+                    'params': self._params(),
+                    'done': True,
+                    'input_index': input_index,
+                    'output_offset': offset,
+                    'emitted': emitted,
+                })
+        finally:
+            out.close()
+
+        elapsed = time.perf_counter() - started
+        return {
+            'emitted': emitted,
+            'elapsed': elapsed,
+            'checkpoints': self.checkpoints,
+            'overhead': self.checkpoint_time / elapsed if elapsed else 0.0,
+            'stopped': stopped,
+        }
@@ -0,0 +1,183 @@
+# keyspace.py
+"""
+Indexed keyspace over the leet / capitalization / affix mutations of one
+password.
+
+Every candidate has an integer index in ``range(len(space))``:
+
+    index = (prefix * middle_size + middle) * suffix_size + suffix
+
+where ``prefix``/``suffix`` pick an entry of the affix lists (0 is "none")
+and ``middle`` picks a case variant and one leetspeak choice per character,
+in the same order itertools.product uses in mutations.iter_leetspeak. Since
+the mapping is a plain mixed-radix number, any index can be turned into its
+candidate (``unrank``) and back (``rank``) without generating what comes
+before it. That gives exact, non-overlapping shards (``shard``) and resuming
+from a checkpoint offset (``iter_range(start)``).
+"""
+from itertools import islice
+
+from mutations import leet_options
+
+CASE_MODES = ('none', 'lower', 'upper', 'capitalize', 'toggle')
+
+
+def apply_case(password, mode):
+    if mode == 'none':
+        return password
+    if mode == 'lower':
+        return password.lower()
+    if mode == 'upper':
+        return password.upper()
+    if mode == 'capitalize':
+        return password.capitalize()
+    if mode == 'toggle':
+        return ''.join(c.upper() if i % 2 == 0 else c.lower() for i, c in enumerate(password))
+    raise ValueError(f"unknown case mode {mode!r}")
+
+
+def mixed_radix_unrank(index, radices):
+    """Digits of ``index`` in the given radices, last digit varying fastest."""
+    digits = [0] * len(radices)
+    for i in range(len(radices) - 1, -1, -1):
+        index, digits[i] = divmod(index, radices[i])
+    if index:
+        raise IndexError("index out of range")
+    return digits
+
+
+def mixed_radix_rank(digits, radices):
+    index = 0
+    for digit, radix in zip(digits, radices):
+        index = index * radix + digit
+    return index
+
+
+def shard_range(size, index, count):
+    """The ``index``-th of ``count`` contiguous, non-overlapping ranges covering ``size``."""
+    if not 0 <= index < count:
+        raise ValueError("shard index must be in range(count)")
+    return size * index // count, size * (index + 1) // count
+
+
+class LeetKeyspace:
+    """
+    Random-access view of every leet/case/affix variant of ``password``.
+
+    Parameters:
+        password (str): The base password.
+        prefixes (sequence): Optional prefix list; index 0 means no prefix.
+        suffixes (sequence): Optional suffix list; index 0 means no suffix.
+        case_modes (tuple): Case variants to include, from CASE_MODES. Modes
+            that produce the same string are only counted once.
+    """
+
+    def __init__(self, password, prefixes=(), suffixes=(), case_modes=CASE_MODES):
+        self.password = password
+        self.prefixes = [''] + list(prefixes)
+        self.suffixes = [''] + list(suffixes)
+        self.cases = list(dict.fromkeys(apply_case(password, mode) for mode in case_modes))
+        self._options = [leet_options(cased) for cased in self.cases]
+        # leet_options depends only on the lowercased character, so every
+        # case variant has the same radices.
+        self.leet_radices = [len(opts) for opts in self._options[0]] if self.cases else []
+        self.leet_size = 1
+        for radix in self.leet_radices:
+            self.leet_size *= radix
+        self.middle_size = len(self.cases) * self.leet_size
+        self.size = len(self.prefixes) * self.middle_size * len(self.suffixes)
+        self._prefix_index = None
+        self._suffix_index = None
+
+    def __len__(self):
+        return self.size
+
+    def _middle(self, middle):
+        case, leet = divmod(middle, self.leet_size)
+        options = self._options[case]
+        return ''.join(opts[d] for opts, d in zip(options, mixed_radix_unrank(leet, self.leet_radices)))
+
+    def unrank(self, index):
+        """The candidate at ``index``."""
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("keyspace index out of range")
+        rest, suffix = divmod(index, len(self.suffixes))
+        prefix, middle = divmod(rest, self.middle_size)
+        return self.prefixes[prefix] + self._middle(middle) + self.suffixes[suffix]
+
+    __getitem__ = unrank
+
+    def _parse_leet(self, options, text, pos=0, position=0):
+        """Yields every digit list that spells ``text`` with ``options``."""
+        if position == len(options):
+            if pos == len(text):
+                yield []
+            return
+        for digit, option in enumerate(options[position]):
+            if text.startswith(option, pos):
+                for rest in self._parse_leet(options, text, pos + len(option), position + 1):
+                    yield [digit] + rest
+
+    def rank(self, candidate):
+        """
+        Lowest index whose candidate equals ``candidate``.
+
+        Raises:
+            ValueError: If the candidate is not in this keyspace.
+        """
+        if self._prefix_index is None:
+            self._prefix_index = {}
+            for i, prefix in enumerate(self.prefixes):
+                self._prefix_index.setdefault(prefix, i)
+            self._suffix_index = {}
+            for i, suffix in enumerate(self.suffixes):
+                self._suffix_index.setdefault(suffix, i)
+
+        best = None
+        for split in range(len(candidate) + 1):
+            prefix = self._prefix_index.get(candidate[:split])
+            if prefix is None:
+                continue
+            for cut in range(len(candidate), split - 1, -1):
+                suffix = self._suffix_index.get(candidate[cut:])
+                if suffix is None:
+                    continue
+                text = candidate[split:cut]
+                for case, options in enumerate(self._options):
+                    for digits in self._parse_leet(options, text):
+                        middle = case * self.leet_size + mixed_radix_rank(digits, self.leet_radices)
+                        index = (prefix * self.middle_size + middle) * len(self.suffixes) + suffix
+                        if best is None or index < best:
+                            best = index
+        if best is None:
+            raise ValueError(f"{candidate!r} is not in the keyspace of {self.password!r}")
+        return best
+
+    def iter_range(self, start=0, stop=None):
+        """Yields candidates ``start`` .. ``stop - 1`` without touching earlier ones."""
+        stop = self.size if stop is None else min(stop, self.size)
+        if start >= stop:
+            return
+        suffixes = self.suffixes
+        rest, suffix = divmod(start, len(suffixes))
+        prefix, middle = divmod(rest, self.middle_size)
+        remaining = stop - start
+        while remaining:
+            head = self.prefixes[prefix] + self._middle(middle)
+            take = min(len(suffixes) - suffix, remaining)
+            for tail in islice(suffixes, suffix, suffix + take):
+                yield head + tail
+            remaining -= take
+            suffix = 0
+            middle += 1
+            if middle == self.middle_size:
+                middle = 0
+                prefix += 1
+
+    __iter__ = iter_range
+
+    def shard(self, index, count):
+        """(start, stop) of shard ``index`` out of ``count``."""
+        return shard_range(self.size, index, count)
@@ -0,0 +1,416 @@
+# leakcheck.py
+"""
+Bulk membership checks against breached-credential corpora.
+
+``build_index`` turns a corpus (commoncredentials.txt, or any file with one
+password per line) into a sorted array of 64-bit fingerprints on disk.
+``LeakIndex`` memory-maps that array, so opening even a multi-gigabyte
+index is instant and pages are shared between processes, and answers
+membership with binary search: vectorised through numpy.searchsorted when
+numpy is installed, otherwise with bisect over the mapped array.
+
+Fingerprints are 64-bit hashes of the raw line. The bytes are zero-padded
+to whole little-endian 64-bit words and folded into a state seeded with the
+length, one multiply-xorshift step per word, then finished with the
+splitmix64 mixer. Every step is a uint64 operation, so with numpy a whole
+batch is hashed column by column, a few words per entry, instead of one
+hash call per entry. Two distinct passwords collide with probability about
+n / 2**64 per lookup, i.e. never in practice for corpora of a few billion
+entries. The hash is not built to resist crafted collisions; one would
+only make a candidate look leaked.
+
+Layout (native byte order):
+
+    magic        8 bytes   b'LETHELK1'
+    header_len   uint64
+    header       JSON, padded to a multiple of 8 bytes
+    keys         uint64[count], sorted, distinct
+
+Corpora larger than memory are handled by sorting fixed-size runs to
+temporary files and merging them.
+"""
+import heapq
+import json
+import mmap
+import os
+import struct
+import tempfile
+from array import array
+from bisect import bisect_left
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import compress, islice
+
+import wordlists
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+MAGIC = b'LETHELK1'
+FORMAT_VERSION = 2
+HASH_NAME = 'fold64-splitmix'
+DEFAULT_CORPUS = os.path.join(wordlists.DATA_DIR, 'commoncredentials.txt')
+DEFAULT_INDEX = os.path.join(wordlists.DATA_DIR, 'commoncredentials.lki')
+HEADER_SLOT = 4096
+
+
+_SEED = 0x9E3779B97F4A7C15
+_MULTIPLIER = 0xFF51AFD7ED558CCD
+_MASK = 2**64 - 1
+# Entries up to this many words share one padded matrix; longer ones are
+# hashed in groups of similar width so one long line cannot widen a batch.
+_MATRIX_WORDS = 8
+
+
+def _fingerprint(raw):
+    """Fingerprint of one entry (bytes), in pure Python."""
+    h = _SEED ^ len(raw)
+    for (word,) in struct.iter_unpack('<Q', raw + bytes(-len(raw) % 8)):
+        h = ((h ^ word) * _MULTIPLIER) & _MASK
+        h ^= h >> 32
+    h = ((h ^ (h >> 30)) * 0xBF58476D1CE4E5B9) & _MASK
+    h = ((h ^ (h >> 27)) * 0x94D049BB133111EB) & _MASK
+    return h ^ (h >> 31)
+
+
+def _np_fold(raw_words, state, widths):
+    """Folds the words of ``raw_words`` into ``state``; ``widths`` are their lengths in words."""
+    width = int(widths.max())
+    matrix = np.array(raw_words, dtype=f'S{8 * width}').view('<u8').reshape(len(raw_words), width)
+    narrowest = int(widths.min())
+    multiplier, shift = np.uint64(_MULTIPLIER), np.uint64(32)
+    for j in range(width):
+        folded = (state ^ matrix[:, j]) * multiplier
+        folded ^= folded >> shift
+        state = folded if j < narrowest else np.where(widths > j, folded, state)
+    return state
+
+
+def _np_fingerprints(raw_words):
+    """uint64 numpy array of the fingerprints of ``raw_words`` (a list of bytes)."""
+    lengths = np.fromiter(map(len, raw_words), dtype=np.uint64, count=len(raw_words))
+    widths = (lengths + np.uint64(7)) >> np.uint64(3)
+    keys = lengths ^ np.uint64(_SEED)
+    widest = int(widths.max()) if len(raw_words) else 0
+    with np.errstate(over='ignore'):
+        low, high = 0, _MATRIX_WORDS
+        while low < widest:
+            if low == 0 and widest <= high:
+                keys = _np_fold(raw_words, keys, widths)
+            else:
+                rows = np.flatnonzero((widths > low) & (widths <= high))
+                if len(rows):
+                    keys[rows] = _np_fold([raw_words[i] for i in rows.tolist()], keys[rows], widths[rows])
+            low, high = high, high * 4
+        keys ^= keys >> np.uint64(30)
+        keys *= np.uint64(0xBF58476D1CE4E5B9)
+        keys ^= keys >> np.uint64(27)
+        keys *= np.uint64(0x94D049BB133111EB)
+        keys ^= keys >> np.uint64(31)
+    return keys
+
+
+def _digests(raw_words):
+    """Concatenated native-order 8-byte fingerprints of ``raw_words`` (a list of bytes)."""
+    if np is not None:
+        return _np_fingerprints(raw_words).tobytes()
+    return array('Q', map(_fingerprint, raw_words)).tobytes()
+
+
+def _raw(word):
+    """The bytes a corpus line would hold for ``word``; bytes pass through as is."""
+    if isinstance(word, bytes):
+        return word
+    # surrogateescape restores the original bytes of text that was decoded
+    # with errors='surrogateescape', so non-UTF-8 entries can still match.
+    return word.encode('utf-8', 'surrogateescape')
+
+
+def _raw_words(words):
+    """``_raw`` over a list, with a fast path for the usual all-str batch."""
+    try:
+        # One encode and one split instead of an encode call per word.
+        raw_words = '\n'.join(words).encode('utf-8', 'surrogateescape').split(b'\n')
+    except TypeError:  # some are bytes already
+        return [_raw(word) for word in words]
+    if len(raw_words) != len(words):  # empty, or a word contains '\n'
+        return [_raw(word) for word in words]
+    return raw_words
+
+
+def fingerprints(words):
+    """array('Q') of fingerprints for an iterable of str or bytes."""
+    keys = array('Q')
+    keys.frombytes(_digests(_raw_words(list(words))))
+    return keys
+
+
+def fingerprint(word):
+    return fingerprints([word])[0]
+
+
+def iter_corpus(paths):
+    """Yields the non-empty lines of ``paths`` as bytes, without decoding."""
+    for path in paths:
+        with open(path, 'rb') as f:
+            for line in f:
+                line = line.rstrip(b'\r\n')
+                if line:
+                    yield line
+
+
+def _sorted_unique(keys):
+    if np is not None:
+        return array('Q', np.unique(np.frombuffer(keys, dtype=np.uint64)).tobytes())
+    return array('Q', sorted(set(keys)))
+
+
+def _read_run(path, block=1 << 16):
+    with open(path, 'rb') as f:
+        while True:
+            keys = array('Q')
+            try:
+                keys.fromfile(f, block)
+            except EOFError:
+                pass
+            if not keys:
+                return
+            yield from keys
+
+
+def _signature(paths):
+    signature = []
+    for path in paths:
+        st = os.stat(path)
+        signature.append([os.path.abspath(path), st.st_size, st.st_mtime_ns])
+    return signature
+
+
+def build_index(sources, path=DEFAULT_INDEX, run_items=20_000_000, tmp_dir=None):
+    """
+    Writes a fingerprint index for the corpus files ``sources``.
+
+    Parameters:
+        sources: A path or list of paths, one password per line.
+        path (str): Index file to write; replaced atomically.
+        run_items (int): Fingerprints sorted in memory at a time (8 bytes
+            each). Larger corpora are sorted in runs and merged from disk.
+        tmp_dir (str): Where sorted runs are spilled, next to ``path`` by default.
+
+    Returns:
+        dict: The index header (entry count, sources).
+    """
+    if isinstance(sources, str):
+        sources = [sources]
+    return _write_index(iter_corpus(sources), path, _signature(sources), run_items, tmp_dir)
+
+
+def build_index_from_entries(entries, path, run_items=20_000_000, tmp_dir=None):
+    """Like build_index, for an iterable of str or bytes entries. The index is never considered fresh."""
+    entries = (entry.encode('utf-8') if isinstance(entry, str) else entry for entry in entries)
+    return _write_index(entries, path, None, run_items, tmp_dir)
+
+
+def _write_index(entries, path, sources, run_items, tmp_dir):
+    runs = []
+    tmp_dir = tmp_dir or os.path.dirname(os.path.abspath(path))
+    try:
+        while True:
+            run = array('Q')
+            while len(run) < run_items:
+                batch = list(islice(entries, min(run_items - len(run), 1 << 16)))
+                if not batch:
+                    break
+                run.frombytes(_digests(batch))
+            if not run:
+                break
+            exhausted = len(run) < run_items
+            run = _sorted_unique(run)
+            if exhausted and not runs:
+                runs.append(run)  # everything fitted in one run; keep it in memory
+                break
+            fd, run_path = tempfile.mkstemp(suffix='.run', dir=tmp_dir)
+            with os.fdopen(fd, 'wb') as f:
+                run.tofile(f)
+            runs.append(run_path)
+
+        header = {'format': FORMAT_VERSION, 'hash': HASH_NAME, 'sources': sources}
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            # The count is only known after merging, so the header goes
+            # into a fixed-size slot that is filled in last.
+            f.seek(len(MAGIC) + 8 + HEADER_SLOT)
+            count = 0
+            if len(runs) == 1 and isinstance(runs[0], array):
+                runs[0].tofile(f)
+                count = len(runs[0])
+            elif runs:
+                out = array('Q')
+                last = None
+                for key in heapq.merge(*(_read_run(run) for run in runs)):
+                    if key != last:
+                        out.append(key)
+                        last = key
+                        if len(out) >= 1 << 16:
+                            out.tofile(f)
+                            count += len(out)
+                            out = array('Q')
+                count += len(out)
+                out.tofile(f)
+            header['count'] = count
+            raw_header = json.dumps(header).encode()
+            if len(raw_header) > HEADER_SLOT:
+                header['sources'] = None  # too many files to record; never considered fresh
+                raw_header = json.dumps(header).encode()
+            raw_header += b' ' * (HEADER_SLOT - len(raw_header))
+            f.seek(0)
+            f.write(MAGIC)
+            f.write(struct.pack('=Q', len(raw_header)))
+            f.write(raw_header)
+        os.replace(tmp_path, path)
+    finally:
+        for run in runs:
+            if isinstance(run, str):
+                os.remove(run)
+    return header
+
+
+def read_header(path):
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a Lethe leak index")
+        (header_len,) = struct.unpack('=Q', f.read(8))
+        return json.loads(f.read(header_len))
+
+
+def is_stale(path, sources):
+    """True if the index is missing or was built from different versions of ``sources``."""
+    try:
+        header = read_header(path)
+    except (OSError, ValueError):
+        return True
+    return header.get('format') != FORMAT_VERSION or header.get('sources') != _signature(sources)
+
+
+class LeakIndex:
+    """Read-only, memory-mapped fingerprint index."""
+
+    def __init__(self, path=DEFAULT_INDEX):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._mmap[:len(MAGIC)] != MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a Lethe leak index")
+        (header_len,) = struct.unpack_from('=Q', self._mmap, len(MAGIC))
+        data_start = len(MAGIC) + 8 + header_len
+        self.header = json.loads(self._mmap[len(MAGIC) + 8:data_start])
+        if self.header.get('format') != FORMAT_VERSION:
+            self._mmap.close()
+            raise ValueError(f"{path} uses an older index format; rebuild it with `cli.py leak-index`")
+        count = self.header['count']
+        self._keys = memoryview(self._mmap)[data_start:data_start + 8 * count].cast('Q')
+        self._np_keys = np.frombuffer(self._keys, dtype=np.uint64) if np is not None else None
+
+    def __len__(self):
+        return len(self._keys)
+
+    def _contains_key(self, key):
+        keys = self._keys
+        i = bisect_left(keys, key)
+        return i < len(keys) and keys[i] == key
+
+    def __contains__(self, word):
+        return self._contains_key(fingerprint(word))
+
+    def contains_many(self, words):
+        """List of booleans, one per word, in order."""
+        raw_words = _raw_words(words if isinstance(words, list) else list(words))
+        if self._np_keys is not None and len(self._np_keys):
+            queries = _np_fingerprints(raw_words)
+            # Searching in sorted order walks the index once instead of
+            # taking log2(n) cache misses per query on a large index.
+            order = np.argsort(queries)
+            positions = np.empty(len(queries), dtype=np.intp)
+            positions[order] = np.searchsorted(self._np_keys, queries[order])
+            positions[positions == len(self._np_keys)] = 0
+            return (self._np_keys[positions] == queries).tolist()
+        contains = self._contains_key
+        keys = array('Q')
+        keys.frombytes(_digests(raw_words))
+        return [contains(key) for key in keys]
+
+    def check(self, candidates, batch_size=100_000):
+        """
+        Yields the candidates that are in the index, in input order.
+
+        ``candidates`` may be any iterable of str or bytes (a file's lines, a
+        stream, iter_mutations) and is consumed lazily in batches. Bytes are
+        looked up exactly as given, like the corpus lines.
+        """
+        candidates = iter(candidates)
+        while True:
+            batch = list(islice(candidates, batch_size))
+            if not batch:
+                return
+            yield from compress(batch, self.contains_many(batch))
+
+    def close(self):
+        self._np_keys = None
+        try:
+            self._keys.release()
+            self._mmap.close()
+        except BufferError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# Set in each worker by _init_worker.
+_worker_index = None
+
+
+def _init_worker(path):
+    global _worker_index
+    _worker_index = LeakIndex(path)
+
+
+def _check_task(batch):
+    return list(compress(batch, _worker_index.contains_many(batch)))
+
+
+def iter_check_parallel(candidates, path=DEFAULT_INDEX, workers=None, batch_size=100_000):
+    """
+    LeakIndex.check on a process pool; fingerprinting is the bottleneck and
+    scales with cores. Every worker maps the same index file, so its pages
+    are shared. Yields hits in input order.
+    """
+    workers = workers or os.cpu_count() or 1
+    candidates = iter(candidates)
+    with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(path,)) as pool:
+        pending = deque()
+        while True:
+            while len(pending) < 2 * workers:
+                batch = list(islice(candidates, batch_size))
+                if not batch:
+                    break
+                pending.append(pool.submit(_check_task, batch))
+            if not pending:
+                return
+            yield from pending.popleft().result()
+
+
+def open_index(path=DEFAULT_INDEX, sources=(DEFAULT_CORPUS,)):
+    """
+    Opens the index at ``path``, rebuilding it first if any source changed.
+    Pass ``sources=None`` to open a prebuilt index as is.
+    """
+    if sources is not None and is_stale(path, sources):
+        build_index(list(sources), path)
+    return LeakIndex(path)
@@ -0,0 +1,324 @@
+# mask.py
+"""
+Mask and hybrid (wordlist + mask) candidate generation.
+
+A mask describes one charset per position, in hashcat syntax:
+
+    ?l  abcdefghijklmnopqrstuvwxyz
+    ?u  ABCDEFGHIJKLMNOPQRSTUVWXYZ
+    ?d  0123456789
+    ?s  space and the printable ASCII symbols  !"#$%&'()*+,-./:;<=>?@[\\]^_`{|}~
+    ?a  ?l?u?d?s
+    ?h  0123456789abcdef        ?H  0123456789ABCDEF
+    ?1 .. ?4  custom charsets, which may themselves use the codes above
+    ??  a literal '?'; any other character stands for itself
+
+``Mask('?u?l?l?d?d')`` is a read-only sequence of every candidate. Like
+keyspace.LeetKeyspace, a candidate's index is a mixed-radix number (last
+position varying fastest), so the keyspace size is exact, ``unrank``
+and ``rank`` need no enumeration, and ``shard`` splits it into
+non-overlapping index ranges. A mask is never materialized. Candidates
+are built from a precomputed tail: every combination of the last few
+positions, up to TAIL_SIZE strings. Each chunk is then a single
+``map(head.__add__, tail)``, which runs at C speed.
+
+Hybrid mode puts a word in front of (or behind) every mask candidate,
+like hashcat's -a 6 / -a 7. ``iter_hybrid`` works on any iterable of
+words, such as mutation_engine or iter_mutations output. ``HybridKeyspace``
+is the indexed version for a word sequence.
+
+A Mask can also stand in for a suffix list: ``Mask('?d?d?d?d?d')`` is
+exactly data/zipcodes.txt, in the same order, without its 100k strings.
+"""
+import string
+from collections.abc import Sequence
+from itertools import islice, product, repeat
+
+from keyspace import mixed_radix_rank, mixed_radix_unrank, shard_range
+
+CHARSETS = {
+    'l': string.ascii_lowercase,
+    'u': string.ascii_uppercase,
+    'd': string.digits,
+    's': ' ' + string.punctuation,
+    'h': '0123456789abcdef',
+    'H': '0123456789ABCDEF',
+}
+CHARSETS['a'] = CHARSETS['l'] + CHARSETS['u'] + CHARSETS['d'] + CHARSETS['s']
+CUSTOM = ('1', '2', '3', '4')
+
+# Most strings precomputed for the fastest-varying positions of a mask.
+TAIL_SIZE = 65536
+
+
+def expand_charset(spec, custom=None):
+    """
+    The characters of a charset spec such as '?l?d_', duplicates removed.
+
+    Parameters:
+        custom (dict): Custom charsets by digit ('1'..'4'), already expanded.
+    """
+    chars = []
+    i = 0
+    while i < len(spec):
+        char = spec[i]
+        if char == '?':
+            if i + 1 == len(spec):
+                raise ValueError(f"charset {spec!r} ends with a lone '?'")
+            code = spec[i + 1]
+            if code in CHARSETS:
+                chars.append(CHARSETS[code])
+            elif code in CUSTOM:
+                if not custom or code not in custom:
+                    raise ValueError(f"custom charset ?{code} is not defined")
+                chars.append(custom[code])
+            elif code == '?':
+                chars.append('?')
+            else:
+                raise ValueError(f"unknown charset ?{code}")
+            i += 2
+        else:
+            chars.append(char)
+            i += 1
+    return ''.join(dict.fromkeys(''.join(chars)))
+
+
+def parse_mask(mask, custom_charsets=None):
+    """
+    One charset string per position of ``mask``.
+
+    Parameters:
+        custom_charsets (dict or list): Specs for ?1..?4, by digit or in
+            order, e.g. ['?l?d', '!@#'].
+    """
+    if isinstance(custom_charsets, (list, tuple)):
+        custom_charsets = dict(zip(CUSTOM, custom_charsets))
+    custom = {}
+    for code, spec in (custom_charsets or {}).items():
+        code = str(code)
+        if code not in CUSTOM:
+            raise ValueError(f"custom charsets are ?1 to ?4, not ?{code}")
+        # Custom charsets may use built-in codes but not each other.
+        custom[code] = expand_charset(spec)
+        if not custom[code]:
+            raise ValueError(f"custom charset ?{code} is empty")
+    positions = []
+    i = 0
+    while i < len(mask):
+        if mask[i] == '?':
+            positions.append(expand_charset(mask[i:i + 2], custom))
+            i += 2
+        else:
+            positions.append(mask[i])
+            i += 1
+    if not positions:
+        raise ValueError("empty mask")
+    return positions
+
+
+class Mask(Sequence):
+    """
+    Every candidate of a mask, by index.
+
+    Parameters:
+        mask (str): The mask, e.g. '?u?l?l?l?d?d'.
+        custom_charsets (dict or list): Definitions of ?1..?4.
+    """
+
+    def __init__(self, mask, custom_charsets=None):
+        self.mask = mask
+        self.positions = parse_mask(mask, custom_charsets)
+        self.radices = [len(chars) for chars in self.positions]
+        self.size = 1
+        for radix in self.radices:
+            self.size *= radix
+        # The fastest-varying positions form the precomputed tail.
+        split = len(self.positions)
+        self.tail_size = 1
+        while split > 1 and self.tail_size * self.radices[split - 1] <= TAIL_SIZE:
+            split -= 1
+            self.tail_size *= self.radices[split]
+        self._head_positions = self.positions[:split]
+        self._head_radices = self.radices[:split]
+        self._tail_positions = self.positions[split:]
+        self._tail = None
+        self._lookup = None
+
+    def __repr__(self):
+        return f"Mask({self.mask!r})"
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def tail(self):
+        if self._tail is None:
+            self._tail = list(map(''.join, product(*self._tail_positions)))
+        return self._tail
+
+    def _head(self, index):
+        return ''.join(chars[d] for chars, d in
+                       zip(self._head_positions, mixed_radix_unrank(index, self._head_radices)))
+
+    def unrank(self, index):
+        """The candidate at ``index``."""
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("mask index out of range")
+        return ''.join(chars[d] for chars, d in zip(self.positions, mixed_radix_unrank(index, self.radices)))
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self.size)
+            if step != 1:
+                return [self.unrank(i) for i in range(start, stop, step)]
+            return list(self.iter_range(start, stop))
+        return self.unrank(index)
+
+    def rank(self, candidate):
+        """
+        Index of ``candidate``.
+
+        Raises:
+            ValueError: If the mask cannot produce it.
+        """
+        if self._lookup is None:
+            self._lookup = [{char: i for i, char in enumerate(chars)} for chars in self.positions]
+        if len(candidate) != len(self.positions):
+            raise ValueError(f"{candidate!r} does not match {self.mask!r}")
+        try:
+            digits = [lookup[char] for lookup, char in zip(self._lookup, candidate)]
+        except KeyError:
+            raise ValueError(f"{candidate!r} does not match {self.mask!r}") from None
+        return mixed_radix_rank(digits, self.radices)
+
+    def __contains__(self, candidate):
+        try:
+            self.rank(candidate)
+        except (TypeError, ValueError):
+            return False
+        return True
+
+    def index(self, candidate, start=0, stop=None):
+        """Like rank, but raises ValueError unless the index is in ``start`` .. ``stop - 1``."""
+        index = self.rank(candidate)
+        start, stop, _ = slice(start, stop).indices(self.size)
+        if not start <= index < stop:
+            raise ValueError(f"{candidate!r} is not in {self.mask!r}[{start}:{stop}]")
+        return index
+
+    def count(self, candidate):
+        return int(candidate in self)
+
+    def iter_chunks(self, start=0, stop=None, prefix='', suffix=''):
+        """
+        Candidates ``start`` .. ``stop - 1`` as lists, one list per tail pass.
+
+        ``prefix`` and ``suffix`` are joined to every candidate (hybrid mode)
+        without a second pass over the chunk. Negative indices count from
+        the end and out-of-range ones are clamped, as in slicing.
+        """
+        start, stop, _ = slice(start, stop).indices(self.size)
+        if start >= stop:
+            return
+        tail = self.tail
+        if suffix:
+            tail = list(map(str.__add__, tail, repeat(suffix)))
+        head_index, offset = divmod(start, self.tail_size)
+        remaining = stop - start
+        while remaining:
+            head = prefix + self._head(head_index)
+            take = min(self.tail_size - offset, remaining)
+            if take == self.tail_size:
+                yield list(map(head.__add__, tail))
+            else:
+                yield list(map(head.__add__, islice(tail, offset, offset + take)))
+            remaining -= take
+            offset = 0
+            head_index += 1
+
+    def iter_range(self, start=0, stop=None):
+        """Yields candidates ``start`` .. ``stop - 1`` without touching earlier ones."""
+        for chunk in self.iter_chunks(start, stop):
+            yield from chunk
+
+    __iter__ = iter_range
+
+    def shard(self, index, count):
+        """(start, stop) of shard ``index`` out of ``count``."""
+        return shard_range(self.size, index, count)
+
+
+def iter_hybrid(words, mask, prepend=False):
+    """
+    Yields lists of ``word + candidate`` (``candidate + word`` with
+    ``prepend``) for every word in ``words`` and every candidate of ``mask``.
+
+    Parameters:
+        words (iterable): Any words, e.g. iter_mutations output.
+        mask (Mask or str): The mask.
+    """
+    if isinstance(mask, str):
+        mask = Mask(mask)
+    for word in words:
+        if prepend:
+            yield from mask.iter_chunks(suffix=word)
+        else:
+            yield from mask.iter_chunks(prefix=word)
+
+
+class HybridKeyspace:
+    """
+    Indexed hybrid keyspace: every word of ``words`` with every mask candidate.
+
+    index = word_index * len(mask) + mask_index, so each word's block is
+    contiguous and shards split it by index like Mask does.
+
+    Parameters:
+        words (sequence): Words with len() and indexing.
+        mask (Mask or str): The mask.
+        prepend (bool): Put the mask candidate before the word.
+    """
+
+    def __init__(self, words, mask, prepend=False):
+        self.words = words
+        self.mask = Mask(mask) if isinstance(mask, str) else mask
+        self.prepend = prepend
+        self.size = len(words) * len(self.mask)
+
+    def __len__(self):
+        return self.size
+
+    def unrank(self, index):
+        if index < 0:
+            index += self.size
+        if not 0 <= index < self.size:
+            raise IndexError("hybrid index out of range")
+        word, rest = divmod(index, len(self.mask))
+        candidate = self.mask.unrank(rest)
+        return candidate + self.words[word] if self.prepend else self.words[word] + candidate
+
+    __getitem__ = unrank
+
+    def iter_chunks(self, start=0, stop=None):
+        start, stop, _ = slice(start, stop).indices(self.size)
+        mask_size = len(self.mask)
+        while start < stop:
+            word_index, offset = divmod(start, mask_size)
+            word = self.words[word_index]
+            end = min(mask_size, offset + stop - start)
+            if self.prepend:
+                yield from self.mask.iter_chunks(offset, end, suffix=word)
+            else:
+                yield from self.mask.iter_chunks(offset, end, prefix=word)
+            start += end - offset
+
+    def iter_range(self, start=0, stop=None):
+        for chunk in self.iter_chunks(start, stop):
+            yield from chunk
+
+    __iter__ = iter_range
+
+    def shard(self, index, count):
+        return shard_range(self.size, index, count)
@@ -1,14 +1,27 @@
 import re
 import wordlists
-from itertools import product
+from itertools import islice, product
+from time import perf_counter
 
+from policy import LOWER, UPPER
 
-wordlists_dict = wordlists.load_all_wordlists()  # populates globals commoncredentials, dates, books, etc.
 
-# Compose your mutation lists:
-prefixes = list(set(wordlists_dict['prefix']))
-suffixes = list(set(wordlists_dict['suffix']))
-base_words = list(set(wordlists_dict['baseword']))
+# Mutation lists are resolved on each access (see __getattr__ below), so
+# importing this module does not parse the files under data/, and
+# ``mutations.prefixes`` follows the registry when it is refreshed.
+_LAZY_WORDLISTS = {
+    'prefixes': 'prefix',
+    'suffixes': 'suffix',
+    'base_words': 'baseword',
+}
+
+
+def __getattr__(name):
+    if name in _LAZY_WORDLISTS:
+        return wordlists.registry.unique(_LAZY_WORDLISTS[name])
+    if name == 'wordlists_dict':
+        return wordlists.registry
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 LEET_MAP = {
         'a': ['4', '@', '^', '/\\'],
@@ -39,17 +52,47 @@ LEET_MAP = {
         'z': ['2', '7_', '~/_']
     }
 
-def base_words_mutation(password, base_word_list, max_mutations=None):
+def iter_base_words(password, base_word_list, policy=None):
+    if policy is None:
+        for word in base_word_list:
+            yield word
+            yield word + password
+            yield password + word
+        return
+    for word, alone, joined in policy.base_word_fits(password, base_word_list):
+        if alone:
+            yield word
+        if joined:
+            yield word + password
+            yield password + word
+
+
+def iter_prefixes(password, prefix_list, policy=None):
+    if policy is not None:
+        prefix_list = policy.fitting(password, prefix_list)
+    for prefix in prefix_list:
+        yield prefix + password
+
+
+def iter_suffixes(password, suffix_list, policy=None):
+    if policy is not None:
+        suffix_list = policy.fitting(password, suffix_list)
+    for suffix in suffix_list:
+        yield password + suffix
+
+
+def base_words_mutation(password, base_word_list, max_mutations=None, policy=None):
     mutations = set()
-    for word in base_word_list:
-        for variant in [word, word + password, password + word]:
-            if max_mutations is not None and len(mutations) >= max_mutations:
-                return mutations
-            mutations.add(variant)
+    for variant in iter_base_words(password, base_word_list, policy):
+        if max_mutations is not None and len(mutations) >= max_mutations:
+            return mutations
+        mutations.add(variant)
     return mutations
 
-def prefix_mutations(password, prefix_list, max_mutations=None):
+def prefix_mutations(password, prefix_list, max_mutations=None, policy=None):
     mutations = set()
+    if policy is not None:
+        prefix_list = policy.fitting(password, prefix_list)
     for prefix in prefix_list:
         if max_mutations is not None and len(mutations) >= max_mutations:
             break
@@ -57,7 +100,8 @@ def prefix_mutations(password, prefix_list, max_mutations=None):
     return mutations
 
 
-def leetspeak_mutations(password, max_mutations=None):
+def leet_options(password):
+    """Per-character substitution choices used by the leetspeak strategy."""
     leet_map = LEET_MAP
     options = []
 
@@ -67,41 +111,69 @@ def leetspeak_mutations(password, max_mutations=None):
         if lower_c in leet_map:
             subs += leet_map[lower_c][:2]  # Keep complexity low
         options.append(subs)
+    return options
+
 
-    all_combinations = product(*options)
+def leet_count(password):
+    """Number of combinations iter_leetspeak yields for ``password``."""
+    count = 1
+    for subs in leet_options(password):
+        count *= len(subs)
+    return count
+
+
+def iter_leetspeak(password, policy=None, remaining=0):
+    """
+    Yields every leetspeak combination of ``password``. With a policy, only
+    those that satisfy it, or with ``remaining`` later layers, only those
+    that could still lead to one (see policy.PasswordPolicy.iter_product).
+    """
+    if policy is not None:
+        yield from policy.iter_product(leet_options(password), remaining)
+        return
+    for combo in product(*leet_options(password)):
+        yield ''.join(combo)
+
+
+def leetspeak_mutations(password, max_mutations=None, policy=None):
     mutations = set()
 
-    for combo in all_combinations:
+    for combo in iter_leetspeak(password, policy):
         if max_mutations and len(mutations) >= max_mutations:
             break
-        mutations.add(''.join(combo))
+        mutations.add(combo)
 
     return mutations
 
 
-def capitalization_mutations(password):
-    mutations = set()
+def iter_capitalization(password, policy=None):
+    if policy is not None:
+        yield from policy.filter(iter_capitalization(password))
+        return
 
     # Basic variants
-    mutations.add(password.lower())
-    mutations.add(password.upper())
-    mutations.add(password.capitalize())
+    yield password.lower()
+    yield password.upper()
+    yield password.capitalize()
 
     # Title case (e.g., 'johnsmith' -> 'JohnSmith')
     if len(password) >= 2:
         title_case = ''.join(word.capitalize() for word in re.findall(r'[a-zA-Z]+', password))
         if title_case != password:
-            mutations.add(title_case)
+            yield title_case
 
     # Toggle case (e.g., 'PaSsWoRd')
-    alt = ''.join(c.upper() if i % 2 == 0 else c.lower() for i, c in enumerate(password))
-    mutations.add(alt)
+    yield ''.join(c.upper() if i % 2 == 0 else c.lower() for i, c in enumerate(password))
 
-    return mutations
 
+def capitalization_mutations(password, policy=None):
+    return set(iter_capitalization(password, policy))
 
-def suffix_mutations(password, suffix_list, max_mutations=None):
+
+def suffix_mutations(password, suffix_list, max_mutations=None, policy=None):
     mutations = set()
+    if policy is not None:
+        suffix_list = policy.fitting(password, suffix_list)
     for suffix in suffix_list:
         if max_mutations is not None and len(mutations) >= max_mutations:
             break
@@ -109,7 +181,261 @@ def suffix_mutations(password, suffix_list, max_mutations=None):
     return mutations
 
 
-def mutation_engine(password, suffixes, prefixes, base_words, depth=2, max_mutations=None):
+class MutationRun:
+    """
+    Resumable state of one iter_mutations run.
+
+    Iterating yields the same candidates as iter_mutations. The attributes
+    below always describe the position just after the last yielded
+    candidate, so a caller can save them between yields and later rebuild a
+    run that continues from exactly that point (see jobs.py):
+
+        layer            0 for the original + leetspeak layer, then 1..depth
+        frontier         strings being expanded in this layer
+        next_frontier    new strings produced so far in this layer
+        frontier_index   position in ``frontier``
+        strategy_index   position in the strategy list
+        item_index       items already consumed from the current strategy
+        count            candidates yielded so far
+
+    ``stats`` is an optional stats.EngineStats that receives per-layer and
+    per-strategy counts and timings.
+
+    ``policy`` is an optional policy.PasswordPolicy. On the last layer the
+    strategies only generate candidates that satisfy it; earlier layers
+    keep the strings that could still lead to one for their frontier and
+    emit only those that already satisfy it. ``count`` and
+    ``max_mutations`` then refer to emitted candidates.
+
+    ``memo`` is an optional cache.StrategyMemo; capitalization and
+    leetspeak results are then looked up there before being computed.
+    """
+
+    def __init__(self, password, suffixes, prefixes, base_words, depth=2, max_mutations=None,
+                 seen=None, shard=None, stats=None, policy=None, memo=None):
+        self.password = password
+        self.depth = depth
+        self.max_mutations = max_mutations
+        self.seen = set() if seen is None else seen
+        self.shard = shard
+        self.stats = stats
+        self.policy = policy
+        self.memo = memo
+        capitalization = iter_capitalization
+        if memo is not None:
+            capitalization = memo.wrap('capitalization', iter_capitalization)
+        self.strategies = [
+            ('capitalization', capitalization),
+            ('suffix', lambda pwd: iter_suffixes(pwd, suffixes)),
+            ('prefix', lambda pwd: iter_prefixes(pwd, prefixes)),
+            ('base_words', lambda pwd: iter_base_words(pwd, base_words)),
+        ]
+        self.last_strategies = self.strategies
+        if policy is not None:
+            self.last_strategies = [
+                ('capitalization', lambda pwd: policy.filter(capitalization(pwd))),
+                ('suffix', lambda pwd: iter_suffixes(pwd, suffixes, policy)),
+                ('prefix', lambda pwd: iter_prefixes(pwd, prefixes, policy)),
+                ('base_words', lambda pwd: iter_base_words(pwd, base_words, policy)),
+            ]
+            # What one more layer can add, for policy.viable on earlier layers.
+            self.growth = 0
+            self.reachable = LOWER | UPPER  # capitalization
+            for words in (suffixes, prefixes, base_words):
+                _, _, longest, union = policy.table(words)
+                self.growth = max(self.growth, longest)
+                self.reachable |= union
+
+        self.layer = 0
+        self.frontier = []
+        self.next_frontier = [password]
+        self.frontier_index = 0
+        self.strategy_index = 0
+        self.item_index = 0
+        self.count = 0
+
+    def __iter__(self):
+        seen = self.seen
+        max_mutations = self.max_mutations
+        password = self.password
+        stats = self.stats
+        policy = self.policy
+        emit_first_layer = self.shard is None or self.shard[0] == 0
+
+        # Item 0 of the first layer is the password itself, the rest are
+        # the leetspeak combinations.
+        if self.layer == 0 and self.item_index == 0:
+            self.item_index = 1
+            if password not in seen:
+                seen.add(password)
+                # The password always stays in the frontier, even when a
+                # policy withholds it: later layers take the bare base
+                # words from it.
+                if emit_first_layer and (policy is None or policy.allows(password)):
+                    self.count += 1
+                    yield password
+
+        # The engine's inner loop, once for every strategy segment. New
+        # strings join the next frontier (except on the last layer) and are
+        # yielded if ``emit``. With a policy, layers that feed another drop
+        # the strings that cannot lead to an allowed candidate and keep but
+        # withhold the ones not allowed yet. With stats, the segment's
+        # counts and time are reported when it ends. Only the rarer outcomes
+        # are counted per candidate; the totals are derived from them and
+        # from the positions.
+        for items, name, emit in self._segments(emit_first_layer):
+            feed = self.layer < self.depth
+            next_frontier = self.next_frontier
+            prune = policy is not None and feed
+            if prune:
+                viable, allows = policy.viable, policy.allows
+                remaining = self.depth - self.layer
+                growth, reachable = self.growth, self.reachable
+            timed = stats is not None
+            count = start_count = self.count
+            rejected = withheld = unemitted = 0
+            first = self.item_index + 1
+            i = first - 1
+            capped = False
+            paused = 0.0
+            started = perf_counter() if timed else 0.0
+            try:
+                for i, m in enumerate(items, first):
+                    if max_mutations and count >= max_mutations:
+                        capped = True
+                        return
+                    if m in seen:
+                        continue
+                    if prune and not viable(m, remaining, growth, reachable):
+                        rejected += 1
+                        continue
+                    seen.add(m)
+                    if feed:
+                        next_frontier.append(m)
+                    if not emit:
+                        unemitted += 1
+                        continue
+                    if prune and not allows(m):
+                        withheld += 1
+                        continue
+                    count += 1
+                    self.item_index = i
+                    self.count = count
+                    if timed:
+                        suspended = perf_counter()
+                        yield m
+                        paused += perf_counter() - suspended
+                    else:
+                        yield m
+            finally:
+                if prune:
+                    policy.rejected += rejected
+                    policy.withheld += withheld
+                if timed:
+                    generated = i - first + 1 - capped
+                    produced = count - start_count + withheld + unemitted
+                    stats.strategy_done(self.layer, name, produced, generated - produced - rejected,
+                                        perf_counter() - started - paused)
+
+    def _segments(self, emit_first_layer):
+        """
+        Yields ``(items, strategy name, emit)`` for every segment left to
+        run, from the current position. The position moves past a segment
+        only once the caller asks for the next one, so a run stopped inside
+        a segment resumes there.
+        """
+        stats = self.stats
+        policy = self.policy
+        password = self.password
+
+        if self.layer == 0:
+            if policy is None:
+                if self.memo is not None and self.memo.fits(leet_count(password)):
+                    leet = iter(self.memo.get('leetspeak', password, iter_leetspeak))
+                else:
+                    leet = iter_leetspeak(password)
+            else:
+                leet = iter_leetspeak(password, policy, remaining=self.depth)
+            if stats is not None:
+                stats.layer_started(0, 1)
+            yield islice(leet, self.item_index - 1, None), 'leetspeak', emit_first_layer
+
+            if self.shard is not None:
+                index, shard_count = self.shard
+                self.next_frontier = self.next_frontier[index::shard_count]
+            self._advance_layer()
+
+        while self.layer <= self.depth and self.frontier:
+            frontier = self.frontier
+            strategies = self.last_strategies if self.layer == self.depth else self.strategies
+            if stats is not None:
+                stats.layer_started(self.layer, len(frontier))
+
+            while self.frontier_index < len(frontier):
+                pwd = frontier[self.frontier_index]
+                while self.strategy_index < len(strategies):
+                    name, strategy = strategies[self.strategy_index]
+                    items = strategy(pwd)
+                    if self.item_index:
+                        items = islice(items, self.item_index, None)
+                    yield items, name, True
+                    self.strategy_index += 1
+                    self.item_index = 0
+                self.frontier_index += 1
+                self.strategy_index = 0
+
+            self._advance_layer()
+
+    def _advance_layer(self):
+        self.layer += 1
+        self.frontier = self.next_frontier
+        self.next_frontier = []
+        self.frontier_index = 0
+        self.strategy_index = 0
+        self.item_index = 0
+
+
+def iter_mutations(password, suffixes, prefixes, base_words, depth=2, max_mutations=None,
+                   seen=None, shard=None, stats=None, policy=None, memo=None):
+    """
+    Generator version of mutation_engine. Candidates are yielded as soon as
+    each layer produces them instead of being collected into a set first.
+
+    Only the frontier of the layer being expanded (plus the frontier being
+    built for the next one) is kept, along with the dedupe structure, so
+    memory is bounded by ``seen`` rather than by the number of candidates.
+    The last layer does not build a frontier at all.
+
+    Parameters:
+        password (str): The base password to mutate.
+        suffixes (list): List of strings to use as suffixes.
+        prefixes (list): List of strings to use as prefixes.
+        base_words (list): List of base words for prefix/suffix pairing.
+        depth (int): How many mutation layers to apply.
+        max_mutations (int): Optional cap on total number of mutations.
+        seen: Dedupe structure supporting ``in`` and ``add()``. Defaults to
+            a new set; pass a shared one to dedupe across several calls.
+        shard (tuple): Optional ``(index, count)``. The first-layer frontier
+            is split round-robin into ``count`` parts and only part ``index``
+            is expanded; the leetspeak layer is yielded by shard 0 only.
+            Shards are disjoint in work but may still produce a few of the
+            same strings, and ``max_mutations`` applies per shard.
+        stats (EngineStats): Optional collector for per-layer and
+            per-strategy counts and timings (see stats.py).
+        policy (PasswordPolicy): Only yield candidates that satisfy this
+            policy, pruning generation that cannot lead to one (see policy.py).
+        memo (StrategyMemo): Optional memo of capitalization and leetspeak
+            results, shared across calls (see cache.py).
+
+    Yields:
+        str: Each unique password mutation, in generation order.
+    """
+    return iter(MutationRun(password, suffixes, prefixes, base_words, depth, max_mutations,
+                            seen=seen, shard=shard, stats=stats, policy=policy, memo=memo))
+
+
+def mutation_engine(password, suffixes, prefixes, base_words, depth=2, max_mutations=None,
+                    stats=None, policy=None, memo=None):
     """
     Applies multiple mutation strategies to a password, including:
     - Leetspeak substitutions
@@ -124,60 +450,36 @@ def mutation_engine(password, suffixes, prefixes, base_words, depth=2, max_mutat
         base_words (list): List of base words for prefix/suffix pairing.
         depth (int): How many mutation layers to apply.
         max_mutations (int): Optional cap on total number of mutations.
+        stats (EngineStats): Optional collector, see iter_mutations.
+        policy (PasswordPolicy): Optional target policy, see iter_mutations.
+        memo (StrategyMemo): Optional strategy memo, see iter_mutations.
 
     Returns:
         set: All unique password mutations generated.
     """
-    mutation_funcs = {
-        'capitalization': lambda pwd: capitalization_mutations(pwd),
-        'suffix': lambda pwd: suffix_mutations(pwd, suffixes, max_mutations),
-        'prefix': lambda pwd: prefix_mutations(pwd, prefixes, max_mutations),
-        'base_words': lambda pwd: base_words_mutation(pwd, base_words, max_mutations),
-    }
-
-    mutations = {password}
-    all_mutations = {password}
-
-    leet_mutations = leetspeak_mutations(password, max_mutations)
-    for m in leet_mutations:
-        if max_mutations and len(all_mutations) >= max_mutations:
-            return all_mutations
-        all_mutations.add(m)
-    mutations.update(leet_mutations)
-
-    for _ in range(depth):
-        new_mutations = set()
-
-        for pwd in mutations:
-            for mutate in mutation_funcs.values():
-                for m in mutate(pwd):
-                    if max_mutations and len(all_mutations) >= max_mutations:
-                        return all_mutations
-                    if m not in all_mutations:
-                        new_mutations.add(m)
-                        all_mutations.add(m)
-
-        if not new_mutations:
-            break
-
-        mutations = new_mutations
-
+    if policy is not None:
+        # ``seen`` also holds strings kept only to expand further.
+        return set(iter_mutations(password, suffixes, prefixes, base_words, depth,
+                                  max_mutations, stats=stats, policy=policy, memo=memo))
+    all_mutations = set()
+    for _ in iter_mutations(password, suffixes, prefixes, base_words, depth,
+                            max_mutations, seen=all_mutations, stats=stats, memo=memo):
+        pass
     return all_mutations
 
 
 # For testing purposes
 if __name__ == '__main__':
-    test_input = 'password'
-    mutations = mutation_engine(
-        password=test_input,
-        suffixes=suffixes,
-        prefixes=prefixes,
-        base_words=base_words,
-        depth=2,
-        max_mutations=5000  # optional cutoff
-    )
-
-    print(f"Total mutations generated: {len(mutations)}")
-    for i, pwd in enumerate(sorted(mutations)):
-        if i < 5000:  # limit output
-            print(pwd)
\ No newline at end of file
+    import sys
+    from export import CandidateWriter
+
+    # Streams straight to stdout; use `cli.py export` for files, compression and rotation.
+    with CandidateWriter('-', format='hex') as writer:
+        writer.write_many(iter_mutations(
+            sys.argv[1] if len(sys.argv) > 1 else 'password',
+            suffixes=wordlists.registry.unique('suffix'),
+            prefixes=wordlists.registry.unique('prefix'),
+            base_words=wordlists.registry.unique('baseword'),
+            depth=2,
+            max_mutations=5000  # optional cutoff
+        ))
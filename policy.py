@@ -0,0 +1,309 @@
+# policy.py
+"""
+Target password policies, checked while candidates are generated.
+
+A PasswordPolicy describes what an acceptable candidate looks like: a
+length range and the character classes it must contain. Passing one as
+``policy=`` to iter_mutations (or any strategy function) means only
+candidates that satisfy it are emitted. Most of the work that would have
+been filtered away afterwards is never done:
+
+- On the last layer, the affix and base-word strategies check each
+  word's precomputed length and classes before concatenating, so
+  candidates that cannot fit are never built, hashed or deduplicated.
+- The leetspeak walk stops on any branch whose shortest completion is
+  already too long. On the last layer it also stops branches that are
+  too short or that can no longer supply a required class.
+- Strings on earlier layers go into the next frontier only if some later
+  layer could still turn them into an acceptable candidate. They are
+  emitted only if they satisfy the policy themselves.
+
+Pruning is conservative. With no ``max_mutations`` cap, a policy run
+emits exactly the candidates of the unconstrained run that satisfy the
+policy. Capitalization's title-case variant drops everything that is not
+an ASCII letter. A string that is too long therefore stays alive while
+its letters alone still fit.
+
+Classes are ASCII, as most policy checkers count them: lower is a-z,
+upper is A-Z, digit is 0-9, and any other character is a symbol.
+"""
+import re
+from array import array
+
+from cache import SizedLRUCache
+
+LOWER, UPPER, DIGIT, SYMBOL = 1, 2, 4, 8
+CLASSES = {'lower': LOWER, 'upper': UPPER, 'digit': DIGIT, 'symbol': SYMBOL}
+
+_CLASS_PATTERNS = (
+    (LOWER, re.compile(r'[a-z]')),
+    (UPPER, re.compile(r'[A-Z]')),
+    (DIGIT, re.compile(r'[0-9]')),
+    (SYMBOL, re.compile(r'[^a-zA-Z0-9]')),
+)
+_LETTER = re.compile(r'[a-zA-Z]')
+
+
+def classes(text):
+    """Bit mask of the character classes present in ``text``."""
+    mask = 0
+    for bit, pattern in _CLASS_PATTERNS:
+        if pattern.search(text):
+            mask |= bit
+    return mask
+
+
+def letter_count(text):
+    return len(_LETTER.findall(text))
+
+
+class PasswordPolicy:
+    """
+    Parameters:
+        min_length (int): Shortest acceptable candidate.
+        max_length (int): Longest acceptable candidate, or None.
+        require (iterable): Class names that must each appear at least
+            once: 'lower', 'upper', 'digit', 'symbol'.
+
+    Attributes:
+        skipped (int): Candidates never built because a pre-generation
+            check ruled them out (affix words that do not fit, and the
+            leaves of cut leetspeak branches).
+        rejected (int): Candidates built, then dropped by the policy.
+        withheld (int): Strings kept to expand on a later layer but not
+            emitted because they do not satisfy the policy yet.
+
+    The counters accumulate over every run that uses this policy; see
+    ``report`` and ``reset``.
+
+    Frontier strings of similar length and classes need the same affixes,
+    so the affixes that fit each (length, missing classes) combination are
+    found once and kept in an LRU cache of up to ``fit_cache_items`` words.
+    """
+
+    def __init__(self, min_length=0, max_length=None, require=(), fit_cache_items=4_000_000):
+        unknown = set(require) - set(CLASSES)
+        if unknown:
+            raise ValueError(f"unknown character classes: {', '.join(sorted(unknown))}")
+        if max_length is not None and max_length < min_length:
+            raise ValueError("max_length is shorter than min_length")
+        self.min_length = min_length
+        self.max_length = max_length
+        self.require = tuple(name for name in CLASSES if name in set(require))
+        self.required = 0
+        for name in self.require:
+            self.required |= CLASSES[name]
+        # Only the required classes are ever tested, so only those are searched for.
+        self._patterns = [(bit, pattern) for bit, pattern in _CLASS_PATTERNS if bit & self.required]
+        self.fit_cache_items = fit_cache_items
+        self._tables = {}
+        self._fits = SizedLRUCache(fit_cache_items)
+        self.reset()
+
+    def __repr__(self):
+        return (f"PasswordPolicy(min_length={self.min_length}, max_length={self.max_length}, "
+                f"require={self.require})")
+
+    def __getstate__(self):
+        # Tables are keyed by id() of lists in this process; rebuild them elsewhere.
+        state = self.__dict__.copy()
+        state['_tables'] = {}
+        state['_fits'] = None
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._fits = SizedLRUCache(self.fit_cache_items)
+
+    def reset(self):
+        self.skipped = 0
+        self.rejected = 0
+        self.withheld = 0
+
+    def report(self):
+        return {'skipped': self.skipped, 'rejected': self.rejected, 'withheld': self.withheld}
+
+    def _classes(self, text):
+        mask = 0
+        for bit, pattern in self._patterns:
+            if pattern.search(text):
+                mask |= bit
+        return mask
+
+    def allows(self, candidate):
+        """True if ``candidate`` satisfies the policy."""
+        n = len(candidate)
+        if n < self.min_length or (self.max_length is not None and n > self.max_length):
+            return False
+        return not self.required or not self.required & ~self._classes(candidate)
+
+    def viable(self, text, remaining, growth=0, reachable=LOWER | UPPER | DIGIT | SYMBOL):
+        """
+        True if ``text`` could still lead to an allowed candidate.
+
+        Parameters:
+            remaining (int): Layers left to apply to ``text``.
+            growth (int): Longest piece one layer can add (the longest
+                affix or base word).
+            reachable (int): Classes the remaining layers can add.
+        """
+        if remaining <= 0:
+            return self.allows(text)
+        n = len(text)
+        if self.max_length is not None and n > self.max_length and letter_count(text) > self.max_length:
+            return False
+        if n + remaining * growth < self.min_length:
+            return False
+        missing = self.required & ~reachable
+        return not missing or not missing & ~self._classes(text)
+
+    def table(self, words):
+        """
+        Per-word lengths and class masks of a word list, computed once per list.
+
+        Returns:
+            tuple: (lengths, masks, longest, union of all masks). Masks
+            only hold the classes this policy requires.
+        """
+        entry = self._tables.get(id(words))
+        if entry is None or entry[0] is not words:
+            lengths = array('I')
+            masks = array('B')
+            union = 0
+            for word in words:
+                mask = self._classes(word)
+                lengths.append(len(word))
+                masks.append(mask)
+                union |= mask
+            # Holding the list keeps its id from being reused by another one.
+            entry = self._tables[id(words)] = (words, (lengths, masks, max(lengths, default=0), union))
+        return entry[1]
+
+    def _bounds(self, text):
+        """(shortest, longest, missing classes) a word joined to ``text`` may have."""
+        longest = self.max_length - len(text) if self.max_length is not None else float('inf')
+        return self.min_length - len(text), longest, self.required & ~self._classes(text)
+
+    def _cached_fits(self, kind, words, bounds, scan):
+        key = (kind, id(words)) + bounds
+        fits = self._fits.get(key)
+        if fits is None:
+            fits = scan()
+            self._fits.put(key, fits, len(fits))
+        return fits
+
+    def fitting(self, text, words):
+        """The words ``w`` for which ``text + w`` (or ``w + text``) is allowed, in order."""
+        bounds = self._bounds(text)
+
+        def scan():
+            lengths, masks, _, _ = self.table(words)
+            shortest, longest, missing = bounds
+            return [word for word, length, mask in zip(words, lengths, masks)
+                    if shortest <= length <= longest and not missing & ~mask]
+
+        fits = self._cached_fits('affix', words, bounds, scan)
+        self.skipped += len(words) - len(fits)
+        return fits
+
+    def base_word_fits(self, text, words):
+        """
+        Yields ``(word, alone, joined)`` for the base-word strategy: whether
+        the word by itself, and joined to ``text`` either way round, is allowed.
+        Words where neither is are left out.
+        """
+        bounds = self._bounds(text)
+
+        def scan():
+            lengths, masks, _, _ = self.table(words)
+            shortest, longest, missing = bounds
+            min_length = self.min_length
+            max_length = self.max_length if self.max_length is not None else float('inf')
+            required = self.required
+            fits = []
+            for word, length, mask in zip(words, lengths, masks):
+                alone = min_length <= length <= max_length and not required & ~mask
+                joined = shortest <= length <= longest and not missing & ~mask
+                if alone or joined:
+                    fits.append((word, alone, joined))
+            return fits
+
+        fits = self._cached_fits('base', words, bounds, scan)
+        self.skipped += 3 * len(words) - sum(alone + 2 * joined for _, alone, joined in fits)
+        return iter(fits)
+
+    def filter(self, candidates):
+        """Yields the allowed candidates, counting the rest as rejected."""
+        allows = self.allows
+        rejected = 0
+        try:
+            for candidate in candidates:
+                if allows(candidate):
+                    yield candidate
+                else:
+                    rejected += 1
+        finally:
+            self.rejected += rejected
+
+    def iter_product(self, options, remaining=0):
+        """
+        Like ``product(*options)`` joined into strings, skipping every branch
+        that cannot end in a viable string.
+
+        With ``remaining`` 0 the results are final candidates, and each one is
+        allowed. Otherwise they feed later layers, and only the length bound
+        prunes here. The engine still checks ``viable`` on each result.
+        """
+        n = len(options)
+        min_rest = [0] * (n + 1)      # shortest completion of positions k..
+        max_rest = [0] * (n + 1)
+        letters_rest = [0] * (n + 1)  # fewest letters in a completion
+        mask_rest = [0] * (n + 1)     # classes a completion can supply
+        leaves = [1] * (n + 1)        # completions of positions k..
+        for k in range(n - 1, -1, -1):
+            min_rest[k] = min_rest[k + 1] + min(map(len, options[k]))
+            max_rest[k] = max_rest[k + 1] + max(map(len, options[k]))
+            letters_rest[k] = letters_rest[k + 1] + min(map(letter_count, options[k]))
+            mask_rest[k] = mask_rest[k + 1]
+            for option in options[k]:
+                mask_rest[k] |= self._classes(option)
+            leaves[k] = leaves[k + 1] * len(options[k])
+
+        if not self._can_finish(0, 0, 0, min_rest[0], max_rest[0], letters_rest[0], mask_rest[0],
+                                remaining):
+            self.skipped += leaves[0]
+            return
+        infos = [[(len(option), letter_count(option), self._classes(option)) for option in opts]
+                 for opts in options]
+
+        skipped = 0
+        try:
+            # Depth-first in product order, so the output order matches product().
+            stack = [(0, '', 0, 0, 0)]
+            while stack:
+                k, text, length, letters, mask = stack.pop()
+                if k == n:
+                    yield text
+                    continue
+                children = []
+                for option, (o_len, o_letters, o_mask) in zip(options[k], infos[k]):
+                    child_len, child_letters, child_mask = length + o_len, letters + o_letters, mask | o_mask
+                    if self._can_finish(child_len, child_letters, child_mask, min_rest[k + 1],
+                                        max_rest[k + 1], letters_rest[k + 1], mask_rest[k + 1], remaining):
+                        children.append((k + 1, text + option, child_len, child_letters, child_mask))
+                    else:
+                        skipped += leaves[k + 1]
+                stack.extend(reversed(children))
+        finally:
+            self.skipped += skipped
+
+    def _can_finish(self, length, letters, mask, min_rest, max_rest, letters_rest, mask_rest, remaining):
+        if remaining <= 0:
+            if self.max_length is not None and length + min_rest > self.max_length:
+                return False
+            if length + max_rest < self.min_length:
+                return False
+            return not self.required & ~(mask | mask_rest)
+        # Later layers can title-case the string down to its letters.
+        return self.max_length is None or min(length + min_rest, letters + letters_rest) <= self.max_length
+
@@ -0,0 +1,188 @@
+# reverse.py
+"""
+Reverse (normalizing) lookup: is a candidate a mutated form of a known word?
+
+Forward checking means expanding a base word with mutation_engine and
+comparing every variant. ReverseIndex goes the other way. It reads the
+candidate once and walks a CompactTrie of case-folded base words. At each
+position the walk may take the literal character (case-folded) or any
+LEET_MAP token that starts there, read back as its letter. Ambiguous
+tokens ('1' is i or l, '6' is b or g) branch, but the trie prunes every
+branch that stops spelling a word. Text before and after the word must
+split into known prefixes and suffixes, at most ``max_affixes`` on each
+side.
+
+    >>> index = ReverseIndex(['password'], prefixes=['my'], suffixes=['2019', '!'])
+    >>> index.match('myP@55w0rd2019!')
+    Match(base='password', prefix='my', suffix='2019!', start=2, end=10)
+
+Each candidate costs a walk bounded by its length times the branching of
+the leet tokens, so classifying a leak dump is linear in its size.
+"""
+from collections import namedtuple
+
+from mutations import LEET_MAP
+from trie import CompactTrie
+
+Match = namedtuple('Match', 'base prefix suffix start end')
+
+
+def inverse_leet_map(leet_map=LEET_MAP):
+    """Maps each case-folded substitution token to the letters it can stand for."""
+    inverse = {}
+    for letter, tokens in leet_map.items():
+        for token in tokens:
+            inverse.setdefault(token.lower(), set()).add(letter)
+    return {token: ''.join(sorted(letters)) for token, letters in inverse.items()}
+
+
+class _AffixSet:
+    """Known affixes, case-folded, allowing up to ``max_affixes`` in a row."""
+
+    def __init__(self, words, max_affixes):
+        self.words = {word.lower() for word in words if word}
+        self.max_len = max(map(len, self.words), default=0)
+        self.max_affixes = max_affixes
+
+    def ends(self, text):
+        """Positions ``i`` such that ``text[:i]`` is a run of affixes (0 included)."""
+        reached = {0}
+        level = [0]
+        n = len(text)
+        for _ in range(self.max_affixes):
+            next_level = []
+            for start in level:
+                for end in range(start + 1, min(n, start + self.max_len) + 1):
+                    if end not in reached and text[start:end] in self.words:
+                        reached.add(end)
+                        next_level.append(end)
+            level = next_level
+        return reached
+
+    def starts(self, text):
+        """Positions ``i`` such that ``text[i:]`` is a run of affixes (len(text) included)."""
+        n = len(text)
+        reached = {n}
+        level = [n]
+        for _ in range(self.max_affixes):
+            next_level = []
+            for end in level:
+                for start in range(max(0, end - self.max_len), end):
+                    if start not in reached and text[start:end] in self.words:
+                        reached.add(start)
+                        next_level.append(start)
+            level = next_level
+        return reached
+
+
+class ReverseIndex:
+    """
+    Parameters:
+        base_words (iterable or CompactTrie): Words to detect. Words are
+            case-folded before building; a prebuilt CompactTrie of
+            lowercase words (see ``save``) is used as is.
+        prefixes, suffixes (iterable): Affixes that may surround the word.
+        max_affixes (int): Affixes allowed on each side.
+        min_length (int): Shortest base word worth reporting; very short
+            words would otherwise match inside almost anything.
+        leet_map (dict): Substitutions to invert, LEET_MAP by default.
+    """
+
+    def __init__(self, base_words, prefixes=(), suffixes=(), max_affixes=2, min_length=3,
+                 leet_map=LEET_MAP):
+        if isinstance(base_words, CompactTrie):
+            self.trie = base_words
+        else:
+            self.trie = CompactTrie.from_words(sorted({w.lower() for w in base_words if w.strip()}))
+        self.prefixes = _AffixSet(prefixes, max_affixes)
+        self.suffixes = _AffixSet(suffixes, max_affixes)
+        self.min_length = min_length
+        self.tokens_by_first = {}
+        for token, letters in inverse_leet_map(leet_map).items():
+            self.tokens_by_first.setdefault(token[0], []).append((token, letters))
+
+    @classmethod
+    def from_wordlists(cls, registry=None, **kwargs):
+        """Index of the registry's base words, with its prefix and suffix lists as affixes."""
+        import wordlists
+
+        if registry is None:
+            registry = wordlists.registry
+        return cls(registry.unique('baseword'), registry.unique('prefix'),
+                   registry.unique('suffix'), **kwargs)
+
+    def save(self, path):
+        """Saves the base-word trie; pass ``CompactTrie.load(path)`` back in as ``base_words``."""
+        self.trie.save(path)
+
+    def _steps(self, folded):
+        """For each position, the (next position, letter) moves a walk can take there."""
+        by_first = self.tokens_by_first
+        steps = []
+        for pos, char in enumerate(folded):
+            moves = [(pos + 1, char)]
+            for token, letters in by_first.get(char, ()):
+                if folded.startswith(token, pos):
+                    moves.extend((pos + len(token), letter) for letter in letters if letter != char)
+            steps.append(moves)
+        steps.append(())
+        return steps
+
+    def _spans(self, steps, start, memo):
+        """
+        The (end, base) pairs of every base word spelled from ``start``.
+
+        The walk is memoized on (position, trie node), shared by every start
+        in ``memo``. A DAWG node is reached from different prefixes when
+        words share a suffix, so the memo stores what can still be spelled
+        from the node, (end, rest of the word), rather than marking it
+        visited; every prefix reaching it gets all of those completions.
+        """
+        final, child = self.trie.final, self.trie._child
+
+        def completions(pos, node):
+            found = memo.get((pos, node))
+            if found is None:
+                found = {(pos, ''): None} if final[node] else {}
+                for next_pos, letter in steps[pos]:
+                    next_node = child(node, letter)
+                    if next_node is not None:
+                        for end, rest in completions(next_pos, next_node):
+                            found[end, letter + rest] = None
+                found = memo[pos, node] = list(found)
+            return found
+
+        # Recursion depth is bounded by the longest base word, not the candidate.
+        min_length = self.min_length
+        return [(end, base) for end, base in completions(start, 0) if len(base) >= min_length]
+
+    def matches(self, candidate):
+        """Yields every Match of ``candidate``; prefix and suffix are as written in it."""
+        folded = candidate.lower()
+        if len(folded) != len(candidate):
+            # Some characters fold to several (e.g. 'İ'); keep positions aligned.
+            folded = ''.join(c.lower()[0] for c in candidate)
+        suffix_starts = self.suffixes.starts(folded)
+        steps = self._steps(folded)
+        memo = {}
+        for start in sorted(self.prefixes.ends(folded)):
+            for end, base in self._spans(steps, start, memo):
+                if end in suffix_starts:
+                    yield Match(base, candidate[:start], candidate[end:], start, end)
+
+    def match(self, candidate):
+        """The Match with the longest base word, or None."""
+        best = None
+        for found in self.matches(candidate):
+            if best is None or len(found.base) > len(best.base):
+                best = found
+        return best
+
+    def __contains__(self, candidate):
+        return next(self.matches(candidate), None) is not None
+
+    def classify(self, candidates):
+        """Yields ``(candidate, match or None)`` for every candidate."""
+        match = self.match
+        for candidate in candidates:
+            yield candidate, match(candidate)
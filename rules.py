@@ -0,0 +1,250 @@
+# rules.py
+"""
+A small hashcat-style rule language, compiled into fused generator pipelines.
+
+A rule is a sequence of operations applied left to right to a word. Simple
+operations map one word to one word; expansion operations map one word to
+many. A rule file holds one rule per line ('#' starts a comment).
+
+Hashcat-compatible operations:
+
+    :     do nothing              l     lowercase
+    u     uppercase               c     capitalize
+    C     lowercase first, uppercase rest
+    t     toggle case of every character
+    r     reverse                 d     duplicate
+    $X    append character X      ^X    prepend character X
+    sXY   replace every X with Y  @X    remove every X
+
+Lethe extensions (letters hashcat leaves unused):
+
+    V          every leetspeak variant (mutations.iter_leetspeak)
+    W          every capitalization variant (mutations.iter_capitalization)
+    A[name]    append each entry of wordlist ``name``
+    P[name]    prepend each entry of wordlist ``name``
+    B[name]    base word joins with ``name``: word, word+w, w+word
+
+``compile_rule`` fuses runs of simple operations into one function and nests
+the expansions with itertools.chain/map, so a compiled rule streams its
+candidates without building any intermediate set or list. ENGINE_RULES is the
+rule set equivalent to one mutation_engine layer on top of leetspeak.
+"""
+from itertools import chain, islice, repeat
+from operator import add
+
+from mutations import iter_base_words, iter_capitalization, iter_leetspeak
+
+ENGINE_RULES = (
+    'V',
+    'VW',
+    'VA[suffix]',
+    'VP[prefix]',
+    'VB[baseword]',
+)
+
+
+def _toggle(word):
+    return word.swapcase()
+
+
+def _invert_capitalize(word):
+    return word[:1].lower() + word[1:].upper()
+
+
+def _reverse(word):
+    return word[::-1]
+
+
+def _duplicate(word):
+    return word + word
+
+
+SIMPLE_OPS = {
+    ':': lambda word: word,
+    'l': str.lower,
+    'u': str.upper,
+    'c': str.capitalize,
+    'C': _invert_capitalize,
+    't': _toggle,
+    'r': _reverse,
+    'd': _duplicate,
+}
+
+
+def _append_all(entries):
+    return lambda word: map(word.__add__, entries)
+
+
+def _prepend_all(entries):
+    return lambda word: map(add, entries, repeat(word))
+
+
+def _base_joins(entries):
+    return lambda word: iter_base_words(word, entries)
+
+
+LIST_OPS = {
+    'A': _append_all,
+    'P': _prepend_all,
+    'B': _base_joins,
+}
+
+
+def parse_rule(rule):
+    """
+    Splits a rule into operations.
+
+    Returns:
+        list: ('map', function) and ('expand', kind, argument) tuples.
+
+    Raises:
+        ValueError: On unknown operations or missing arguments.
+    """
+    ops = []
+    i = 0
+    while i < len(rule):
+        op = rule[i]
+        if op in ' \t':
+            i += 1
+        elif op in SIMPLE_OPS:
+            ops.append(('map', SIMPLE_OPS[op]))
+            i += 1
+        elif op in '$^@':
+            if i + 1 >= len(rule):
+                raise ValueError(f"rule {rule!r}: '{op}' needs a character at position {i}")
+            char = rule[i + 1]
+            if op == '$':
+                ops.append(('map', lambda word, char=char: word + char))
+            elif op == '^':
+                ops.append(('map', lambda word, char=char: char + word))
+            else:
+                ops.append(('map', lambda word, char=char: word.replace(char, '')))
+            i += 2
+        elif op == 's':
+            if i + 2 >= len(rule):
+                raise ValueError(f"rule {rule!r}: 's' needs two characters at position {i}")
+            old, new = rule[i + 1], rule[i + 2]
+            ops.append(('map', lambda word, old=old, new=new: word.replace(old, new)))
+            i += 3
+        elif op in 'VW':
+            ops.append(('expand', op, None))
+            i += 1
+        elif op in LIST_OPS:
+            end = rule.find(']', i)
+            if i + 1 >= len(rule) or rule[i + 1] != '[' or end == -1:
+                raise ValueError(f"rule {rule!r}: '{op}' needs a [wordlist] at position {i}")
+            ops.append(('expand', op, rule[i + 2:end]))
+            i = end + 1
+        else:
+            raise ValueError(f"rule {rule!r}: unsupported operation {op!r} at position {i}")
+    return ops
+
+
+def _compose(functions):
+    if len(functions) == 1:
+        return functions[0]
+
+    def composed(word):
+        for function in functions:
+            word = function(word)
+        return word
+    return composed
+
+
+def compile_rule(rule, wordlists=None):
+    """
+    Compiles one rule into a function word -> iterable of candidates.
+
+    Parameters:
+        rule (str): The rule text.
+        wordlists (dict): Named lists used by A[...], P[...] and B[...].
+    """
+    wordlists = wordlists or {}
+    stages = []
+    pending = []
+    for op in parse_rule(rule):
+        if op[0] == 'map':
+            pending.append(op[1])
+            continue
+        if pending:
+            stages.append(('map', _compose(pending)))
+            pending = []
+        kind, argument = op[1], op[2]
+        if kind == 'V':
+            stages.append(('expand', iter_leetspeak))
+        elif kind == 'W':
+            stages.append(('expand', iter_capitalization))
+        else:
+            if argument not in wordlists:
+                raise ValueError(f"rule {rule!r}: unknown wordlist {argument!r}")
+            stages.append(('expand', LIST_OPS[kind](wordlists[argument])))
+    if pending:
+        stages.append(('map', _compose(pending)))
+
+    # Build the pipeline back to front. ``tail`` is None while everything
+    # after the current stage is the identity.
+    tail = None
+    for stage, function in reversed(stages):
+        if stage == 'map':
+            if tail is None:
+                tail = lambda word, f=function: (f(word),)
+            else:
+                tail = lambda word, f=function, t=tail: t(f(word))
+        elif tail is None:
+            tail = function
+        else:
+            tail = lambda word, f=function, t=tail: chain.from_iterable(map(t, f(word)))
+    return tail or (lambda word: (word,))
+
+
+class RuleSet:
+    """A compiled list of rules; calling it yields every rule's output in order."""
+
+    def __init__(self, rules, wordlists=None):
+        # Blank lines and lines starting with '#' are skipped, as in hashcat.
+        self.rules = [rule.rstrip('\r\n') for rule in rules
+                      if rule.strip() and not rule.lstrip().startswith('#')]
+        self._compiled = [compile_rule(rule, wordlists) for rule in self.rules]
+
+    @classmethod
+    def from_file(cls, path, wordlists=None):
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls(f.read().splitlines(), wordlists)
+
+    def __call__(self, word):
+        return chain.from_iterable(compiled(word) for compiled in self._compiled)
+
+    def __len__(self):
+        return len(self.rules)
+
+
+def apply_rules(words, ruleset, seen=None, max_mutations=None, dedupe=True):
+    """
+    Streams the candidates of ``ruleset`` over every word in ``words``.
+
+    Parameters:
+        words (iterable): Input words.
+        ruleset (RuleSet): Compiled rules.
+        seen: Dedupe structure (``in``/``add()``), a new set by default.
+        max_mutations (int): Optional cap on the number of candidates.
+        dedupe (bool): With False, candidates go straight from the fused
+            pipeline to the caller, duplicates included, without a Python
+            level loop; use it when deduplication happens downstream.
+    """
+    candidates = chain.from_iterable(map(ruleset, words))
+    if not dedupe:
+        if max_mutations:
+            candidates = islice(candidates, max_mutations)
+        yield from candidates
+        return
+
+    if seen is None:
+        seen = set()
+    count = 0
+    for candidate in candidates:
+        if candidate not in seen:
+            if max_mutations and count >= max_mutations:
+                return
+            seen.add(candidate)
+            count += 1
+            yield candidate
@@ -0,0 +1,588 @@
+# scoring.py
+"""
+Vectorised strength scoring of candidate batches.
+
+A batch of candidates is encoded once as a zero-padded matrix of code
+points. Every measure below is a handful of numpy operations over that
+matrix, never a Python loop per candidate. The matrix is position-major:
+one row per character position and one column per candidate. Shifting a
+window by one character is then a slice of whole rows.
+
+Charset entropy is ``length * log2(pool)``. The pool adds up the classes
+present: lower 26, upper 26, digits 10, ASCII symbols 33, other 100.
+
+Pattern-aware bits approximate what a guesser that knows the patterns
+would need, in the spirit of zxcvbn:
+
+- Base words, such as the wordlists' base words and names, found after
+  leet substitutions are undone and case is folded. A word costs
+  log2(dictionary size), plus 1 bit per substituted or upper-case
+  letter. Single-character leet tokens from LEET_MAP are undone;
+  ambiguous ones ('1' is i or l) are tried both ways. Multi-character
+  tokens ('|-|') are left to reverse.ReverseIndex, which handles them
+  exactly.
+- Dates: years 1900-2099 and 6- or 8-digit day/month/year runs, at 2
+  bits per digit (a year is ~7.6 bits, a full date ~16).
+- Keyboard walks: runs of 3+ adjacent QWERTY keys (shift ignored). The
+  first key costs log2(47) bits and each further key log2(4.6).
+- Everything else costs log2(pool) per character.
+
+Words are matched left to right, taking the longest word at each
+position. Where patterns overlap, base words win over dates and dates
+over walks. A candidate is also scored without its words; if that is
+cheaper ('qwerty' found as 'wert'), that score is kept. The result is
+never above the charset entropy.
+
+    >>> scorer = Scorer(['dragon'])
+    >>> scorer.score(['Dr@gon1987', 'x7#Kq!v2']).bits.round(1)
+    array([11. , 52.6])
+
+One core scores about 400 thousand candidates a second with patterns,
+most of it spent matching words. With ``patterns=False`` (charset
+entropy only) it scores about 3 million, so prefer that for filters
+that only need a length/charset bound.
+
+``filter_candidates`` applies this as a streaming stage, for example on
+iter_mutations output. It scores chunks of ``chunk_size`` candidates, so
+memory is a few matrices of chunk_size by the longest candidate.
+"""
+import math
+from collections import namedtuple
+from itertools import compress, islice
+
+import numpy as np
+
+import wordlists
+from mutations import LEET_MAP
+
+Scores = namedtuple('Scores', 'length charset_bits bits baseword leet walk date')
+Scores.__doc__ = """Per-candidate arrays: length, bits, and characters in each pattern."""
+
+PAD, LOWER, UPPER, DIGIT, SYMBOL, OTHER = range(6)
+POOL_SIZES = (0, 26, 26, 10, 33, 100)
+
+STRENGTH_NAMES = ('very weak', 'weak', 'fair', 'strong', 'very strong')
+# Bit thresholds between consecutive STRENGTH_NAMES.
+STRENGTH_BITS = (28, 36, 60, 128)
+
+KEYBOARD_ROWS = ('`1234567890-=', 'qwertyuiop[]\\', "asdfghjkl;'", 'zxcvbnm,./')
+KEYBOARD_SHIFTED = ('~!@#$%^&*()_+', 'QWERTYUIOP{}|', 'ASDFGHJKL:"', 'ZXCVBNM<>?')
+# Horizontal offset of each row, in keys, for the diagonal neighbours.
+ROW_OFFSETS = (0, 1.5, 1.75, 2.25)
+
+WALK_START_BITS = math.log2(47)
+WALK_BITS = math.log2(4.6)
+DATE_BITS = 2.0
+LEET_BITS = 1.0
+CASE_BITS = 1.0
+
+# Code points below this are looked up in tables; the rest pass through
+# as OTHER. It covers Latin-1 and the leet tokens '€' and 'ƒ'.
+TABLE_SIZE = 0x2100
+# Length boundaries of the groups a batch is scored in.
+LENGTH_BUCKETS = (8, 12, 16, 24, 32, 48, 64)
+
+_PRIME = np.uint64(0x100000001B3)
+_MIX = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _build_tables():
+    classes = np.full(TABLE_SIZE, OTHER, dtype=np.uint8)
+    lower = np.arange(TABLE_SIZE, dtype=np.uint32)
+    for code in range(TABLE_SIZE):
+        char = chr(code)
+        folded = char.lower()
+        if len(folded) == 1:
+            lower[code] = ord(folded)
+        if code < 128:
+            if char.islower():
+                classes[code] = LOWER
+            elif char.isupper():
+                classes[code] = UPPER
+            elif char.isdigit():
+                classes[code] = DIGIT
+            elif char.isprintable():
+                classes[code] = SYMBOL
+    classes[0] = PAD
+
+    # Two readings of the leet tokens, for the ambiguous ones.
+    tokens = {}
+    for letter, options in LEET_MAP.items():
+        for token in options:
+            if len(token) == 1 and not token.isalpha():
+                tokens.setdefault(token, set()).add(letter)
+    deleet = [lower.copy(), lower.copy()]
+    leet = np.zeros(TABLE_SIZE, dtype=bool)
+    ambiguous = np.zeros(TABLE_SIZE, dtype=bool)
+    for token, letters in tokens.items():
+        letters = sorted(letters)
+        leet[ord(token)] = True
+        ambiguous[ord(token)] = len(letters) > 1
+        for reading, table in enumerate(deleet):
+            table[ord(token)] = ord(letters[reading % len(letters)])
+
+    positions = []
+    keys = np.zeros(TABLE_SIZE, dtype=np.uint8)  # key 0 is "not a key"
+    for row, (plain, shifted) in enumerate(zip(KEYBOARD_ROWS, KEYBOARD_SHIFTED)):
+        for column, (char, shift) in enumerate(zip(plain, shifted)):
+            positions.append((row, column + ROW_OFFSETS[row]))
+            keys[ord(char)] = keys[ord(shift)] = len(positions)
+    adjacent = np.zeros((len(positions) + 1, len(positions) + 1), dtype=bool)
+    for a, (row_a, x_a) in enumerate(positions, 1):
+        for b, (row_b, x_b) in enumerate(positions, 1):
+            if row_a == row_b:
+                adjacent[a, b] = abs(x_a - x_b) == 1
+            elif abs(row_a - row_b) == 1:
+                adjacent[a, b] = abs(x_a - x_b) <= 0.75
+    return classes, deleet, leet, ambiguous, keys, adjacent
+
+
+_CLASSES, _DELEET, _LEET, _AMBIGUOUS, _KEYS, _ADJACENT = _build_tables()
+# Valid days and months, indexed by a two-digit number.
+_DAY = np.zeros(100, dtype=bool)
+_DAY[1:32] = True
+_MONTH = np.zeros(100, dtype=bool)
+_MONTH[1:13] = True
+
+
+def encode(candidates):
+    """
+    Encodes a batch as a position-major code point matrix.
+
+    Returns:
+        tuple: (codes, lengths). codes is uint32, one row per position and
+            one zero-padded column per candidate; lengths is int64.
+    """
+    count = len(candidates)
+    if not count:
+        return np.zeros((1, 0), dtype=np.uint32), np.zeros(0, dtype=np.int64)
+    array = np.array(candidates, dtype=str)
+    codes = array.view(np.uint32).reshape(count, array.dtype.itemsize // 4).T
+    lengths = np.fromiter(map(len, candidates), dtype=np.int64, count=count)
+    return codes, lengths
+
+
+def _lookup(table, codes):
+    # Larger code points read the last entry, which is OTHER-like in every table.
+    return table.take(codes, mode='clip')
+
+
+def _translate(table, codes):
+    """Maps code points through ``table``, passing larger ones through."""
+    return np.where(codes < TABLE_SIZE, _lookup(table, codes), codes)
+
+
+def _spread(starts, span, width):
+    """Marks the ``span`` positions covered by each window start."""
+    covered = np.zeros((width, starts.shape[1]), dtype=bool)
+    for offset in range(span):
+        covered[offset:offset + len(starts)] |= starts
+    return covered
+
+
+def _run_starts(mask):
+    """Positions where a run of True begins."""
+    starts = mask.copy()
+    starts[1:] &= ~mask[:-1]
+    return starts
+
+
+def _hash_words(codes, lengths):
+    """64-bit polynomial hash of each column's first ``lengths`` code points."""
+    hashes = np.zeros(len(lengths), dtype=np.uint64)
+    h = np.zeros(len(lengths), dtype=np.uint64)
+    for i, row in enumerate(codes):
+        h = h * _PRIME + row.astype(np.uint64)
+        done = lengths == i + 1
+        hashes[done] = h[done]
+    return hashes
+
+
+def _hash_prefixes(codes, lengths, min_length):
+    """_hash_words of every prefix of ``min_length`` or more code points."""
+    prefixes = []
+    h = np.zeros(len(lengths), dtype=np.uint64)
+    for i, row in enumerate(codes):
+        h = h * _PRIME + row.astype(np.uint64)
+        if i + 1 >= min_length:
+            prefixes.append(h[lengths > i])
+    return np.unique(np.concatenate(prefixes)) if prefixes else np.zeros(0, dtype=np.uint64)
+
+
+def _bitmap(hashes, slots_per_hash):
+    """(shift, bitmap) with a True slot for each of ``hashes``; see Scorer._slots."""
+    bits = max(16, (slots_per_hash * max(len(hashes), 1) - 1).bit_length())
+    shift = np.uint64(64 - bits)
+    bitmap = np.zeros(1 << bits, dtype=bool)
+    bitmap[((hashes * _MIX) >> shift).astype(np.intp)] = True
+    return shift, bitmap
+
+
+def charset_bits(classes, lengths):
+    """``length * log2(pool)`` from a matrix of character classes."""
+    pool = np.zeros(len(lengths), dtype=np.int64)
+    for cls in (LOWER, UPPER, DIGIT, SYMBOL, OTHER):
+        pool += (classes == cls).any(axis=0) * POOL_SIZES[cls]
+    return lengths * np.log2(np.maximum(pool, 1))
+
+
+def keyboard_walks(codes, exclude=None):
+    """Positions inside runs of 3 or more adjacent keyboard keys, none of them in ``exclude``."""
+    return _walk_cover(_key_pairs(codes), codes.shape, exclude)
+
+
+def _key_pairs(codes):
+    """Whether each position and the next are adjacent keys."""
+    if len(codes) < 3:
+        return None
+    keys = _lookup(_KEYS, codes)
+    return _ADJACENT[keys[:-1], keys[1:]]
+
+
+def _walk_cover(pairs, shape, exclude):
+    if pairs is None:
+        return np.zeros(shape, dtype=bool)
+    if exclude is not None:
+        pairs = pairs & ~(exclude[:-1] | exclude[1:])
+    return _spread(pairs[:-1] & pairs[1:], 3, shape[0])
+
+
+def dates(codes, exclude=None):
+    """Positions inside years 1900-2099 and 6- or 8-digit dates, none of them in ``exclude``."""
+    return _date_cover(codes.shape, _date_starts(codes), exclude)
+
+
+def _date_starts(codes):
+    """
+    Where each date starts, ignoring any exclusion.
+
+    Returns:
+        tuple: (columns, [(span, starts)]). Only columns with 4 or more
+            digits are looked at; ``starts`` holds one row per window.
+    """
+    is_digit = (codes >= 48) & (codes <= 57)
+    columns = np.flatnonzero(np.count_nonzero(is_digit, axis=0) >= 4)
+    if not len(columns):
+        return columns, []
+    # Values outside digits wrap around, but only all-digit windows are read.
+    digits = codes[:, columns].astype(np.int16) - 48
+    return columns, _dates(digits, is_digit[:, columns])
+
+
+def _date_cover(shape, date_starts, exclude):
+    columns, spans = date_starts
+    covered = np.zeros(shape, dtype=bool)
+    if not spans:
+        return covered
+    width = shape[0]
+    if exclude is not None:
+        # Excluded positions before each position, to drop windows with any.
+        before = np.zeros((width + 1, len(columns)), dtype=np.int16)
+        np.cumsum(exclude[:, columns], axis=0, out=before[1:])
+    part = np.zeros((width, len(columns)), dtype=bool)
+    for span, starts in spans:
+        if exclude is not None:
+            starts = starts & (before[span:] == before[:len(starts)])
+        part |= _spread(starts, span, width)
+    covered[:, columns] = part
+    return covered
+
+
+def _dates(digits, is_digit):
+    width = len(digits)
+    spans = []
+    # Digits before each position, to tell all-digit windows.
+    before = np.zeros((width + 1, digits.shape[1]), dtype=np.int16)
+    np.cumsum(is_digit, axis=0, out=before[1:])
+    # Two- and four-digit numbers starting at each position; out-of-range
+    # values (from non-digits) clip to table entries that are False.
+    pair = digits[:-1] * 10 + digits[1:]
+    four = pair[:-2] * 100 + pair[2:]
+    day = _DAY.take(pair, mode='clip')
+    month = _MONTH.take(pair, mode='clip')
+
+    def all_digits(span):
+        count = width - span + 1
+        return before[span:] - before[:count] == span, count
+
+    def day_month(d, m, count):
+        return day[d:d + count] & month[m:m + count]
+
+    def year(value):
+        return (value >= 1900) & (value <= 2099)
+
+    every, count = all_digits(4)
+    spans.append((4, every & year(four)))
+    if width >= 6:
+        every, count = all_digits(6)
+        valid = day_month(0, 2, count) | day_month(2, 0, count) | day_month(4, 2, count)
+        spans.append((6, every & valid))
+    if width >= 8:
+        every, count = all_digits(8)
+        valid = (year(four[4:count + 4]) & (day_month(0, 2, count) | day_month(2, 0, count))
+                 | year(four[:count]) & day_month(6, 4, count))
+        spans.append((8, every & valid))
+    return spans
+
+
+def _date_walk_bits(codes, exclude, free, pool_bits, date_starts, key_pairs):
+    """
+    Bits of the ``free`` characters outside ``exclude``, with dates found
+    before walks. ``date_starts`` and ``key_pairs`` come from _date_starts
+    and _key_pairs, computed once for both readings of a batch.
+    """
+    date = _date_cover(codes.shape, date_starts, exclude)
+    walk = _walk_cover(key_pairs, codes.shape, date if exclude is None else date | exclude)
+    date_chars = np.count_nonzero(date, axis=0)
+    walk_chars = np.count_nonzero(walk, axis=0)
+    walk_runs = np.count_nonzero(_run_starts(walk), axis=0)
+    bits = ((free - date_chars - walk_chars) * pool_bits + date_chars * DATE_BITS
+            + walk_runs * WALK_START_BITS + (walk_chars - walk_runs) * WALK_BITS)
+    return bits, date_chars, walk_chars
+
+
+def strength(bits):
+    """Indexes into STRENGTH_NAMES, 0 (very weak) to 4, for an array of bits."""
+    return np.searchsorted(STRENGTH_BITS, bits, side='right')
+
+
+class Scorer:
+    """
+    Scores batches of candidates; see the module docstring.
+
+    Parameters:
+        words (iterable): Known base words. Defaults to the 'baseword' and
+            'prefix' wordlists.
+        min_word (int): Shorter words are ignored; they would match
+            almost anything.
+        max_word (int): Longer words are ignored.
+    """
+
+    def __init__(self, words=None, min_word=4, max_word=16):
+        if words is None:
+            words = list(wordlists.registry.unique('baseword')) + list(wordlists.registry.unique('prefix'))
+        words = list({word.lower() for word in words if min_word <= len(word) <= max_word})
+        self.min_word = min_word
+        self.max_word = max_word
+        self.word_count = len(words)
+        self.word_bits = math.log2(max(self.word_count, 2))
+        codes, lengths = encode(words)
+        self._hashes = np.unique(_hash_words(codes, lengths))
+        # Window lengths that some word has; the others are never looked up.
+        self._word_lengths = set(np.unique(lengths).tolist())
+        # A bitmap in front of the sorted hashes answers most misses with
+        # one memory access; only its hits are confirmed by binary search.
+        self._shift, self._bitmap = _bitmap(self._hashes, 32)
+        # Every prefix of min_word or more characters, so a window that
+        # starts no word is dropped before the longer windows are hashed.
+        # False positives only keep a window a little longer.
+        self._prefix_shift, self._prefixes = _bitmap(_hash_prefixes(codes, lengths, min_word), 8)
+
+    def _slots(self, hashes):
+        return ((hashes * _MIX) >> self._shift).astype(np.intp)
+
+    def _may_start_word(self, hashes):
+        return self._prefixes[((hashes * _MIX) >> self._prefix_shift).astype(np.intp)]
+
+    def _contains(self, hashes):
+        found = self._bitmap[self._slots(hashes)]
+        hits = np.flatnonzero(found)
+        if len(hits):
+            candidates = hashes[hits]
+            index = np.minimum(np.searchsorted(self._hashes, candidates), len(self._hashes) - 1)
+            found[hits] = self._hashes[index] == candidates
+        return found
+
+    def _longest_words(self, codes):
+        """Length of the longest known word starting at each position, 0 for none."""
+        longest = np.zeros(codes.shape, dtype=np.int8)
+        width, count = codes.shape
+        first = width - self.min_word + 1
+        if not len(self._hashes) or first <= 0:
+            return longest
+        # Both leet readings at once. A window follows one shared reading
+        # until it reaches an ambiguous token, and only then splits in two,
+        # so windows without one are hashed once.
+        texts = [_translate(table, codes).astype(np.uint64).ravel() for table in _DELEET]
+        ambiguous = _lookup(_AMBIGUOUS, codes).ravel()
+        h = [np.zeros(first * count, dtype=np.uint64) for _ in texts]
+        split = np.zeros(first * count, dtype=bool)
+        for k in range(self.min_word):
+            rows = slice(k * count, (k + first) * count)
+            for reading, text in enumerate(texts):
+                h[reading] = h[reading] * _PRIME + text[rows]
+            split |= ambiguous[rows]
+        # Reading -1 is shared by both; 0 and 1 are after a split.
+        alive = np.concatenate([np.arange(first * count), np.flatnonzero(split)])
+        reading = np.concatenate([np.where(split, 0, -1), np.ones(len(alive) - first * count, dtype=np.int64)])
+        h = np.concatenate([h[0], h[1][split]])
+        keep = self._may_start_word(h)
+        alive, h, reading = alive[keep], h[keep], reading[keep]
+        flat = longest.reshape(-1)
+        for k in range(self.min_word, self.max_word + 1):
+            # k only grows, so the last match at a position is the longest.
+            if k in self._word_lengths:
+                flat[alive[self._contains(h)]] = k
+            if k == self.max_word or k == width:
+                break
+            keep = alive < (width - k) * count
+            alive, h, reading = alive[keep], h[keep], reading[keep]
+            at = alive + k * count
+            split = np.flatnonzero(ambiguous[at] & (reading < 0))
+            if len(split):
+                reading[split] = 0
+                alive = np.concatenate([alive, alive[split]])
+                h = np.concatenate([h, h[split]])
+                reading = np.concatenate([reading, np.ones(len(split), dtype=reading.dtype)])
+                at = alive + k * count
+            h = h * _PRIME + np.where(reading == 1, texts[1][at], texts[0][at])
+            keep = self._may_start_word(h)
+            alive, h, reading = alive[keep], h[keep], reading[keep]
+            if not len(alive):
+                break
+        return longest
+
+    def base_words(self, codes):
+        """
+        Known words, matched left to right, longest first (maximal munch).
+
+        Returns:
+            tuple: (covered, starts) bool matrices of word positions and
+                word beginnings.
+        """
+        longest = self._longest_words(codes)
+        covered = np.zeros(codes.shape, dtype=bool)
+        starts = np.zeros(codes.shape, dtype=bool)
+        end = np.zeros(codes.shape[1], dtype=np.int64)
+        for i, row in enumerate(longest):
+            if row.any():
+                take = (row > 0) & (end <= i)
+                starts[i] = take
+                end = np.where(take, i + row, end)
+            np.greater(end, i, out=covered[i])
+        return covered, starts
+
+    def _score(self, codes, lengths, patterns=True):
+        codes = np.ascontiguousarray(codes)
+        classes = _lookup(_CLASSES, codes)
+        entropy = charset_bits(classes, lengths)
+        if not patterns:
+            none = np.zeros(len(lengths), dtype=np.int64)
+            return Scores(lengths, entropy, entropy, none, none, none, none)
+        pool_bits = np.where(lengths > 0, entropy / np.maximum(lengths, 1), 0)
+
+        word, word_starts = self.base_words(codes)
+        word_chars = np.count_nonzero(word, axis=0)
+        leet = np.count_nonzero(word & _lookup(_LEET, codes), axis=0)
+        upper = np.count_nonzero(word & (classes == UPPER), axis=0)
+        date_starts, key_pairs = _date_starts(codes), _key_pairs(codes)
+        bits, date_chars, walk_chars = _date_walk_bits(codes, word, lengths - word_chars, pool_bits,
+                                                       date_starts, key_pairs)
+        bits += np.count_nonzero(word_starts, axis=0) * self.word_bits + leet * LEET_BITS + upper * CASE_BITS
+
+        # Words take priority, which can hide a cheaper date or walk
+        # ('qwerty' read as 'wert'), so the reading without words is kept
+        # when it is cheaper.
+        plain, plain_date, plain_walk = _date_walk_bits(codes, None, lengths, pool_bits,
+                                                        date_starts, key_pairs)
+        better = plain < bits
+        if better.any():
+            bits = np.where(better, plain, bits)
+            word_chars, leet = np.where(better, 0, word_chars), np.where(better, 0, leet)
+            date_chars = np.where(better, plain_date, date_chars)
+            walk_chars = np.where(better, plain_walk, walk_chars)
+        return Scores(lengths, entropy, np.minimum(bits, entropy), word_chars, leet, walk_chars, date_chars)
+
+    def score(self, candidates, patterns=True):
+        """
+        Scores a batch (a list, or any iterable) of candidates.
+
+        Parameters:
+            patterns (bool): False skips pattern detection; bits is then
+                the charset entropy, which is several times faster.
+
+        Returns:
+            Scores: One array per measure, aligned with ``candidates``.
+        """
+        if not isinstance(candidates, (list, tuple)):
+            candidates = list(candidates)
+        codes, lengths = encode(candidates)
+        if not patterns or len(codes) <= LENGTH_BUCKETS[0]:
+            return self._score(codes, lengths, patterns)
+        # Candidates are scored in groups of similar length, so that a few
+        # long ones do not pad the whole batch to their width.
+        order = np.argsort(lengths, kind='stable')
+        bounds = np.searchsorted(lengths[order], LENGTH_BUCKETS, side='right').tolist()
+        results = None
+        for start, stop in zip([0] + bounds, bounds + [len(order)]):
+            if start == stop:
+                continue
+            columns = order[start:stop]
+            width = max(int(lengths[columns[-1]]), 1)
+            part = self._score(codes[:width, columns], lengths[columns])
+            if results is None:
+                results = Scores(*(np.empty(len(order), dtype=values.dtype) for values in part))
+            for out, values in zip(results, part):
+                out[columns] = values
+        return results
+
+    def bits(self, candidates, patterns=True):
+        """Bits for a batch; see score."""
+        return self.score(candidates, patterns).bits
+
+
+_default_scorer = None
+# Charset entropy needs no words, so it does not load the wordlists.
+_CHARSET_SCORER = Scorer(())
+
+
+def default_scorer():
+    """A Scorer over the default wordlists, built on first use."""
+    global _default_scorer
+    if _default_scorer is None:
+        _default_scorer = Scorer()
+    return _default_scorer
+
+
+def within(bits, min_bits=None, max_bits=None):
+    """Bool mask of the ``bits`` inside [min_bits, max_bits]; None is unbounded."""
+    keep = np.ones(len(bits), dtype=bool)
+    if min_bits is not None:
+        keep &= bits >= min_bits
+    if max_bits is not None:
+        keep &= bits <= max_bits
+    return keep
+
+
+def iter_scores(candidates, scorer=None, patterns=True, chunk_size=65536):
+    """
+    Yields (chunk, Scores) for successive chunks of ``candidates``.
+
+    Parameters:
+        candidates (iterable): Any candidates, e.g. iter_mutations or
+            mutation_engine output, or a cracker wordlist.
+        scorer (Scorer): Defaults to default_scorer(), or to a wordless
+            Scorer when ``patterns`` is False.
+        patterns (bool): False scores by charset entropy alone.
+        chunk_size (int): Candidates scored per batch.
+    """
+    if scorer is None:
+        scorer = default_scorer() if patterns else _CHARSET_SCORER
+    candidates = iter(candidates)
+    while True:
+        chunk = list(islice(candidates, chunk_size))
+        if not chunk:
+            return
+        yield chunk, scorer.score(chunk, patterns)
+
+
+def filter_candidates(candidates, min_bits=None, max_bits=None, scorer=None, patterns=True, chunk_size=65536):
+    """
+    Streaming filter stage: yields lists of the candidates whose bits lie
+    within [min_bits, max_bits], in their original order. See iter_scores
+    for the other parameters.
+    """
+    for chunk, scores in iter_scores(candidates, scorer, patterns, chunk_size):
+        chunk = list(compress(chunk, within(scores.bits, min_bits, max_bits).tolist()))
+        if chunk:
+            yield chunk
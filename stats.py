@@ -0,0 +1,118 @@
+# stats.py
+"""
+Instrumentation for MutationRun / iter_mutations.
+
+Pass an EngineStats as ``stats=`` and the engine reports, for every layer,
+the frontier it expanded and, for every strategy, how many candidates it
+produced, how many it generated that were already seen, and the time it
+spent. Time excludes the periods where the generator is suspended at a
+yield, so a slow consumer does not show up as a slow strategy.
+
+The engine reports once per (frontier string, strategy) segment, never per
+candidate. With ``stats`` None its single inner loop skips the clock reads;
+benchmarks/bench_stats.py measures both modes against the loop as it was
+before instrumentation.
+
+For live export, pass callbacks or subclass and override
+``layer_started`` / ``strategy_done``.
+"""
+
+
+class StrategyStats:
+    __slots__ = ('produced', 'duplicates', 'seconds', 'calls')
+
+    def __init__(self):
+        self.produced = 0
+        self.duplicates = 0
+        self.seconds = 0.0
+        self.calls = 0
+
+    def as_dict(self):
+        generated = self.produced + self.duplicates
+        return {
+            'produced': self.produced,
+            'duplicates': self.duplicates,
+            'duplicate_rate': self.duplicates / generated if generated else 0.0,
+            'seconds': self.seconds,
+            'calls': self.calls,
+            'rate': self.produced / self.seconds if self.seconds else 0.0,
+        }
+
+
+class EngineStats:
+    """
+    Parameters:
+        on_layer (callable): Called as ``on_layer(layer, frontier_size)``
+            when a layer starts expanding.
+        on_strategy (callable): Called as ``on_strategy(layer, strategy,
+            produced, duplicates, seconds)`` after each segment.
+    """
+
+    def __init__(self, on_layer=None, on_strategy=None):
+        self.on_layer = on_layer
+        self.on_strategy = on_strategy
+        self.frontiers = {}   # layer -> frontier size
+        self.strategies = {}  # (layer, strategy) -> StrategyStats
+
+    def layer_started(self, layer, frontier_size):
+        self.frontiers[layer] = frontier_size
+        if self.on_layer is not None:
+            self.on_layer(layer, frontier_size)
+
+    def strategy_done(self, layer, strategy, produced, duplicates, seconds):
+        entry = self.strategies.get((layer, strategy))
+        if entry is None:
+            entry = self.strategies[(layer, strategy)] = StrategyStats()
+        entry.produced += produced
+        entry.duplicates += duplicates
+        entry.seconds += seconds
+        entry.calls += 1
+        if self.on_strategy is not None:
+            self.on_strategy(layer, strategy, produced, duplicates, seconds)
+
+    def totals(self):
+        """Per-strategy stats summed over all layers."""
+        totals = {}
+        for (_, strategy), entry in self.strategies.items():
+            total = totals.setdefault(strategy, StrategyStats())
+            total.produced += entry.produced
+            total.duplicates += entry.duplicates
+            total.seconds += entry.seconds
+            total.calls += entry.calls
+        return totals
+
+    def report(self):
+        """
+        Returns:
+            dict: ``layers`` (a list with each layer's frontier size and
+            per-strategy stats), ``strategies`` (totals across layers) and
+            overall ``produced``/``duplicates``/``seconds``.
+        """
+        layers = []
+        for layer in sorted(set(self.frontiers) | {layer for layer, _ in self.strategies}):
+            layers.append({
+                'layer': layer,
+                'frontier': self.frontiers.get(layer, 0),
+                'strategies': {strategy: entry.as_dict()
+                               for (entry_layer, strategy), entry in self.strategies.items()
+                               if entry_layer == layer},
+            })
+        totals = self.totals()
+        return {
+            'layers': layers,
+            'strategies': {strategy: entry.as_dict() for strategy, entry in totals.items()},
+            'produced': sum(entry.produced for entry in totals.values()),
+            'duplicates': sum(entry.duplicates for entry in totals.values()),
+            'seconds': sum(entry.seconds for entry in totals.values()),
+        }
+
+    def format(self):
+        """The report as a plain-text table."""
+        lines = [f"{'layer':>5} {'strategy':<15} {'produced':>12} {'dupes':>12} {'dupe%':>6} "
+                 f"{'seconds':>9} {'per sec':>12}"]
+        for layer in self.report()['layers']:
+            lines.append(f"{layer['layer']:>5} {'(frontier)':<15} {layer['frontier']:>12,}")
+            for strategy, entry in layer['strategies'].items():
+                lines.append(f"{'':>5} {strategy:<15} {entry['produced']:>12,} {entry['duplicates']:>12,} "
+                             f"{entry['duplicate_rate']:>6.1%} {entry['seconds']:>9.3f} {entry['rate']:>12,.0f}")
+        return '\n'.join(lines)
@@ -0,0 +1,123 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import app as app_module
+import leakcheck
+import wordlists
+from app import app, result_cache
+from jobqueue import JobQueue
+
+
+class TestMutationsAPI(unittest.TestCase):
+
+    def setUp(self):
+        self.client = app.test_client()
+        result_cache.clear()
+
+    def test_streams_candidates(self):
+        response = self.client.get('/api/mutations?password=test&depth=1&max_mutations=50')
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.is_streamed)
+        lines = response.get_data(as_text=True).splitlines()
+        self.assertEqual(len(lines), 50)
+        self.assertEqual(lines[0], 'test')
+
+    def test_second_request_is_cached(self):
+        url = '/api/mutations?password=test&depth=1&max_mutations=50'
+        first = self.client.get(url)
+        body = first.get_data()
+        self.assertEqual(first.headers['X-Cache'], 'MISS')
+        second = self.client.get(url)
+        self.assertEqual(second.headers['X-Cache'], 'HIT')
+        self.assertEqual(second.get_data(), body)
+
+    def test_wordlist_change_invalidates_cache(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'suffixes.txt')
+            registry = wordlists.WordlistRegistry(
+                {'prefix': (), 'suffix': ('suffixes.txt',), 'baseword': ()}, data_dir=directory)
+            url = '/api/mutations?password=test&depth=1&max_mutations=0'
+            with mock.patch.object(wordlists, 'registry', registry):
+                with open(path, 'w') as f:
+                    f.write('123\n')
+                first = self.client.get(url).get_data(as_text=True).splitlines()
+                self.assertIn('test123', first)
+                with open(path, 'w') as f:
+                    f.write('456!\n')
+                os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+                response = self.client.get(url)
+                self.assertEqual(response.headers['X-Cache'], 'MISS')
+                second = response.get_data(as_text=True).splitlines()
+                self.assertIn('test456!', second)
+                self.assertNotIn('test123', second)
+                self.assertEqual(self.client.get(url).headers['X-Cache'], 'HIT')
+
+    def test_rejects_bad_parameters(self):
+        self.assertEqual(self.client.get('/api/mutations').status_code, 400)
+        self.assertEqual(self.client.get('/api/mutations?password=a&depth=9').status_code, 400)
+        self.assertEqual(self.client.get('/api/mutations?password=a&max_mutations=x').status_code, 400)
+
+
+class TestJobsAPI(unittest.TestCase):
+
+    def setUp(self):
+        self.client = app.test_client()
+        self.directory = tempfile.mkdtemp()
+        app_module.job_queue = JobQueue(self.directory, workers=1)
+
+    def tearDown(self):
+        app_module.job_queue.shutdown()
+        app_module.job_queue = None
+        shutil.rmtree(self.directory)
+
+    def test_submit_poll_and_download(self):
+        response = self.client.post('/api/jobs', json={'passwords': ['test'], 'depth': 1,
+                                                       'max_mutations': 25})
+        self.assertEqual(response.status_code, 202)
+        job_id = response.get_json()['id']
+        for _ in range(600):
+            status = self.client.get(f'/api/jobs/{job_id}').get_json()
+            if status['state'] == 'done':
+                break
+            self.assertIn(status['state'], ('queued', 'running'))
+            time.sleep(0.05)
+        self.assertEqual(status['emitted'], 25)
+        output = self.client.get(f'/api/jobs/{job_id}/output')
+        self.assertEqual(len(output.get_data(as_text=True).splitlines()), 25)
+        output.close()
+
+    def test_rejects_bad_jobs(self):
+        self.assertEqual(self.client.post('/api/jobs', json={}).status_code, 400)
+        self.assertEqual(self.client.post('/api/jobs', json={'password': 'a', 'depth': 9}).status_code, 400)
+        self.assertEqual(self.client.get('/api/jobs/missing').status_code, 404)
+
+
+class TestLeakCheckAPI(unittest.TestCase):
+
+    def setUp(self):
+        self.client = app.test_client()
+        self.directory = tempfile.mkdtemp()
+        path = os.path.join(self.directory, 'leaks.lki')
+        leakcheck.build_index_from_entries(["dragon", "letmein", b"p\xe4ss"], path)
+        app_module.leak_index = leakcheck.LeakIndex(path)
+
+    def tearDown(self):
+        app_module.leak_index.close()
+        app_module.leak_index = None
+        shutil.rmtree(self.directory)
+
+    def test_returns_hits(self):
+        response = self.client.post('/api/leakcheck', data="dragon\nsafe\nletmein\n")
+        self.assertEqual(response.get_json(), {'checked': 3, 'found': 2, 'hits': ['dragon', 'letmein']})
+
+    def test_finds_non_utf8_entries(self):
+        response = self.client.post('/api/leakcheck', data=b"p\xe4ss\r\np\xe4s\n")
+        self.assertEqual(response.get_json(), {'checked': 2, 'found': 1, 'hits': ['$HEX[70e47373]']})
+
+
+if __name__ == '__main__':
+    unittest.main()
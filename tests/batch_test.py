@@ -0,0 +1,93 @@
+import multiprocessing
+import os
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from batch import iter_batch_mutations
+from mutations import iter_mutations
+
+
+def _wait_for_file(path, timeout=30):
+    deadline = time.monotonic() + timeout
+    while not os.path.exists(path):
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+def _fake_mutations(marker):
+    """
+    iter_mutations stand-in: 'head' only finishes once 'large' has produced
+    all of its candidates, which it can only do if nothing waits for 'head'.
+    """
+    def iter_mutations(password, *args, **kwargs):
+        if password == 'head':
+            yield 'ok' if _wait_for_file(marker) else 'stalled'
+            return
+        yield from (f"{password}{i}" for i in range(1000))
+        open(marker, 'w').close()
+    return iter_mutations
+
+
+class TestSharding(unittest.TestCase):
+
+    def test_shards_cover_unsharded_output(self):
+        args = ("pass", ["1", "!"], ["my"], ["dragon"])
+        expected = set(iter_mutations(*args, depth=2))
+        sharded = set()
+        for index in range(3):
+            sharded.update(iter_mutations(*args, depth=2, shard=(index, 3)))
+        self.assertEqual(sharded, expected)
+
+    def test_first_layer_only_in_shard_zero(self):
+        args = ("pass", ["1"], ["my"], ["dragon"])
+        self.assertNotIn("pass", list(iter_mutations(*args, depth=1, shard=(1, 2))))
+
+
+class TestBatchMutations(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.store_path = os.path.join(self.tmpdir.name, 'wordlists.bin')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_streams_chunks_in_input_order(self):
+        chunks = list(iter_batch_mutations(["alpha", "bravo"], depth=1, max_mutations=30,
+                                           workers=2, chunk_size=7, store_path=self.store_path))
+        self.assertTrue(all(len(chunk) <= 7 for chunk in chunks))
+        flat = [m for chunk in chunks for m in chunk]
+        self.assertEqual(len(flat), 60)
+        self.assertEqual(flat[0], "alpha")
+        self.assertEqual(flat[30], "bravo")
+
+    def test_dedupe_across_tasks(self):
+        flat = [m for chunk in iter_batch_mutations(["alpha", "alpha"], depth=1, max_mutations=30,
+                                                    workers=2, dedupe=True,
+                                                    store_path=self.store_path) for m in chunk]
+        self.assertEqual(len(flat), len(set(flat)))
+        self.assertEqual(len(flat), 30)
+
+    def test_stops_early_without_finishing_tasks(self):
+        chunks = iter_batch_mutations(["alpha", "bravo", "charlie"], depth=2, max_mutations=10**6,
+                                      workers=2, chunk_size=50, store_path=self.store_path)
+        self.assertEqual(len(next(chunks)), 50)
+        chunks.close()
+
+    @unittest.skipUnless(multiprocessing.get_start_method() == 'fork', "workers must inherit the patch")
+    def test_long_head_task_does_not_stall_later_ones(self):
+        marker = os.path.join(self.tmpdir.name, 'large-done')
+        with mock.patch('batch.iter_mutations', _fake_mutations(marker)):
+            chunks = list(iter_batch_mutations(["head", "large"], workers=2, chunk_size=10,
+                                               store_path=self.store_path))
+        self.assertEqual(chunks[0], ['ok'])
+        flat = [m for chunk in chunks[1:] for m in chunk]
+        self.assertEqual(flat, [f"large{i}" for i in range(1000)])
+
+
+if __name__ == '__main__':
+    unittest.main()
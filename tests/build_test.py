@@ -0,0 +1,83 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+import wordlists
+from data.build import TARGETS, build
+from data.phrases import extract_phrases
+
+
+class TestBuild(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.raw = os.path.join(self.directory, 'raw')
+        os.makedirs(os.path.join(self.raw, 'basewords'))
+        os.makedirs(os.path.join(self.directory, 'basewords'))
+        self.rockyou = os.path.join(self.raw, 'rockyou.txt')
+        lines = []
+        for i in range(3000):
+            lines += [f"i love you {i % 700}", f"pass{i}", "Hello World!", f"süß word {i}", "a b c d", ""]
+        with open(self.rockyou, 'w', encoding='utf-8') as f:
+            f.write('\r\n'.join(lines))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def output(self, name):
+        return os.path.join(self.directory, TARGETS[name].output)
+
+    def build(self, names, **kwargs):
+        return {result['target']: result for result in build(names, data_dir=self.directory,
+                                                               raw_dir=self.raw, **kwargs)}
+
+    def test_phrases_match_script_with_runs_and_chunks(self):
+        expected = os.path.join(self.directory, 'expected.txt')
+        extract_phrases(self.rockyou, expected)
+        for workers in (1, 2):
+            with self.subTest(workers=workers):
+                result = self.build(['phrases'], workers=workers, force=True, chunk_bytes=4096, run_items=100)
+                self.assertIn(result['phrases']['status'], ('built', 'unchanged'))
+                with open(expected) as f, open(self.output('phrases')) as g:
+                    self.assertEqual(g.read(), f.read())
+                self.assertEqual(result['phrases']['words'], 701)
+        self.assertEqual(os.listdir(os.path.join(self.directory, 'basewords')), ['phrases.txt'])
+
+    def test_rebuilds_only_changed_sources(self):
+        self.assertEqual(self.build(['phrases'], workers=1)['phrases']['status'], 'built')
+        mtime = os.stat(self.output('phrases')).st_mtime_ns
+        self.assertEqual(self.build(['phrases'], workers=1)['phrases']['status'], 'up to date')
+
+        # Same content, new mtime: rebuilt, but the output is left alone.
+        os.utime(self.rockyou, ns=(1, 1))
+        self.assertEqual(self.build(['phrases'], workers=1)['phrases']['status'], 'unchanged')
+        self.assertEqual(os.stat(self.output('phrases')).st_mtime_ns, mtime)
+
+        with open(self.rockyou, 'a') as f:
+            f.write('\nbrand new phrase\n')
+        self.assertEqual(self.build(['phrases'], workers=1)['phrases']['status'], 'built')
+        with open(self.output('phrases')) as f:
+            self.assertIn('brand new phrase\n', f.read())
+
+    def test_geonames_and_missing_sources(self):
+        with open(os.path.join(self.raw, 'basewords', 'cities15000.txt'), 'w', encoding='utf-8') as f:
+            f.write("1\tSão Paulo\tSao Paulo\n2\tL'Aquila\tx\n3\tSão Paulo\ty\nbroken\n")
+        results = self.build(['world_cities', 'uscities'], workers=1)
+        self.assertEqual(results['uscities']['status'], 'missing source')
+        with open(self.output('world_cities')) as f:
+            self.assertEqual(f.read(), "laquila\nsaopaulo\n")
+
+    def test_books_keep_first_titles_in_order(self):
+        results = build(['books'], data_dir=self.directory, raw_dir=wordlists.DATA_DIR, workers=2)
+        self.assertEqual(results[0]['words'], 2500)
+        with open(self.output('books')) as f, open(os.path.join(wordlists.DATA_DIR, 'basewords', 'books.txt')) as g:
+            self.assertEqual(f.read(), g.read())
+
+    def test_unknown_target(self):
+        with self.assertRaises(ValueError):
+            build(['nope'], data_dir=self.directory)
+
+
+if __name__ == '__main__':
+    unittest.main()
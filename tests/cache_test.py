@@ -0,0 +1,96 @@
+import threading
+import unittest
+
+from cache import SizedLRUCache, StrategyMemo
+from mutations import iter_capitalization, iter_mutations
+
+
+class TestSizedLRUCache(unittest.TestCase):
+
+    def test_evicts_least_recently_used_by_size(self):
+        cache = SizedLRUCache(max_size=10)
+        cache.put('a', 'A', 4)
+        cache.put('b', 'B', 4)
+        cache.get('a')
+        cache.put('c', 'C', 4)
+        self.assertIn('a', cache)
+        self.assertNotIn('b', cache)
+        self.assertEqual(cache.size, 8)
+        self.assertEqual(cache.evictions, 1)
+
+    def test_rejects_oversized_entries(self):
+        cache = SizedLRUCache(max_size=10, max_entry_size=5)
+        self.assertFalse(cache.put('a', 'A', 6))
+        self.assertNotIn('a', cache)
+
+    def test_hit_miss_stats(self):
+        cache = SizedLRUCache(max_size=10)
+        cache.get('a')
+        cache.put('a', 'A', 1)
+        cache.get('a')
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+
+class TestStrategyMemo(unittest.TestCase):
+
+    def test_counts_per_strategy(self):
+        memo = StrategyMemo(2**20)
+        calls = []
+
+        def upper(text):
+            calls.append(text)
+            return [text.upper()]
+
+        capitalize = memo.wrap('upper', upper)
+        self.assertEqual(capitalize('ab'), ('AB',))
+        self.assertEqual(capitalize('ab'), ('AB',))
+        self.assertEqual(memo.get('caps', 'ab', iter_capitalization), tuple(iter_capitalization('ab')))
+        self.assertEqual(calls, ['ab'])
+        stats = memo.stats()['strategies']
+        self.assertEqual((stats['upper']['hits'], stats['upper']['misses']), (1, 1))
+        self.assertEqual(stats['caps']['hit_rate'], 0.0)
+
+    def test_counts_shared_across_threads(self):
+        memo = StrategyMemo(2**20)
+        capitalize = memo.wrap('caps', iter_capitalization)
+
+        def work():
+            for i in range(2000):
+                capitalize(f"w{i % 50}")
+
+        threads = [threading.Thread(target=work) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        stats = memo.stats()['strategies']['caps']
+        self.assertEqual(stats['hits'] + stats['misses'], 8 * 2000)
+
+    def test_evicts_by_size(self):
+        memo = StrategyMemo(max_size=1000, max_entry_size=1000)
+        for i in range(50):
+            memo.get('capitalization', f"word{i}", iter_capitalization)
+        stats = memo.stats()
+        self.assertLessEqual(stats['size'], 1000)
+        self.assertGreater(stats['evictions'], 0)
+        memo.clear()
+        self.assertEqual(memo.stats()['entries'], 0)
+
+    def test_engine_output_unchanged(self):
+        lists = (["1", "!", "2019"], ["my", "#"], ["dog", "Sun!"])
+        memo = StrategyMemo(2**20)
+        for password in ("pass", "Pass", "pass1", "pass"):
+            for depth in (1, 2):
+                with self.subTest(password=password, depth=depth):
+                    expected = list(iter_mutations(password, *lists, depth=depth))
+                    self.assertEqual(list(iter_mutations(password, *lists, depth=depth, memo=memo)), expected)
+                    self.assertEqual(list(iter_mutations(password, *lists, depth=depth, max_mutations=40,
+                                                         shard=(1, 3), memo=memo)),
+                                     list(iter_mutations(password, *lists, depth=depth, max_mutations=40,
+                                                         shard=(1, 3))))
+        self.assertGreater(memo.stats()['strategies']['capitalization']['hits'], 0)
+        self.assertGreater(memo.stats()['strategies']['leetspeak']['hits'], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+
+from dedupe import BloomFilter, SpillSet, make_dedupe
+from mutations import iter_mutations
+
+
+class TestBloomFilter(unittest.TestCase):
+
+    def test_no_false_negatives(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        words = [f"word{i}" for i in range(1000)]
+        for word in words:
+            bloom.add(word)
+        self.assertTrue(all(word in bloom for word in words))
+
+    def test_false_positive_rate_near_target(self):
+        bloom = BloomFilter(capacity=5000, error_rate=0.01)
+        for i in range(5000):
+            bloom.add(f"in{i}")
+        false_positives = sum(f"out{i}" in bloom for i in range(20000))
+        self.assertLess(false_positives / 20000, 0.03)
+
+    def test_rejects_bad_parameters(self):
+        with self.assertRaises(ValueError):
+            BloomFilter(capacity=0)
+        with self.assertRaises(ValueError):
+            BloomFilter(error_rate=1.5)
+
+
+class TestSpillSet(unittest.TestCase):
+
+    def test_exact_after_spilling(self):
+        with SpillSet(memory_items=10) as seen:
+            for i in range(100):
+                seen.add(f"w{i}")
+            self.assertLessEqual(len(seen._memory), 10)
+            self.assertTrue(all(f"w{i}" in seen for i in range(100)))
+            self.assertNotIn("w100", seen)
+
+    def test_spilled_count_skips_duplicates(self):
+        with SpillSet(memory_items=1000) as seen:
+            for i in range(10):
+                seen.add(f"w{i}")
+            seen.flush()
+            for i in range(5, 15):
+                seen.add(f"w{i}")
+            seen.flush()
+            self.assertEqual(seen._spilled, 15)
+            with SpillSet(path=seen.path) as reopened:
+                self.assertEqual(reopened._spilled, 15)
+                self.assertIn("w14", reopened)
+
+    def test_engine_output_matches_set(self):
+        args = ("pass", ["1", "!"], ["my"], ["dragon"])
+        with SpillSet(memory_items=16) as seen:
+            spilled = list(iter_mutations(*args, depth=2, seen=seen))
+        self.assertEqual(spilled, list(iter_mutations(*args, depth=2)))
+
+
+class TestMakeDedupe(unittest.TestCase):
+
+    def test_known_backends(self):
+        self.assertIsInstance(make_dedupe('set'), set)
+        self.assertIsInstance(make_dedupe('bloom', capacity=10), BloomFilter)
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            make_dedupe('trie')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+import gzip
+import os
+import tempfile
+import unittest
+
+from export import CandidateWriter, encode_chunk, format_candidate, hex_encode, parse_size
+
+
+class TestEncoding(unittest.TestCase):
+
+    def test_plain(self):
+        self.assertEqual(encode_chunk(["a", "ß"]), "a\nß\n".encode('utf-8'))
+        self.assertEqual(encode_chunk([]), b"")
+
+    def test_hex_only_where_needed(self):
+        chunk = encode_chunk(["pass", "paß", "€uro", "$HEX[41]", "tab\there"], format='hex')
+        self.assertEqual(chunk.decode('ascii').splitlines(), [
+            "pass", "$HEX[7061c39f]", "$HEX[e282ac75726f]", hex_encode("$HEX[41]"), "$HEX[7461620968657265]",
+        ])
+
+    def test_format_candidate(self):
+        self.assertEqual(format_candidate("paß"), "paß")
+        self.assertEqual(format_candidate("paß", 'hex'), "$HEX[7061c39f]")
+        self.assertEqual(format_candidate("pass", 'hex'), "pass")
+
+    def test_parse_size(self):
+        self.assertEqual(parse_size("512"), 512)
+        self.assertEqual(parse_size("4k"), 4096)
+        self.assertEqual(parse_size("1GiB"), 2**30)
+        with self.assertRaises(ValueError):
+            parse_size("lots")
+
+
+class TestCandidateWriter(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.directory = self.tmp.name
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_writes_file(self):
+        path = os.path.join(self.directory, 'out.txt')
+        with CandidateWriter(path, chunk_lines=3) as writer:
+            writer.write("first")
+            writer.write_many(f"c{i}" for i in range(10))
+            writer.write_chunk(["last"])
+        with open(path, encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        self.assertEqual(lines, ["first"] + [f"c{i}" for i in range(10)] + ["last"])
+        self.assertEqual(writer.lines_written, 12)
+
+    def test_gzip_inferred_from_name(self):
+        path = os.path.join(self.directory, 'out.txt.gz')
+        with CandidateWriter(path) as writer:
+            writer.write_many(["a", "b"])
+        with gzip.open(path, 'rt') as f:
+            self.assertEqual(f.read(), "a\nb\n")
+
+    def test_rotation_never_splits_lines(self):
+        path = os.path.join(self.directory, 'out.txt.gz')
+        words = [f"word{i:05d}" for i in range(2000)]
+        with CandidateWriter(path, rotate_bytes=4000, chunk_lines=100) as writer:
+            writer.write_many(words)
+        self.assertEqual([os.path.basename(p) for p in writer.files][:2], ["out.0000.txt.gz", "out.0001.txt.gz"])
+        self.assertGreater(len(writer.files), 1)
+        lines = []
+        for part in writer.files:
+            with gzip.open(part, 'rt') as f:
+                data = f.read()
+            self.assertLessEqual(len(data), 4000)
+            lines += data.splitlines()
+        self.assertEqual(lines, words)
+
+    def test_rejects_rotating_stdout(self):
+        with self.assertRaises(ValueError):
+            CandidateWriter('-', rotate_bytes=100)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import gzip
+import io
+import os
+import random
+import shutil
+import tempfile
+import unittest
+
+from export import CandidateWriter
+from extdedupe import ExternalDedupe, _read_lines
+
+
+def candidates(n, seed=0):
+    rng = random.Random(seed)
+    words = ['dragon', 'Dragon', 'p@ss', 'straße', 'naïve', '€uro', '']
+    return [f"{rng.choice(words)}{rng.randrange(n // 3)}" for _ in range(n)]
+
+
+class TestReadLines(unittest.TestCase):
+
+    def test_crlf_split_across_blocks(self):
+        data = b"aa\r\nbb\r\ncc\r\n"
+        for block_size in range(1, len(data) + 1):
+            self.assertEqual(list(_read_lines(io.BytesIO(data), block_size=block_size)),
+                             [b"aa", b"bb", b"cc"], block_size)
+        self.assertEqual(list(_read_lines(io.BytesIO(data), strip_cr=False, block_size=3)),
+                         [b"aa\r", b"bb\r", b"cc\r"])
+
+
+class TestExternalDedupe(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def fill(self, items, chunk=500, **options):
+        dedupe = ExternalDedupe(tmp_dir=self.directory, **options)
+        for i in range(0, len(items), chunk):
+            dedupe.update(items[i:i + chunk])
+        return dedupe
+
+    def test_sorted_unique_in_memory(self):
+        items = candidates(3000)
+        with self.fill(items) as dedupe:
+            self.assertEqual(list(dedupe), sorted(set(items)))
+            self.assertEqual(dedupe.runs_written, 0)
+
+    def test_spilled_runs_and_tiers(self):
+        items = candidates(20000)
+        for options in ({'max_items': 700}, {'max_items': 300, 'fan_in': 2},
+                        {'memory_bytes': 50_000, 'compression': None}):
+            with self.subTest(**options), self.fill(items, **options) as dedupe:
+                self.assertGreater(dedupe.runs_written, 1)
+                self.assertLessEqual(len(dedupe.runs), 20000 // 300)
+                self.assertEqual([word for chunk in dedupe.iter_chunks(chunk_size=999) for word in chunk],
+                                 sorted(set(items)))
+                stats = dedupe.stats()
+                self.assertEqual((stats['added'], stats['emitted']), (20000, len(set(items))))
+                if options.get('fan_in') == 2:
+                    # Never two runs of the same tier: they would have been merged.
+                    tiers = [tier for tier, _ in dedupe.runs]
+                    self.assertEqual(len(tiers), len(set(tiers)))
+        self.assertEqual(os.listdir(self.directory), [])
+
+    def test_exclude_earlier_exports(self):
+        first, second = candidates(5000, seed=1), candidates(5000, seed=2)
+        path = os.path.join(self.directory, 'first.txt.gz')
+        with self.fill(first, max_items=800) as dedupe, CandidateWriter(path, format='hex') as writer:
+            for chunk in dedupe.iter_chunks():
+                writer.write_chunk(chunk)
+        plain = os.path.join(self.directory, 'extra.txt')
+        with open(plain, 'w', encoding='utf-8') as f:
+            f.write('\r\n'.join(sorted(set(second))[::2]) + '\r\n')
+
+        with self.fill(second, max_items=800) as dedupe:
+            new = list(dedupe.iter_chunks(exclude=[path, plain]))
+        expected = sorted(set(second) - set(first) - set(sorted(set(second))[::2]))
+        self.assertEqual([word for chunk in new for word in chunk], expected)
+
+    def test_rejects_unsorted_exclude(self):
+        path = os.path.join(self.directory, 'unsorted.txt.gz')
+        with gzip.open(path, 'wt') as f:
+            f.write("b\na\n")
+        with self.fill(["a", "c"]) as dedupe:
+            with self.assertRaises(ValueError):
+                list(dedupe.iter_raw(exclude=[path]))
+
+    def test_rejects_hex_lines_sorted_as_text(self):
+        path = os.path.join(self.directory, 'sorted.txt')
+        with open(path, 'w') as f:
+            f.write("$HEX[c3a9]\nzz\n")  # `sort` order; decoded, 'é' belongs after 'zz'
+        with self.fill(["ü"]) as dedupe:
+            with self.assertRaisesRegex(ValueError, "decoded bytes"):
+                list(dedupe.iter_raw(exclude=[path]))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+import hashlib
+import os
+import shutil
+import tempfile
+import unittest
+
+import hashmatch
+import wordstore
+from mutations import iter_mutations
+
+
+def md5(text):
+    return hashlib.md5(text.encode('utf-8')).hexdigest()
+
+
+class TestHashList(unittest.TestCase):
+
+    def test_parse_mode(self):
+        self.assertEqual(hashmatch.parse_mode('md5'), ('md5', None))
+        self.assertEqual(hashmatch.parse_mode('SHA256(pass.salt)'), ('sha256', 'suffix'))
+        self.assertEqual(hashmatch.parse_mode(120), ('sha1', 'prefix'))
+        for bad in ('md4', 'md5(salt)', 'sha1(pass.salt'):
+            with self.assertRaises(ValueError):
+                hashmatch.parse_mode(bad)
+
+    def test_skips_invalid_lines(self):
+        hash_list = hashmatch.HashList([md5('a'), '', 'nothex', md5('b')[:-2], md5('c') + ':salt',
+                                        md5('d').upper() + '\n'], 'md5')
+        self.assertEqual(len(hash_list), 2)
+        self.assertEqual(hash_list.skipped, 3)
+
+    def test_match_unsalted(self):
+        hash_list = hashmatch.HashList([md5('dragon'), md5('pässwörd')], 0)
+        hits = hash_list.match(['nope', 'pässwörd', 'dragon', 'Dragon'])
+        self.assertEqual([hit.candidate for hit in hits], ['pässwörd', 'dragon'])
+        self.assertEqual(hashmatch.format_hit(hits[1]), f"{md5('dragon')}:dragon")
+
+    def test_match_salted(self):
+        lines = [
+            hashlib.sha1(b'NaCl' + b'dragon').hexdigest() + ':NaCl',
+            hashlib.sha1(b'\x00:' + b'letmein').hexdigest() + ':$HEX[003a]',
+            hashlib.sha1(b'dragon' + b'NaCl').hexdigest() + ':other',
+        ]
+        hash_list = hashmatch.HashList(lines, 'sha1(salt.pass)')
+        hits = hash_list.match(['dragon', 'letmein'])
+        self.assertEqual(sorted((hit.salt, hit.candidate) for hit in hits),
+                         [('$HEX[003a]', 'letmein'), ('NaCl', 'dragon')])
+        self.assertEqual(hashmatch.format_hit(hits[0]), f"{hits[0].hash}:{hits[0].salt}:{hits[0].candidate}")
+
+    def test_salt_keeps_surrounding_spaces(self):
+        line = hashlib.md5(b'dragon' + b' salt ').hexdigest() + ': salt \r\n'
+        hash_list = hashmatch.HashList([line], 'md5(pass.salt)')
+        self.assertEqual([hit.salt for hit in hash_list.match(['dragon'])], [' salt '])
+
+
+class TestIterMatches(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.hashes = os.path.join(self.directory, 'hashes.txt')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write_hashes(self, words):
+        with open(self.hashes, 'w') as f:
+            f.write('\n'.join(md5(word) for word in words) + '\n')
+
+    def test_pool_matches_in_order_and_counts(self):
+        candidates = [f"pass{i}" for i in range(1000)]
+        self.write_hashes(["pass7", "pass999", "absent"])
+        for workers in (1, 2):
+            stats = hashmatch.MatchStats()
+            hits = list(hashmatch.iter_matches(iter(candidates), self.hashes, workers=workers,
+                                               batch_size=100, stats=stats))
+            self.assertEqual([hit.candidate for hit in hits], ["pass7", "pass999"])
+            self.assertEqual((stats.candidates, stats.hashes, stats.hits), (1000, 1000, 2))
+            self.assertEqual(stats.workers, workers)
+            self.assertGreater(stats.per_core_rate, 0)
+
+    def test_interleaved_in_process_runs(self):
+        first = hashmatch.HashList([md5("a1"), md5("a2")])
+        second = hashmatch.HashList([md5("b1"), md5("b2")])
+        one = hashmatch.iter_matches(iter(["a1", "b1", "a2"]), first, workers=1, batch_size=1)
+        two = hashmatch.iter_matches(iter(["b1", "a1", "b2"]), second, workers=1, batch_size=1)
+        hits = [next(one).candidate, next(two).candidate, next(one).candidate, next(two).candidate]
+        self.assertEqual(hits, ["a1", "b1", "a2", "b2"])
+
+    def test_mutation_matches(self):
+        with wordstore.open_store(wordstore.DEFAULT_STORE) as store:
+            lists = (store['suffix'], store['prefix'], store['baseword'])
+            expected = list(iter_mutations("alpha", *lists, depth=1, max_mutations=50))
+        self.write_hashes([expected[3], expected[42]])
+        stats = hashmatch.MatchStats()
+        hits = list(hashmatch.iter_mutation_matches(["alpha", "bravo"], self.hashes, depth=1,
+                                                    max_mutations=50, workers=2, batch_size=16,
+                                                    stats=stats))
+        self.assertEqual([hit.candidate for hit in hits], [expected[3], expected[42]])
+        self.assertEqual(stats.candidates, 100)
+        self.assertGreaterEqual(stats.cpu_seconds, stats.hash_seconds)
+
+
+if __name__ == '__main__':
+    unittest.main()
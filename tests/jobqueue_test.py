@@ -0,0 +1,103 @@
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+import wordlists
+from jobqueue import DONE, FAILED, JobQueue, QueueFull
+from mutations import iter_mutations, prefixes, suffixes, base_words
+
+
+def wait(queue, job_id, timeout=60):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        status = queue.status(job_id)
+        if status['state'] not in ('queued', 'running'):
+            return status
+        time.sleep(0.05)
+    raise AssertionError(f"job {job_id} did not finish")
+
+
+class TestJobQueue(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.queue = JobQueue(self.directory, workers=1, max_pending=2)
+
+    def tearDown(self):
+        self.queue.shutdown()
+        shutil.rmtree(self.directory)
+
+    def test_runs_job_to_completion(self):
+        job_id = self.queue.submit(["alpha", "bravo"], depth=1, max_mutations=40)
+        status = wait(self.queue, job_id)
+        self.assertEqual(status['state'], DONE)
+        self.assertEqual(status['emitted'], 80)
+        self.assertEqual(status['inputs_done'], 2)
+        self.assertEqual(status['eta'], 0.0)
+        with open(self.queue.get(job_id).output_path, encoding='utf-8') as f:
+            lines = f.read().splitlines()
+        expected = list(iter_mutations("alpha", suffixes, prefixes, base_words, 1, 40))
+        self.assertEqual(lines[:40], expected)
+
+    def test_rejects_when_full(self):
+        ids = [self.queue.submit(["alpha"], depth=1, max_mutations=10) for _ in range(2)]
+        with self.assertRaises(QueueFull):
+            self.queue.submit(["alpha"], depth=1, max_mutations=10)
+        for job_id in ids:
+            wait(self.queue, job_id)
+        self.queue.submit(["alpha"], depth=1, max_mutations=10)
+
+    def test_shutdown_stops_running_jobs_at_a_checkpoint(self):
+        job_id = self.queue.submit(["alpha"], depth=2)
+        job = self.queue.get(job_id)
+        while job.checkpoint() is None:
+            time.sleep(0.05)
+        self.queue.shutdown(wait=False)
+        job.future.result(timeout=60)
+        status = wait(self.queue, job_id)
+        self.assertEqual(status['state'], FAILED)
+        self.assertIn("stopped", status['error'])
+        self.assertNotIn('done', job.checkpoint())
+
+    def test_workers_see_wordlist_changes(self):
+        data = os.path.join(self.directory, 'data')
+        os.makedirs(data)
+
+        def write(name, words, mtime=None):
+            path = os.path.join(data, name)
+            with open(path, 'w') as f:
+                f.write('\n'.join(words) + '\n')
+            if mtime is not None:
+                os.utime(path, ns=(mtime, mtime))
+
+        for name, words in (('prefix.txt', ['my']), ('suffix.txt', ['1']), ('base.txt', ['dragon'])):
+            write(name, words)
+        registry = wordlists.WordlistRegistry(
+            {'prefix': ('prefix.txt',), 'suffix': ('suffix.txt',), 'baseword': ('base.txt',)}, data_dir=data)
+        queue = JobQueue(os.path.join(self.directory, 'jobs'), workers=1,
+                         store_path=os.path.join(data, 'wordlists.bin'))
+        try:
+            with mock.patch.object(wordlists, 'registry', registry):
+                outputs = []
+                for suffix, mtime in (('1', None), ('2', 1_000_000_000)):
+                    write('suffix.txt', [suffix], mtime)
+                    job_id = queue.submit(["pass"], depth=1)
+                    self.assertEqual(wait(queue, job_id)['state'], DONE)
+                    with open(queue.get(job_id).output_path, encoding='utf-8') as f:
+                        outputs.append(f.read().splitlines())
+        finally:
+            queue.shutdown()
+        self.assertIn("pass1", outputs[0])
+        self.assertIn("pass2", outputs[1])
+        self.assertNotIn("pass1", outputs[1])
+
+    def test_unknown_job(self):
+        with self.assertRaises(KeyError):
+            self.queue.status("missing")
+
+
+if __name__ == '__main__':
+    unittest.main()
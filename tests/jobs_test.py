@@ -0,0 +1,125 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+import jobs
+from mutations import MutationRun, mutation_engine
+
+
+class CrashingRun(MutationRun):
+    """Raises after yielding a fixed number of candidates across all runs."""
+    budget = 0
+
+    def __iter__(self):
+        for candidate in super().__iter__():
+            if CrashingRun.budget == 0:
+                raise KeyboardInterrupt
+            CrashingRun.budget -= 1
+            yield candidate
+
+
+class TestMutationJob(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.passwords = ["pass", "word", "pass1"]
+        self.lists = dict(suffixes=["1", "12", "!"], prefixes=["my", "the"], base_words=["dragon", "love"])
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def job(self, name, **kwargs):
+        options = dict(depth=2, checkpoint_every=50, checkpoint_seconds=0, **self.lists)
+        options.update(kwargs)
+        return jobs.MutationJob(self.passwords, os.path.join(self.tmpdir.name, name), **options)
+
+    def read(self, job):
+        with open(job.output_path, encoding='utf-8') as f:
+            return f.read().splitlines()
+
+    def test_output_matches_engine(self):
+        job = self.job('out.txt')
+        stats = job.run()
+        lines = self.read(job)
+        expected = sum(len(mutation_engine(p, depth=2, **self.lists)) for p in self.passwords)
+        self.assertEqual(stats['emitted'], len(lines))
+        self.assertEqual(len(lines), expected)
+        self.assertGreater(stats['checkpoints'], 1)
+
+    def test_resume_after_crash_is_exact(self):
+        for dedupe in ('password', 'global'):
+            reference = self.job(f'ref-{dedupe}.txt', dedupe=dedupe)
+            reference.run()
+            expected = self.read(reference)
+
+            for crash_after in (1, 40, 333, len(expected) - 2):
+                name = f'crash-{dedupe}-{crash_after}.txt'
+                CrashingRun.budget = crash_after
+                with mock.patch.object(jobs, 'MutationRun', CrashingRun):
+                    with self.assertRaises(KeyboardInterrupt):
+                        self.job(name, dedupe=dedupe).run()
+                self.job(name, dedupe=dedupe).run()
+                self.assertEqual(self.read(self.job(name)), expected, (dedupe, crash_after))
+
+    def test_finished_job_is_not_rerun(self):
+        job = self.job('done.txt')
+        emitted = job.run()['emitted']
+        self.assertEqual(self.job('done.txt').run(), {'emitted': emitted, 'elapsed': 0.0,
+                                                      'checkpoints': 0, 'overhead': 0.0,
+                                                      'stopped': False})
+
+    def test_should_stop_leaves_a_resumable_checkpoint(self):
+        reference = self.job('ref.txt')
+        reference.run()
+        stopped = self.job('stop.txt', should_stop=lambda: True).run()
+        self.assertTrue(stopped['stopped'])
+        self.assertEqual(stopped['emitted'], 50)
+        resumed = self.job('stop.txt').run()
+        self.assertFalse(resumed['stopped'])
+        self.assertEqual(self.read(self.job('stop.txt')), self.read(reference))
+
+    def test_parameter_mismatch(self):
+        self.job('params.txt').run()
+        with self.assertRaises(ValueError):
+            self.job('params.txt', depth=1).run()
+
+    def test_resume_keeps_unusual_line_breaks(self):
+        self.passwords = ["pa\x0css", "wo\u2028rd", "x\x85y"]
+        reference = self.job('breaks-ref.txt')
+        reference.run()
+        with open(reference.output_path, 'rb') as f:
+            expected = f.read()
+        for crash_after in (5, 200, 700):
+            name = f'breaks-{crash_after}.txt'
+            CrashingRun.budget = crash_after
+            with mock.patch.object(jobs, 'MutationRun', CrashingRun):
+                with self.assertRaises(KeyboardInterrupt):
+                    self.job(name).run()
+            job = self.job(name)
+            job.run()
+            with open(job.output_path, 'rb') as f:
+                self.assertEqual(f.read(), expected, crash_after)
+
+    def test_missing_output_is_not_resumed(self):
+        CrashingRun.budget = 200
+        with mock.patch.object(jobs, 'MutationRun', CrashingRun):
+            with self.assertRaises(KeyboardInterrupt):
+                self.job('lost.txt').run()
+        job = self.job('lost.txt')
+        os.remove(job.output_path)
+        with self.assertRaises(ValueError):
+            job.run()
+        self.assertFalse(os.path.exists(job.output_path))
+
+    def test_checkpoint_is_small(self):
+        job = self.job('small.txt')
+        job.run()
+        with open(job.checkpoint_path) as f:
+            self.assertTrue(json.load(f)['done'])
+        self.assertLess(os.path.getsize(job.checkpoint_path), 512)
+
+
+if __name__ == '__main__':
+    unittest.main()
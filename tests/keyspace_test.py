@@ -0,0 +1,60 @@
+import unittest
+
+from keyspace import LeetKeyspace, mixed_radix_rank, mixed_radix_unrank, shard_range
+from mutations import iter_leetspeak
+
+
+class TestMixedRadix(unittest.TestCase):
+
+    def test_round_trip(self):
+        radices = [3, 1, 4, 2]
+        for index in range(24):
+            self.assertEqual(mixed_radix_rank(mixed_radix_unrank(index, radices), radices), index)
+
+    def test_out_of_range(self):
+        with self.assertRaises(IndexError):
+            mixed_radix_unrank(24, [3, 4, 2])
+
+
+class TestLeetKeyspace(unittest.TestCase):
+
+    def setUp(self):
+        self.space = LeetKeyspace("pass", prefixes=["my", "the"], suffixes=["1", "12"])
+        self.candidates = list(self.space)
+
+    def test_size_matches_enumeration(self):
+        self.assertEqual(len(self.candidates), len(self.space))
+
+    def test_leet_order_matches_iter_leetspeak(self):
+        space = LeetKeyspace("pass", case_modes=("none",))
+        self.assertEqual(list(space), list(iter_leetspeak("pass")))
+
+    def test_unrank(self):
+        for index in (0, 1, 777, len(self.space) - 1):
+            self.assertEqual(self.space.unrank(index), self.candidates[index])
+        with self.assertRaises(IndexError):
+            self.space.unrank(len(self.space))
+
+    def test_rank_inverts_unrank(self):
+        for index in range(0, len(self.space), 7):
+            rank = self.space.rank(self.candidates[index])
+            self.assertLessEqual(rank, index)
+            self.assertEqual(self.candidates[rank], self.candidates[index])
+
+    def test_rank_unknown_candidate(self):
+        with self.assertRaises(ValueError):
+            self.space.rank("notinhere")
+
+    def test_resume_from_offset(self):
+        self.assertEqual(list(self.space.iter_range(1000, 1100)), self.candidates[1000:1100])
+
+    def test_shards_partition_keyspace(self):
+        ranges = [self.space.shard(i, 7) for i in range(7)]
+        joined = [c for start, stop in ranges for c in self.space.iter_range(start, stop)]
+        self.assertEqual(joined, self.candidates)
+        with self.assertRaises(ValueError):
+            shard_range(10, 3, 3)
+
+
+if __name__ == '__main__':
+    unittest.main()
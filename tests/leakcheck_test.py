@@ -0,0 +1,105 @@
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import leakcheck
+
+
+class TestLeakIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.corpus = os.path.join(self.directory, 'corpus.txt')
+        self.words = [f"pass{i}" for i in range(5000)] + ["dragon", "p@ssw0rd", "pässwörd"]
+        with open(self.corpus, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(self.words + ["dragon", ""]) + '\r\n')
+        self.path = os.path.join(self.directory, 'corpus.lki')
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def check_index(self):
+        with leakcheck.LeakIndex(self.path) as index:
+            self.assertEqual(len(index), len(self.words))
+            self.assertIn("pässwörd", index)
+            self.assertNotIn("pass5000", index)
+            queries = ["nope", "dragon", "pass42", "also-nope", "p@ssw0rd"]
+            self.assertEqual(index.contains_many(queries), [False, True, True, False, True])
+            self.assertEqual(list(index.check(iter(queries), batch_size=2)), ["dragon", "pass42", "p@ssw0rd"])
+
+    def test_build_and_check(self):
+        leakcheck.build_index(self.corpus, self.path)
+        self.check_index()
+
+    def test_spilled_runs_merge_to_same_index(self):
+        keys_start = len(leakcheck.MAGIC) + 8 + leakcheck.HEADER_SLOT
+        leakcheck.build_index(self.corpus, self.path)
+        with open(self.path, 'rb') as f:
+            in_memory = f.read()[keys_start:]
+        # A duplicate inside the first run leaves it one key short of run_items.
+        with open(self.corpus, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(["pass0"] + self.words) + '\n')
+        leakcheck.build_index(self.corpus, self.path, run_items=1000)
+        with open(self.path, 'rb') as f:
+            self.assertEqual(f.read()[keys_start:], in_memory)
+        self.assertEqual([name for name in os.listdir(self.directory) if name.endswith('.run')], [])
+
+    def test_bytes_and_escaped_queries(self):
+        with open(self.corpus, 'ab') as f:
+            f.write(b"caf\xe9\n")
+        self.words.append("caf\udce9")
+        leakcheck.build_index(self.corpus, self.path)
+        self.check_index()
+        with leakcheck.LeakIndex(self.path) as index:
+            self.assertEqual(index.contains_many([b"caf\xe9", "caf\udce9", "café", b"dragon"]),
+                             [True, True, False, True])
+            self.assertEqual(index.contains_many(["drag\non", "dragon"]), [False, True])
+            self.assertEqual(index.contains_many([]), [])
+
+    def test_numpy_and_python_fingerprints_agree(self):
+        if leakcheck.np is None:
+            self.skipTest("numpy is not installed")
+        raw_words = [b"", b"a", b"a\0", b"dragon", b"12345678", b"123456789", "pässwörd".encode()]
+        raw_words += [b"x" * n for n in (63, 64, 65, 200, 257, 1000, 5000)]
+        expected = [leakcheck._fingerprint(raw) for raw in raw_words]
+        self.assertEqual(leakcheck._np_fingerprints(raw_words).tolist(), expected)
+        self.assertEqual(len(set(expected)), len(raw_words))
+
+    def test_older_format_is_rejected(self):
+        leakcheck.build_index(self.corpus, self.path)
+        with open(self.path, 'r+b') as f:
+            header_start = len(leakcheck.MAGIC) + 8
+            f.seek(header_start)
+            header = f.read(leakcheck.HEADER_SLOT).replace(b'"format": 2', b'"format": 1')
+            f.seek(header_start)
+            f.write(header)
+        with self.assertRaises(ValueError):
+            leakcheck.LeakIndex(self.path)
+        self.assertTrue(leakcheck.is_stale(self.path, [self.corpus]))
+
+    def test_bisect_fallback(self):
+        leakcheck.build_index(self.corpus, self.path)
+        with mock.patch.object(leakcheck, 'np', None):
+            self.check_index()
+
+    def test_open_index_rebuilds_when_stale(self):
+        self.assertTrue(leakcheck.is_stale(self.path, [self.corpus]))
+        leakcheck.open_index(self.path, [self.corpus]).close()
+        self.assertFalse(leakcheck.is_stale(self.path, [self.corpus]))
+        with open(self.corpus, 'a', encoding='utf-8') as f:
+            f.write("newleak\n")
+        with leakcheck.open_index(self.path, [self.corpus]) as index:
+            self.assertIn("newleak", index)
+
+    def test_parallel_check(self):
+        leakcheck.build_index(self.corpus, self.path)
+        queries = [f"pass{i}" for i in range(0, 10000, 7)]
+        expected = [q for q in queries if int(q[4:]) < 5000]
+        self.assertEqual(list(leakcheck.iter_check_parallel(queries, self.path, workers=2, batch_size=100)),
+                         expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,107 @@
+import os
+import unittest
+from itertools import product
+from unittest import mock
+
+import mask as mask_module
+from mask import HybridKeyspace, Mask, iter_hybrid, parse_mask
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestParseMask(unittest.TestCase):
+
+    def test_builtin_and_literal(self):
+        self.assertEqual(parse_mask('?d-??x'), ['0123456789', '-', '?', 'x'])
+        self.assertEqual(len(parse_mask('?a')[0]), 95)
+        self.assertEqual(len(parse_mask('?s')[0]), 33)
+
+    def test_custom_charsets(self):
+        positions = parse_mask('?1?2', {'1': '?u?d', '2': 'aab'})
+        self.assertEqual(positions, [mask_module.CHARSETS['u'] + '0123456789', 'ab'])
+        self.assertEqual(parse_mask('?1', ['xy']), ['xy'])
+
+    def test_errors(self):
+        for mask, custom in (('', None), ('?x', None), ('?1', None), ('ab?', None), ('?1', {'5': 'a'})):
+            with self.subTest(mask=mask, custom=custom), self.assertRaises(ValueError):
+                parse_mask(mask, custom)
+
+
+class TestMask(unittest.TestCase):
+
+    def setUp(self):
+        self.mask = Mask('?u?1?d', ['ab'])
+        self.candidates = [''.join(chars) for chars in product(*self.mask.positions)]
+
+    def test_size_and_order(self):
+        self.assertEqual(len(self.mask), 26 * 2 * 10)
+        self.assertEqual(list(self.mask), self.candidates)
+
+    def test_matches_zipcodes(self):
+        with open(os.path.join(ROOT, 'data', 'zipcodes.txt')) as f:
+            zipcodes = f.read().split()
+        self.assertEqual(list(Mask('?d?d?d?d?d')), zipcodes)
+
+    def test_unrank_and_rank(self):
+        for index in (0, 1, 259, len(self.mask) - 1):
+            self.assertEqual(self.mask[index], self.candidates[index])
+            self.assertEqual(self.mask.rank(self.candidates[index]), index)
+        self.assertEqual(self.mask[-1], self.candidates[-1])
+        with self.assertRaises(IndexError):
+            self.mask.unrank(len(self.mask))
+        for candidate in ('Ac1', 'aa1', 'Aa12'):
+            with self.assertRaises(ValueError):
+                self.mask.rank(candidate)
+        self.assertIn('Zb9', self.mask)
+        self.assertNotIn('zb9', self.mask)
+
+    def test_index_honours_range(self):
+        candidate = self.candidates[259]
+        self.assertEqual(self.mask.index(candidate, 259, 260), 259)
+        self.assertEqual(self.mask.index(candidate, -len(self.mask)), 259)
+        for start, stop in ((260, None), (0, 259), (-5, None)):
+            with self.assertRaises(ValueError):
+                self.mask.index(candidate, start, stop)
+
+    def test_ranges_across_small_tails(self):
+        with mock.patch.object(mask_module, 'TAIL_SIZE', 16):
+            small = Mask('?u?1?d', ['ab'])
+        self.assertEqual(small.tail_size, 10)
+        for start, stop in ((0, None), (7, 13), (15, 251), (519, 520), (300, 300),
+                            (-10, None), (-30, -5), (-10_000, 3), (500, 10_000)):
+            with self.subTest(start=start, stop=stop):
+                self.assertEqual(list(small.iter_range(start, stop)), self.candidates[start:stop])
+        self.assertEqual(small[5:25], self.candidates[5:25])
+
+    def test_shards_partition_keyspace(self):
+        ranges = [self.mask.shard(i, 7) for i in range(7)]
+        self.assertEqual([c for start, stop in ranges for c in self.mask.iter_range(start, stop)],
+                         self.candidates)
+
+
+class TestHybrid(unittest.TestCase):
+
+    def test_iter_hybrid(self):
+        chunks = list(iter_hybrid(iter(['pass', 'word']), '?d?d'))
+        self.assertEqual([c for chunk in chunks for c in chunk],
+                         [f"{w}{i:02d}" for w in ('pass', 'word') for i in range(100)])
+        prepended = [c for chunk in iter_hybrid(['x'], '?d', prepend=True) for c in chunk]
+        self.assertEqual(prepended, [f"{i}x" for i in range(10)])
+
+    def test_keyspace(self):
+        words = ['a', 'bb', 'ccc']
+        for prepend in (False, True):
+            space = HybridKeyspace(words, Mask('?d?l'), prepend=prepend)
+            expected = [c for chunk in iter_hybrid(words, '?d?l', prepend=prepend) for c in chunk]
+            with self.subTest(prepend=prepend):
+                self.assertEqual(len(space), len(expected))
+                self.assertEqual(list(space), expected)
+                self.assertEqual(space.unrank(300), expected[300])
+                self.assertEqual(list(space.iter_range(250, 530)), expected[250:530])
+                self.assertEqual(list(space.iter_range(-70, -20)), expected[-70:-20])
+                ranges = [space.shard(i, 4) for i in range(4)]
+                self.assertEqual([c for start, stop in ranges for c in space.iter_range(start, stop)], expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,15 +1,5 @@
 import unittest
-import time
-import os
-import wordlists
-from mutations import (
-    mutation_engine, prefixes, suffixes, base_words,
-    leetspeak_mutations, prefix_mutations,
-    suffix_mutations, capitalization_mutations,
-    base_words_mutation
-)
-with open("mutation_performance_log.txt", "w") as f:
-    f.write("=== Mutation Performance Log ===\n")
+from mutations import mutation_engine, iter_mutations, prefixes, suffixes, base_words
 
 
 class TestMutationEngineCorrectness(unittest.TestCase):
@@ -33,65 +23,36 @@ class TestMutationEngineCorrectness(unittest.TestCase):
         self.assertIn("", mutations)
         self.assertTrue(len(mutations) > 1)  # Should still generate something
 
-class TestMutationPerformance(unittest.TestCase):
+class TestIterMutations(unittest.TestCase):
 
     def setUp(self):
-        wordlists_dict = wordlists.load_all_wordlists()
-        self.test_password = "password123"
-        self.prefixes = list(set(wordlists_dict['prefix']))
-        self.suffixes = list(set(wordlists_dict['suffix']))
-        self.base_words = list(set(wordlists_dict['baseword']))
-        self.limits = [100, 500, 1000, 2500, 5000, 10000]
-        self.logfile = "mutation_performance_log.txt"
-
-    def time_test(self, func, *args, **kwargs):
-        max_mutations = kwargs.get("max_mutations", None)
-        start = time.time()
-        results = func(*args, **kwargs)
-        elapsed = time.time() - start
-        count = len(results) if hasattr(results, '__len__') else 'unknown'
-
-        log_line = (
-            f"{func.__name__} with max_mutations={max_mutations} "
-            f"took {elapsed:.4f}s, produced {count} results"
-        )
-
-        print(f"\n=== {func.__name__} ===")
-        print(log_line)
-
-        # Optional: log to file
-        with open(self.logfile, "a") as f:
-            f.write(log_line + "\n")
-        return results
-
-
-    def test_leetspeak_performance(self):
-        for limit in self.limits:
-            self.time_test(leetspeak_mutations, self.test_password, max_mutations=limit)
-
-    def test_prefix_performance(self):
-        self.time_test(prefix_mutations, self.test_password, self.prefixes)
-
-    def test_suffix_performance(self):
-        self.time_test(suffix_mutations, self.test_password, self.suffixes)
+        self.prefixes = ["my", "the"]
+        self.suffixes = ["1", "123", "!"]
+        self.base_words = ["dragon"]
+
+    def test_matches_mutation_engine(self):
+        for depth in (0, 1, 2):
+            streamed = list(iter_mutations("pass", self.suffixes, self.prefixes, self.base_words, depth=depth))
+            self.assertEqual(len(streamed), len(set(streamed)))
+            self.assertEqual(
+                set(streamed),
+                mutation_engine("pass", self.suffixes, self.prefixes, self.base_words, depth=depth)
+            )
 
-    def test_capitalization_performance(self):
-        self.time_test(capitalization_mutations, self.test_password)
+    def test_yields_original_first(self):
+        gen = iter_mutations("pass", self.suffixes, self.prefixes, self.base_words)
+        self.assertEqual(next(gen), "pass")
 
-    def test_base_words_performance(self):
-        self.time_test(base_words_mutation, self.test_password, self.base_words)
+    def test_respects_max_mutations(self):
+        streamed = list(iter_mutations("pass", self.suffixes, self.prefixes, self.base_words, depth=2, max_mutations=50))
+        self.assertEqual(len(streamed), 50)
 
-    def test_mutation_engine_performance(self):
-        for limit in self.limits:
-            self.time_test(
-                mutation_engine,
-                self.test_password,
-                self.suffixes,
-                self.prefixes,
-                self.base_words,
-                depth=1,
-                max_mutations=limit
-            )
+    def test_shared_seen_dedupes_across_calls(self):
+        seen = set()
+        first = list(iter_mutations("pass", self.suffixes, self.prefixes, self.base_words, depth=1, seen=seen))
+        second = list(iter_mutations("pass", self.suffixes, self.prefixes, self.base_words, depth=1, seen=seen))
+        self.assertTrue(first)
+        self.assertEqual(second, [])
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)
\ No newline at end of file
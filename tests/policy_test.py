@@ -0,0 +1,109 @@
+import pickle
+import unittest
+
+from mutations import (
+    base_words_mutation, capitalization_mutations, iter_leetspeak, iter_mutations, leetspeak_mutations,
+    mutation_engine, suffix_mutations,
+)
+from policy import DIGIT, LOWER, SYMBOL, UPPER, PasswordPolicy, classes
+
+
+class TestPasswordPolicy(unittest.TestCase):
+
+    def test_classes(self):
+        self.assertEqual(classes("aB3!"), LOWER | UPPER | DIGIT | SYMBOL)
+        self.assertEqual(classes("pässwort"), LOWER | SYMBOL)
+        self.assertEqual(classes(""), 0)
+
+    def test_allows(self):
+        policy = PasswordPolicy(8, 12, ['digit', 'upper', 'symbol'])
+        self.assertTrue(policy.allows("Dragon12!"))
+        self.assertFalse(policy.allows("dragon12!"))
+        self.assertFalse(policy.allows("Dr4g!"))
+        self.assertFalse(policy.allows("Dragon12!Dragon12!"))
+
+    def test_rejects_bad_arguments(self):
+        with self.assertRaises(ValueError):
+            PasswordPolicy(require=['emoji'])
+        with self.assertRaises(ValueError):
+            PasswordPolicy(10, 8)
+
+    def test_viable_allows_title_case_to_shorten(self):
+        policy = PasswordPolicy(0, 8)
+        self.assertTrue(policy.viable("pass!!!!!!!!word", 1))
+        self.assertFalse(policy.viable("pass!!!!!!!!word", 0))
+        self.assertFalse(policy.viable("longpassword!", 1))
+
+    def test_pickles_without_caches(self):
+        policy = PasswordPolicy(4, 8, ['digit'])
+        policy.fitting("abc", ["1", "22", "x"])
+        copy = pickle.loads(pickle.dumps(policy))
+        self.assertEqual(copy.fitting("abc", ["1", "22", "x"]), ["1", "22"])
+
+
+class TestStrategies(unittest.TestCase):
+
+    def test_affix_strategies_only_build_allowed(self):
+        policy = PasswordPolicy(6, 8, ['digit'])
+        suffixes = ["1", "12", "123456", "!", "x9"]
+        self.assertEqual(suffix_mutations("pass", suffixes, policy=policy), {"pass12", "passx9"})
+        self.assertEqual(policy.skipped, 3)
+        self.assertEqual(base_words_mutation("ab", ["dog1", "dragon12", "cat"], policy=policy),
+                         {"dog1ab", "abdog1", "dragon12"})
+
+    def test_capitalization_filters(self):
+        policy = PasswordPolicy(require=['upper'])
+        self.assertEqual(capitalization_mutations("dragon", policy),
+                         {m for m in capitalization_mutations("dragon") if m != "dragon"})
+        self.assertEqual(policy.rejected, 1)
+
+    def test_leetspeak_prunes_branches(self):
+        for policy in (PasswordPolicy(6, 6, ['digit', 'symbol']), PasswordPolicy(0, 7), PasswordPolicy(8)):
+            expected = [m for m in iter_leetspeak("dragon") if policy.allows(m)]
+            self.assertEqual(list(iter_leetspeak("dragon", policy)), expected)
+            self.assertEqual(leetspeak_mutations("dragon", policy=policy), set(expected))
+        # Every leaf of a cut branch is counted as skipped, never built.
+        policy = PasswordPolicy(6, 6, ['digit', 'symbol'])
+        kept = list(iter_leetspeak("dragon", policy))
+        self.assertEqual(policy.skipped + policy.rejected + len(kept), len(list(iter_leetspeak("dragon"))))
+
+
+class TestEnginePruning(unittest.TestCase):
+    lists = (["1", "!", "2019", "9$", "Ab"], ["my", "#", "X"], ["dog", "Sun!", "ab12cd34ef"])
+
+    def test_same_as_filtering_afterwards(self):
+        policies = [
+            PasswordPolicy(8, 12, ['digit', 'upper', 'symbol']),
+            PasswordPolicy(6, 8),
+            PasswordPolicy(require=['digit']),
+            PasswordPolicy(10, require=['upper', 'symbol']),
+            PasswordPolicy(4, 6, ['lower', 'digit']),
+        ]
+        for password in ("pass", "Fo0", "x_y"):
+            for depth in (0, 1, 2):
+                full = mutation_engine(password, *self.lists, depth=depth)
+                for policy in policies:
+                    with self.subTest(password=password, depth=depth, policy=policy):
+                        got = list(iter_mutations(password, *self.lists, depth=depth, policy=policy))
+                        self.assertEqual(len(got), len(set(got)))
+                        self.assertEqual(set(got), {m for m in full if policy.allows(m)})
+
+    def test_reports_avoided_work(self):
+        policy = PasswordPolicy(8, 10, ['digit', 'upper'])
+        emitted = mutation_engine("pass", *self.lists, depth=2, policy=policy)
+        self.assertTrue(emitted)
+        report = policy.report()
+        self.assertGreater(report['skipped'], len(emitted))
+        self.assertGreater(report['withheld'], 0)
+        policy.reset()
+        self.assertEqual(policy.report(), {'skipped': 0, 'rejected': 0, 'withheld': 0})
+
+    def test_max_mutations_counts_emitted(self):
+        policy = PasswordPolicy(require=['digit'])
+        got = list(iter_mutations("pass", *self.lists, depth=2, max_mutations=25, policy=policy))
+        self.assertEqual(len(got), 25)
+        self.assertTrue(all(policy.allows(m) for m in got))
+
+
+if __name__ == '__main__':
+    unittest.main()
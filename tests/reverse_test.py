@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+from itertools import product
+
+from mutations import iter_leetspeak
+from reverse import Match, ReverseIndex, inverse_leet_map
+from trie import CompactTrie
+
+
+class TestReverseIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = ReverseIndex(["password", "dragon", "phoenix", "Twilight"],
+                                  prefixes=["my", "the"], suffixes=["2019", "123", "!"])
+
+    def test_inverse_leet_map(self):
+        inverse = inverse_leet_map()
+        self.assertEqual(inverse["@"], "a")
+        self.assertEqual(inverse["1"], "il")
+        self.assertEqual(inverse["ph"], "f")
+
+    def test_strips_leet_case_and_affixes(self):
+        self.assertEqual(self.index.match("P@55w0rd2019"),
+                         Match("password", "", "2019", 0, 8))
+        self.assertEqual(self.index.match("MyDr4g0n123!"),
+                         Match("dragon", "My", "123!", 2, 8))
+        self.assertEqual(self.index.match("tw1l1ght").base, "twilight")
+
+    def test_multi_character_tokens(self):
+        self.assertEqual(self.index.match("|*#03n1%").base, "phoenix")
+
+    def test_rejects_unknown_affixes_and_words(self):
+        self.assertIsNone(self.index.match("password2020"))
+        self.assertIsNone(self.index.match("xpassword"))
+        self.assertNotIn("dr4gonfly", self.index)
+
+    def test_max_affixes(self):
+        self.assertIn("mythepassword", self.index)
+        strict = ReverseIndex(["password"], prefixes=["my", "the"], max_affixes=1)
+        self.assertNotIn("mythepassword", strict)
+
+    def test_finds_forward_leet_and_affix_mutations(self):
+        suffixes, prefixes = ["2019", "123"], ["my"]
+        index = ReverseIndex(["dragon"], prefixes, suffixes, max_affixes=1)
+        for leet in iter_leetspeak("dragon"):
+            for candidate in (leet, leet.upper(), "my" + leet, leet + "2019", "MY" + leet + "123"):
+                self.assertEqual(index.match(candidate).base, "dragon", candidate)
+
+    def test_words_sharing_a_suffix(self):
+        index = ReverseIndex(["bold", "gold", "cold"])
+        self.assertEqual(sorted(m.base for m in index.matches("60ld")), ["bold", "gold"])
+
+    def test_every_reading_of_ambiguous_tokens(self):
+        words = [''.join(letters) for letters in product("il", repeat=8)]
+        index = ReverseIndex(words, prefixes=["1"], max_affixes=1)
+        self.assertEqual({m.base for m in index.matches("1" * 8)}, set(words))
+        self.assertEqual(len({m.base for m in index.matches("1" * 9)}), 256)
+
+    def test_loads_saved_trie(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, 'base.dawg')
+            self.index.save(path)
+            loaded = ReverseIndex(CompactTrie.load(path), suffixes=["2019"])
+            self.assertEqual(loaded.match("P@55w0rd2019").base, "password")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+
+from mutations import mutation_engine
+from rules import ENGINE_RULES, RuleSet, apply_rules, compile_rule, parse_rule
+
+
+class TestRuleOps(unittest.TestCase):
+
+    def run_rule(self, rule, word="Pass", **lists):
+        return list(compile_rule(rule, lists)(word))
+
+    def test_simple_ops(self):
+        self.assertEqual(self.run_rule(":"), ["Pass"])
+        self.assertEqual(self.run_rule("l"), ["pass"])
+        self.assertEqual(self.run_rule("u"), ["PASS"])
+        self.assertEqual(self.run_rule("C"), ["pASS"])
+        self.assertEqual(self.run_rule("t"), ["pASS"])
+        self.assertEqual(self.run_rule("r"), ["ssaP"])
+        self.assertEqual(self.run_rule("d"), ["PassPass"])
+        self.assertEqual(self.run_rule("l $1 $!"), ["pass1!"])
+        self.assertEqual(self.run_rule("^x"), ["xPass"])
+        self.assertEqual(self.run_rule("ss$"), ["Pa$$"])
+        self.assertEqual(self.run_rule("@s"), ["Pa"])
+
+    def test_list_expansions(self):
+        self.assertEqual(self.run_rule("A[suffix]", suffix=["1", "2"]), ["Pass1", "Pass2"])
+        self.assertEqual(self.run_rule("lP[prefix]u", prefix=["my"]), ["MYPASS"])
+        self.assertEqual(self.run_rule("B[base]", base=["x"]), ["x", "xPass", "Passx"])
+
+    def test_chained_expansions(self):
+        out = self.run_rule("WA[suffix]", word="ab", suffix=["1", "2"])
+        self.assertEqual(len(out), 2 * len(list(compile_rule("W")("ab"))))
+
+    def test_parse_errors(self):
+        for rule in ("$", "s1", "A", "A[suffix", "Y"):
+            with self.assertRaises(ValueError):
+                parse_rule(rule)
+        with self.assertRaises(ValueError):
+            compile_rule("A[missing]", {})
+
+
+class TestRuleSet(unittest.TestCase):
+
+    def test_comments_and_blank_lines(self):
+        ruleset = RuleSet(["# comment", "", "l", "u"])
+        self.assertEqual(len(ruleset), 2)
+        self.assertEqual(list(ruleset("Ab")), ["ab", "AB"])
+
+    def test_engine_rules_match_one_layer(self):
+        lists = {"suffix": ["1", "12", "!"], "prefix": ["my"], "baseword": ["dragon"]}
+        ruleset = RuleSet(ENGINE_RULES, lists)
+        for word in ("pass", "Dragon"):
+            self.assertEqual(
+                set(apply_rules([word], ruleset)),
+                mutation_engine(word, lists["suffix"], lists["prefix"], lists["baseword"], depth=1)
+            )
+
+    def test_apply_rules_dedupes_and_caps(self):
+        ruleset = RuleSet([":", "l"])
+        self.assertEqual(list(apply_rules(["a", "A", "a"], ruleset)), ["a", "A"])
+        self.assertEqual(len(list(apply_rules(["a", "b", "c"], ruleset, max_mutations=2))), 2)
+
+    def test_apply_rules_without_dedupe(self):
+        ruleset = RuleSet([":", "l"])
+        self.assertEqual(list(apply_rules(["a", "A"], ruleset, dedupe=False)), ["a", "a", "A", "a"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,90 @@
+import math
+import unittest
+
+import numpy as np
+
+import scoring
+from scoring import Scorer, encode, filter_candidates, iter_scores, strength
+
+
+class TestScorer(unittest.TestCase):
+
+    def setUp(self):
+        self.scorer = Scorer(['dragon', 'password', 'lily', 'monkey'])
+
+    def score(self, *candidates):
+        return self.scorer.score(list(candidates))
+
+    def test_encode(self):
+        codes, lengths = encode(['ab', '', 'é€x'])
+        self.assertEqual(codes.shape, (3, 3))
+        self.assertEqual(codes[:, 2].tolist(), [ord('é'), ord('€'), ord('x')])
+        self.assertEqual(lengths.tolist(), [2, 0, 3])
+
+    def test_charset_bits(self):
+        scores = self.score('abcdefgh', 'aB3$', '')
+        self.assertAlmostEqual(scores.charset_bits[0], 8 * math.log2(26))
+        self.assertAlmostEqual(scores.charset_bits[1], 4 * math.log2(95))
+        self.assertEqual(scores.charset_bits[2], 0)
+        self.assertEqual(scores.bits[2], 0)
+
+    def test_base_words_with_leet_and_case(self):
+        scores = self.score('Dr@gon', 'm0nk3y', '1i1y', 'xdragonx')
+        self.assertEqual(scores.baseword.tolist(), [6, 6, 4, 6])
+        self.assertEqual(scores.leet.tolist(), [1, 2, 2, 0])
+        word_bits = math.log2(4)
+        self.assertAlmostEqual(scores.bits[0], word_bits + 2)  # one leet, one upper-case
+        self.assertAlmostEqual(scores.bits[3], word_bits + 2 * math.log2(26))
+
+    def test_longest_word_wins(self):
+        scorer = Scorer(['pass', 'word', 'password'])
+        self.assertAlmostEqual(scorer.score(['password']).bits[0], math.log2(3))
+
+    def test_dates_and_walks(self):
+        scores = self.score('x1987', '12031990', '19871231', 'qwerty', 'zxcvb', 'qwer1990')
+        self.assertEqual(scores.date.tolist(), [4, 8, 8, 0, 0, 4])
+        self.assertEqual(scores.walk.tolist(), [0, 0, 0, 6, 5, 4])
+        self.assertAlmostEqual(scores.bits[3], scoring.WALK_START_BITS + 5 * scoring.WALK_BITS)
+        self.assertEqual(self.score('1357', '123').date.tolist(), [0, 0])
+
+    def test_bits_bounded_by_charset_entropy(self):
+        scores = self.score('x7#Kq!v2', 'Dr@gon1987', 'aaaa')
+        self.assertTrue((scores.bits <= scores.charset_bits).all())
+        self.assertEqual(scores.bits[0], scores.charset_bits[0])
+        self.assertLess(scores.bits[1], 20)
+
+    def test_long_and_mixed_length_batches(self):
+        candidates = ['dragon', 'x' * 70 + 'dragon', 'dragon1987'] * 50
+        mixed = self.scorer.score(candidates)
+        for i in range(3):
+            single = self.scorer.score([candidates[i]])
+            self.assertAlmostEqual(mixed.bits[i], single.bits[0])
+        self.assertEqual(mixed.baseword[1], 6)
+
+    def test_charset_only(self):
+        scores = self.scorer.score(['dragon'], patterns=False)
+        self.assertEqual(scores.bits[0], scores.charset_bits[0])
+        self.assertEqual(scores.baseword[0], 0)
+
+    def test_strength(self):
+        self.assertEqual(strength(np.array([0, 30, 50, 100, 200])).tolist(), [0, 1, 2, 3, 4])
+
+
+class TestStreaming(unittest.TestCase):
+
+    def test_filter_keeps_order(self):
+        scorer = Scorer(['dragon'])
+        candidates = (c for c in ['dragon', 'x7#Kq!v2', 'Dragon!', 'Zq9$mw2@Lp'] * 3)
+        chunks = list(filter_candidates(candidates, min_bits=30, scorer=scorer, chunk_size=5))
+        self.assertEqual([c for chunk in chunks for c in chunk], ['x7#Kq!v2', 'Zq9$mw2@Lp'] * 3)
+        weak = [c for chunk in filter_candidates(['dragon', 'x7#Kq!v2'], max_bits=10, scorer=scorer) for c in chunk]
+        self.assertEqual(weak, ['dragon'])
+
+    def test_iter_scores_charset_only(self):
+        (chunk, scores), = iter_scores(iter(['abc', 'ABC1']), patterns=False)
+        self.assertEqual(chunk, ['abc', 'ABC1'])
+        self.assertAlmostEqual(scores.bits[1], 4 * math.log2(36))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+
+from mutations import MutationRun, iter_mutations
+from stats import EngineStats
+
+
+class TestEngineStats(unittest.TestCase):
+
+    def setUp(self):
+        self.args = ("pass", ["1", "123", "!"], ["my", "the"], ["dragon"])
+
+    def test_same_output_with_stats(self):
+        stats = EngineStats()
+        self.assertEqual(list(iter_mutations(*self.args, depth=2, stats=stats)),
+                         list(iter_mutations(*self.args, depth=2)))
+
+    def test_counts_match_output(self):
+        stats = EngineStats()
+        candidates = list(iter_mutations(*self.args, depth=2, stats=stats))
+        report = stats.report()
+        # The original password is yielded before any strategy runs.
+        self.assertEqual(report['produced'], len(candidates) - 1)
+        self.assertEqual([layer['layer'] for layer in report['layers']], [0, 1, 2])
+        self.assertEqual(report['layers'][0]['frontier'], 1)
+        layer_one = report['layers'][1]
+        self.assertEqual(layer_one['frontier'], 1 + report['layers'][0]['strategies']['leetspeak']['produced'])
+        self.assertEqual(set(layer_one['strategies']),
+                         {'capitalization', 'suffix', 'prefix', 'base_words'})
+        self.assertGreater(report['duplicates'], 0)
+        self.assertGreaterEqual(report['seconds'], 0.0)
+
+    def test_duplicates_counted(self):
+        stats = EngineStats()
+        list(iter_mutations("aa", ["1", "1"], [], [], depth=1, stats=stats))
+        suffix = stats.report()['layers'][1]['strategies']['suffix']
+        self.assertEqual(suffix['duplicates'], suffix['produced'])
+
+    def test_callbacks(self):
+        layers, segments = [], []
+        stats = EngineStats(on_layer=lambda *args: layers.append(args),
+                            on_strategy=lambda *args: segments.append(args))
+        list(iter_mutations(*self.args, depth=1, stats=stats))
+        self.assertEqual([layer for layer, _ in layers], [0, 1])
+        self.assertEqual(sum(segment[2] for segment in segments), stats.report()['produced'])
+
+    def test_segment_recorded_when_capped_or_closed(self):
+        stats = EngineStats()
+        run = MutationRun(*self.args, depth=2, max_mutations=10, stats=stats)
+        self.assertEqual(len(list(run)), 10)
+        self.assertEqual(stats.report()['produced'], 9)
+
+        stats = EngineStats()
+        gen = iter_mutations(*self.args, depth=2, stats=stats)
+        for _ in range(5):
+            next(gen)
+        gen.close()
+        self.assertEqual(stats.report()['produced'], 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,34 @@
+import unittest
+
+from benchmarks.suite import Benchmark, compare, measure
+
+
+def document(items_per_sec, peak_memory):
+    return {'results': {'engine': {'items_per_sec': items_per_sec, 'peak_memory': peak_memory}}}
+
+
+class TestBenchmarkSuite(unittest.TestCase):
+
+    def test_measure_reports_throughput_and_memory(self):
+        calls = []
+        bench = Benchmark('list', lambda n: calls.append(n) or len(list(range(n))), lambda: 10_000)
+        result = measure(bench, repeat=3, warmup=2)
+        self.assertEqual(len(calls), 2 + 3 + 1)
+        self.assertEqual(result['items'], 10_000)
+        self.assertEqual(len(result['times']), 3)
+        self.assertGreater(result['items_per_sec'], 0)
+        self.assertGreater(result['peak_memory'], 0)
+
+    def test_compare_flags_regressions_beyond_threshold(self):
+        baseline = document(1000.0, 1000)
+        rows = compare(baseline, document(950.0, 1050), threshold=0.10)
+        self.assertFalse(any(row[-1] for row in rows))
+        rows = compare(baseline, document(800.0, 1300), threshold=0.10)
+        self.assertEqual([row[1] for row in rows if row[-1]], ['items/s', 'peak memory'])
+
+    def test_compare_ignores_new_benchmarks(self):
+        self.assertEqual(compare({'results': {}}, document(1.0, 1)), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
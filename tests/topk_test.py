@@ -0,0 +1,79 @@
+import math
+import unittest
+from unittest import mock
+
+import wordlists
+from mutations import mutation_engine
+from topk import CandidateModel, best_first_product, default_model, iter_top_candidates
+
+
+class TestBestFirstProduct(unittest.TestCase):
+
+    def test_complete_and_ordered(self):
+        options = [[(math.log(0.7), 'a'), (math.log(0.3), 'b')],
+                   [(math.log(0.5), 'x'), (math.log(0.4), 'y'), (math.log(0.1), 'z')]]
+        out = list(best_first_product(options))
+        self.assertEqual(sorted(s for _, s in out), sorted(a + b for a in 'ab' for b in 'xyz'))
+        scores = [lp for lp, _ in out]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+        self.assertEqual(out[0][1], 'ax')
+
+
+class TestTopCandidates(unittest.TestCase):
+
+    def setUp(self):
+        self.lists = dict(suffixes=["1", "12", "!"], prefixes=["my"], base_words=["dragon"])
+
+    def test_same_space_as_engine(self):
+        out = set(iter_top_candidates("pass", depth=2, **self.lists))
+        self.assertEqual(out, mutation_engine("pass", depth=2, **self.lists))
+
+    def test_non_increasing_probability(self):
+        scores = [lp for _, lp in iter_top_candidates("pass", depth=2, scores=True, **self.lists)]
+        self.assertEqual(scores, sorted(scores, reverse=True))
+
+    def test_cap_keeps_most_likely(self):
+        full = list(iter_top_candidates("pass", depth=2, scores=True, **self.lists))
+        top = list(iter_top_candidates("pass", depth=2, max_mutations=20, scores=True, **self.lists))
+        self.assertEqual(len(top), 20)
+        self.assertGreaterEqual(min(lp for _, lp in top), full[20][1])
+
+    def test_weights_change_order(self):
+        model = CandidateModel(entry_weights={'suffix': {'!': 0.9}})
+        out = list(iter_top_candidates("pass", depth=1, model=model, **self.lists))
+        self.assertLess(out.index("pass!"), out.index("pass1"))
+
+    def test_leet_rate_endpoints(self):
+        never = list(iter_top_candidates("pass", depth=0, model=CandidateModel(leet_rate=0), **self.lists))
+        self.assertEqual(never, ["pass"])
+        always = list(iter_top_candidates("pass", depth=0, model=CandidateModel(leet_rate=1), **self.lists))
+        self.assertEqual(len(always), 2 ** 4)
+        self.assertTrue(all(not set(c) & set("pas") for c in always))
+        with self.assertRaises(ValueError):
+            CandidateModel(leet_rate=1.5)
+
+    def test_default_model_reuses_rankings(self):
+        list(iter_top_candidates("pass", depth=1, **self.lists))
+        model = default_model()
+        with mock.patch.object(CandidateModel, '_rank', side_effect=AssertionError("re-ranked")):
+            list(iter_top_candidates("word", depth=1, **self.lists))
+        self.assertIs(default_model(), model)
+        with mock.patch.object(wordlists.registry, 'version', return_value='changed'):
+            self.assertIsNot(default_model(), model)
+
+
+class TestLearn(unittest.TestCase):
+
+    def test_frequent_entries_weigh_more(self):
+        corpus = ["dragon123", "monkey123", "Shadow123", "dragon1", "mydragon"]
+        model = CandidateModel.learn(corpus, prefixes=["my", "the"], suffixes=["1", "123", "99"],
+                                     base_words=["dragon", "monkey"])
+        suffix = model.entry_weights['suffix']
+        self.assertGreater(suffix['123'], suffix['1'])
+        self.assertGreater(suffix['1'], suffix['99'])
+        self.assertGreater(model.entry_weights['baseword']['dragon'], model.entry_weights['baseword']['monkey'])
+        self.assertGreater(model.strategy_weights['suffix'], model.strategy_weights['prefix'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,7 @@
+import os
+import tempfile
 import unittest
-from trie import Trie
+from trie import Trie, CompactTrie
 
 class TestTrie(unittest.TestCase):
     def setUp(self):
@@ -32,5 +34,54 @@ class TestTrie(unittest.TestCase):
             self.assertIn(word[0], tree_str)  # First char should definitely be there
         for word in self.words:
             self.assertIn(word, tree_str)
+
+    def test_list_all_long_word(self):
+        trie = Trie()
+        trie.insert("a" * 5000)
+        self.assertEqual(trie.list_all(), ["a" * 5000])
+
+    def test_iterates_prefixes_before_longer_words(self):
+        trie = Trie()
+        for word in ["ab", "a", "abc", "b", "ac"]:
+            trie.insert(word)
+        self.assertEqual(list(trie), ["a", "ab", "abc", "ac", "b"])
+
+
+class TestCompactTrie(unittest.TestCase):
+    def setUp(self):
+        self.words = ["hello", "hell", "help", "hero", "her", "jello", "caf\u00e9"]
+        self.trie = CompactTrie.from_words(self.words)
+
+    def test_search(self):
+        for word in self.words:
+            self.assertTrue(self.trie.search(word))
+        self.assertFalse(self.trie.search("he"))
+        self.assertFalse(self.trie.search("helmet"))
+
+    def test_starts_with(self):
+        self.assertTrue(self.trie.starts_with("hel"))
+        self.assertFalse(self.trie.starts_with("ho"))
+
+    def test_enumeration_sorted(self):
+        self.assertEqual(self.trie.list_all(), sorted(self.words))
+        self.assertEqual(list(self.trie.iter_words("hel")), ["hell", "hello", "help"])
+        self.assertEqual(len(self.trie), len(self.words))
+        self.assertEqual(CompactTrie.from_words(["a" * 5000]).list_all(), ["a" * 5000])
+
+    def test_shares_suffixes(self):
+        # "hello" and "jello" share the "ello" tail, so fewer nodes than a plain trie.
+        plain_nodes = 1 + len({w[:i] for w in self.words for i in range(1, len(w) + 1)})
+        self.assertLess(self.trie.node_count, plain_nodes)
+
+    def test_save_and_load(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "words.dawg")
+            self.trie.save(path)
+            loaded = CompactTrie.load(path)
+            self.assertEqual(loaded.list_all(), self.trie.list_all())
+            self.assertTrue(loaded.search("hero"))
+            self.assertFalse(loaded.search("her0"))
+
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
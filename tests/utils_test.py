@@ -0,0 +1,102 @@
+import os
+import random
+import shutil
+import tempfile
+import unittest
+from collections import Counter
+
+import utils
+from utils.sampling import reservoir_sample, sample_indices, sample_lines, sample_sequence
+
+
+class CountingRandom(random.Random):
+    draws = 0
+
+    def random(self):
+        self.draws += 1
+        return super().random()
+
+
+class TestReservoirSample(unittest.TestCase):
+
+    def test_small_populations(self):
+        self.assertEqual(reservoir_sample(iter("abc"), 5), list("abc"))
+        self.assertEqual(reservoir_sample(range(10), 0), [])
+        self.assertEqual(sorted(reservoir_sample(range(10), 10)), list(range(10)))
+
+    def test_uniform(self):
+        rng = random.Random(0)
+        counts = Counter()
+        for _ in range(4000):
+            sample = reservoir_sample(range(20), 5, rng)
+            self.assertEqual(len(set(sample)), 5)
+            counts.update(sample)
+        # Each item is expected 1000 times.
+        self.assertTrue(all(900 < counts[i] < 1100 for i in range(20)), counts)
+
+    def test_skips_instead_of_drawing_per_item(self):
+        rng = CountingRandom(1)
+        self.assertEqual(len(reservoir_sample(range(1_000_000), 100, rng)), 100)
+        # About 3 * k * ln(n / k) draws, against a million per-item draws.
+        self.assertLess(rng.draws, 5000)
+
+    def test_secure_sample_keeps_its_interface(self):
+        self.assertEqual(sorted(utils.secure_sample(["a", "b"], 3)), ["a", "b"])
+        self.assertEqual(len(set(utils.secure_sample(list(range(100)), 7))), 7)
+
+
+class TestSequenceSample(unittest.TestCase):
+
+    def test_indices_are_distinct_and_uniform(self):
+        rng = random.Random(2)
+        counts = Counter()
+        for _ in range(3000):
+            indices = sample_indices(10, 3, rng)
+            self.assertEqual(len(set(indices)), 3)
+            counts.update(indices)
+        self.assertTrue(all(800 < counts[i] < 1000 for i in range(10)), counts)
+        self.assertEqual(sorted(sample_indices(4, 9, rng)), [0, 1, 2, 3])
+
+    def test_sequence(self):
+        words = [f"w{i}" for i in range(50)]
+        self.assertTrue(set(sample_sequence(words, 10, random.Random(3))) <= set(words))
+
+
+class TestSampleLines(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, 'words.txt')
+        # Line lengths from 1 to 40 bytes, a blank line every tenth line.
+        with open(self.path, 'w') as f:
+            for i in range(400):
+                f.write('\n' if i % 10 == 9 else 'x' * (i % 40) + f"{i}\n")
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_streaming(self):
+        sample = sample_lines(self.path, 50, rng=random.Random(4))
+        self.assertEqual(len(set(sample)), 50)
+        self.assertTrue(all(line.strip() == line and line for line in sample))
+
+    def test_seek_is_not_biased_towards_long_lines(self):
+        rng = random.Random(5)
+        counts = Counter()
+        for _ in range(3000):
+            counts.update(len(line) > 20 for line in sample_lines(self.path, 4, seek=True, rng=rng))
+        # Half the non-empty lines are longer than 20 characters.
+        self.assertAlmostEqual(counts[True] / sum(counts.values()), 0.5, delta=0.03)
+
+    def test_seek_falls_back_when_k_is_close_to_the_line_count(self):
+        sample = sample_lines(self.path, 360, seek=True, rng=random.Random(6))
+        self.assertEqual(len(set(sample)), 360)
+        self.assertEqual(len(sample_lines(self.path, 1000, seek=True)), 360)
+
+    def test_load_wordlist_sample(self):
+        trie = utils.load_wordlist_sample(self.path, 25, seek=True)
+        self.assertEqual(len(list(trie)), 25)
+
+
+if __name__ == '__main__':
+    unittest.main()
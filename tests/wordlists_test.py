@@ -0,0 +1,96 @@
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+import warnings
+from unittest import mock
+
+import mutations
+import wordlists
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestWordlistRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        for name, lines in {'a.txt': ['Foo', 'bar', ''], 'b.txt': ['BAR', 'baz']}.items():
+            with open(os.path.join(self.tmpdir.name, name), 'w') as f:
+                f.write('\n'.join(lines) + '\n')
+        self.registry = wordlists.WordlistRegistry(
+            {'prefix': ('a.txt', 'b.txt'), 'suffix': ('b.txt',)}, data_dir=self.tmpdir.name
+        )
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_nothing_loaded_until_accessed(self):
+        self.assertEqual(self.registry.loaded_files(), [])
+        self.registry['suffix']
+        self.assertEqual(self.registry.loaded_files(), ['b.txt'])
+
+    def test_category_concatenates_files(self):
+        self.assertEqual(self.registry['prefix'], ['foo', 'bar', 'bar', 'baz'])
+
+    def test_unique_is_ordered(self):
+        self.assertEqual(self.registry.unique('prefix'), ['foo', 'bar', 'baz'])
+
+    def test_missing_file_is_empty(self):
+        registry = wordlists.WordlistRegistry({'prefix': ('nope.txt',)}, data_dir=self.tmpdir.name)
+        with warnings.catch_warnings(record=True):
+            warnings.simplefilter('always')
+            self.assertEqual(registry['prefix'], [])
+
+    def test_refresh_rereads_changed_sources(self):
+        version = self.registry.refresh()
+        self.assertEqual(self.registry['suffix'], ['bar', 'baz'])
+        self.assertEqual(self.registry.refresh(), version)
+        self.assertEqual(self.registry.loaded_files(), ['b.txt'])
+        path = os.path.join(self.tmpdir.name, 'b.txt')
+        with open(path, 'w') as f:
+            f.write('qux\n')
+        os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+        self.assertNotEqual(self.registry.refresh(), version)
+        self.assertEqual(self.registry['suffix'], ['qux'])
+
+    def test_clear_while_loading_keeps_new_cache_clean(self):
+        load = wordlists.load_wordlist
+
+        def load_then_clear(path):
+            words = load(path)
+            self.registry.clear()
+            return words
+
+        with mock.patch.object(wordlists, 'load_wordlist', load_then_clear):
+            self.assertEqual(self.registry.unique('suffix'), ['bar', 'baz'])
+        self.assertEqual(self.registry.loaded_files(), [])
+
+    def test_module_lists_follow_refresh(self):
+        with mock.patch.object(wordlists, 'registry', self.registry):
+            self.assertEqual(mutations.suffixes, ['bar', 'baz'])
+            path = os.path.join(self.tmpdir.name, 'b.txt')
+            with open(path, 'w') as f:
+                f.write('qux\n')
+            os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+            self.registry.refresh()
+            self.assertEqual(mutations.suffixes, ['qux'])
+
+    def test_unknown_category(self):
+        with self.assertRaises(KeyError):
+            self.registry['baseword']
+
+
+class TestColdImport(unittest.TestCase):
+
+    # Timing lives in benchmarks/bench_import.py; this only checks the cause.
+    def test_import_mutations_does_not_load_wordlists(self):
+        probe = "import mutations, wordlists; print(wordlists.registry.loaded_files())"
+        out = subprocess.run([sys.executable, '-c', probe], cwd=ROOT,
+                             capture_output=True, text=True, check=True)
+        self.assertEqual(out.stdout.strip(), '[]')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,66 @@
+import os
+import tempfile
+import unittest
+
+import wordlists
+from wordstore import WordStore, compile_store, is_stale, open_store
+
+
+class TestWordStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.write('a.txt', ['Foo', 'bar', 'baz'])
+        self.write('b.txt', ['bar', 'qux'])
+        self.registry = wordlists.WordlistRegistry(
+            {'prefix': ('a.txt',), 'suffix': ('b.txt', 'a.txt')}, data_dir=self.tmpdir.name
+        )
+        self.path = os.path.join(self.tmpdir.name, 'store.bin')
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write(self, name, lines, mtime=None):
+        path = os.path.join(self.tmpdir.name, name)
+        with open(path, 'w') as f:
+            f.write('\n'.join(lines) + '\n')
+        if mtime is not None:
+            os.utime(path, ns=(mtime, mtime))
+
+    def test_categories_match_registry(self):
+        compile_store(self.path, self.registry)
+        with WordStore(self.path) as store:
+            for category in self.registry:
+                self.assertEqual(list(store[category]), self.registry.unique(category))
+
+    def test_strings_stored_once(self):
+        compile_store(self.path, self.registry)
+        with WordStore(self.path) as store:
+            self.assertEqual(len(store), 4)  # foo, bar, baz, qux
+
+    def test_slices_and_raw_access(self):
+        compile_store(self.path, self.registry)
+        with WordStore(self.path) as store:
+            suffixes = store['suffix']
+            self.assertEqual(list(suffixes[1:3]), ['qux', 'foo'])
+            self.assertEqual(suffixes[-1], 'baz')
+            self.assertEqual(bytes(suffixes.raw(0)), b'bar')
+
+    def test_rebuilt_when_source_changes(self):
+        open_store(self.path, self.registry).close()
+        self.assertFalse(is_stale(self.path, self.registry))
+        self.write('b.txt', ['zap'], mtime=1_000_000_000)
+        self.assertTrue(is_stale(self.path, self.registry))
+        with open_store(self.path, self.registry) as store:
+            self.assertEqual(list(store['suffix']), ['zap', 'foo', 'bar', 'baz'])
+
+    def test_empty_registry_is_used(self):
+        empty = wordlists.WordlistRegistry({}, data_dir=self.tmpdir.name)
+        compile_store(self.path, empty)
+        self.assertFalse(is_stale(self.path, empty))
+        with WordStore(self.path) as store:
+            self.assertEqual(len(store), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
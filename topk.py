@@ -0,0 +1,263 @@
+# topk.py
+"""
+Probability-ordered (best-first) candidate generation.
+
+Every strategy and every wordlist entry has a probability. A candidate's
+score is the sum of the log-probabilities along the path that produced it
+(password -> leetspeak -> suffix -> ...). iter_top_candidates walks the same
+layered expansion as mutations.iter_mutations, but from a priority queue,
+so candidates come out in non-increasing probability and the first N of a
+capped run are the N most likely ones instead of an arbitrary slice.
+
+The full space is never materialized. Expanding a candidate does not push
+its children. It pushes one lazy stream per strategy, with entries sorted by
+probability, and a stream is only advanced when its next child reaches the
+top of the heap. The queue therefore holds a few entries per emitted
+candidate, whatever the size of the wordlists.
+
+Weights come from a CandidateModel, with uniform defaults or learned from a
+corpus such as commoncredentials.txt via CandidateModel.learn().
+"""
+import heapq
+import math
+from itertools import count
+
+import wordlists
+from mutations import LEET_MAP, iter_capitalization
+
+STRATEGIES = ('capitalization', 'suffix', 'prefix', 'base_words')
+
+DEFAULT_STRATEGY_WEIGHTS = {
+    'capitalization': 0.25,
+    'suffix': 0.35,
+    'prefix': 0.15,
+    'base_words': 0.25,
+}
+
+
+class CandidateModel:
+    """
+    Probabilities used to rank candidates.
+
+    Parameters:
+        strategy_weights (dict): Probability of applying each strategy.
+        entry_weights (dict): {'prefix'|'suffix'|'baseword': {entry: probability}}.
+            Entries without a weight share the leftover mass equally.
+        leet_rate (float): Probability that a substitutable character is
+            replaced by one of its (first two) leetspeak substitutions, from
+            0 (never) to 1 (always).
+    """
+
+    def __init__(self, strategy_weights=None, entry_weights=None, leet_rate=0.1):
+        if not 0.0 <= leet_rate <= 1.0:
+            raise ValueError(f"leet_rate must be between 0 and 1, got {leet_rate}")
+        self.strategy_weights = dict(DEFAULT_STRATEGY_WEIGHTS)
+        self.strategy_weights.update(strategy_weights or {})
+        self.entry_weights = entry_weights or {}
+        self.leet_rate = leet_rate
+        # category -> (list, len, ranking) for the list ranked last.
+        self._ranked = {}
+
+    def strategy_logp(self, strategy):
+        return math.log(self.strategy_weights[strategy])
+
+    def ranked_entries(self, category, entries):
+        """
+        [(log-probability, entry)] sorted from most to least likely.
+
+        Cached for the last list object seen per category, since ranking
+        the full wordlists costs far more than generating the first few
+        thousand candidates. One entry per category keeps a long-lived
+        model from holding on to every list it was ever given.
+        """
+        cached = self._ranked.get(category)
+        if cached is None or cached[0] is not entries or cached[1] != len(entries):
+            cached = self._ranked[category] = (entries, len(entries), self._rank(category, entries))
+        return cached[2]
+
+    def _rank(self, category, entries):
+        weights = self.entry_weights.get(category, {})
+        entries = list(dict.fromkeys(entries))
+        known = sum(weights.get(e, 0.0) for e in entries)
+        unknown = sum(1 for e in entries if e not in weights)
+        # Unweighted entries split whatever probability mass is left.
+        rest = max(1.0 - known, 1e-12) / unknown if unknown else 0.0
+        ranked = [(math.log(weights.get(e) or rest), e) for e in entries]
+        ranked.sort(key=lambda item: -item[0])
+        return ranked
+
+    @classmethod
+    def learn(cls, corpus, prefixes=(), suffixes=(), base_words=(), leet_rate=0.1, min_affix=1):
+        """
+        Estimates weights from a corpus of real passwords (one per item).
+
+        An entry's weight is how often it occurs in the corpus in its role:
+        a prefix at the start of a password, a suffix at the end, a base word
+        at either end. Counts are add-one smoothed. Strategy weights are the
+        share of corpus passwords each strategy can explain.
+        """
+        roles = {'prefix': set(prefixes), 'suffix': set(suffixes), 'baseword': set(base_words)}
+        counts = {role: {} for role in roles}
+        explained = dict.fromkeys(STRATEGIES, 0)
+        total = 0
+        for line in corpus:
+            line = line.strip()
+            if not line:
+                continue
+            total += 1
+            lowered = line.lower()
+            hit = dict.fromkeys(('prefix', 'suffix', 'baseword'), False)
+            for i in range(min_affix, len(lowered)):
+                head, tail = lowered[:i], lowered[i:]
+                if head in roles['prefix']:
+                    counts['prefix'][head] = counts['prefix'].get(head, 0) + 1
+                    hit['prefix'] = True
+                if tail in roles['suffix']:
+                    counts['suffix'][tail] = counts['suffix'].get(tail, 0) + 1
+                    hit['suffix'] = True
+                for part in (head, tail):
+                    if part in roles['baseword']:
+                        counts['baseword'][part] = counts['baseword'].get(part, 0) + 1
+                        hit['baseword'] = True
+            explained['prefix'] += hit['prefix']
+            explained['suffix'] += hit['suffix']
+            explained['base_words'] += hit['baseword']
+            explained['capitalization'] += line != lowered
+
+        entry_weights = {}
+        for role, role_counts in counts.items():
+            denominator = sum(role_counts.values()) + len(roles[role])
+            entry_weights[role] = {entry: (role_counts.get(entry, 0) + 1) / denominator
+                                   for entry in roles[role]}
+        strategy_weights = {strategy: (explained[strategy] + 1) / (total + len(STRATEGIES))
+                            for strategy in STRATEGIES}
+        return cls(strategy_weights, entry_weights, leet_rate)
+
+
+def best_first_product(options):
+    """
+    Yields (log-probability, string) over the cartesian product of
+    ``options`` in non-increasing probability order.
+
+    ``options`` is a list of per-position lists of (log-probability, string),
+    each sorted from most to least likely. A vector is only generated from
+    the parent that differs in its last non-zero coordinate, so no
+    combination is produced twice and the heap stays small.
+    """
+    if any(not opts for opts in options):
+        return
+    start = tuple(0 for _ in options)
+    heap = [(-sum(opts[0][0] for opts in options), start, 0)]
+    while heap:
+        neg_logp, vector, pivot = heapq.heappop(heap)
+        yield -neg_logp, ''.join(options[i][d][1] for i, d in enumerate(vector))
+        for j in range(pivot, len(options)):
+            d = vector[j] + 1
+            if d < len(options[j]):
+                child = vector[:j] + (d,) + vector[j + 1:]
+                delta = options[j][d][0] - options[j][d - 1][0]
+                heapq.heappush(heap, (neg_logp - delta, child, j))
+
+
+def _leet_options(password, leet_rate):
+    options = []
+    for c in password:
+        subs = LEET_MAP.get(c.lower(), [])[:2]
+        opts = []
+        # At a rate of exactly 0 or 1 one branch is impossible and is left out.
+        if not subs or leet_rate < 1.0:
+            opts.append((math.log(1.0 - leet_rate) if subs else 0.0, c))
+        if subs and leet_rate > 0.0:
+            sub = math.log(leet_rate / len(subs))
+            opts.extend((sub, s) for s in subs)
+        opts.sort(key=lambda item: -item[0])
+        options.append(opts)
+    return options
+
+
+_default_model = None
+_default_version = None
+
+
+def default_model():
+    """
+    The uniform CandidateModel, shared so its rankings are reused across
+    calls; rebuilt when the wordlists change (see registry.version()).
+    """
+    global _default_model, _default_version
+    version = wordlists.registry.version()
+    if _default_model is None or version != _default_version:
+        _default_model, _default_version = CandidateModel(), version
+    return _default_model
+
+
+def iter_top_candidates(password, suffixes, prefixes, base_words, depth=2, max_mutations=None,
+                        model=None, scores=False):
+    """
+    Best-first counterpart of iter_mutations.
+
+    Parameters:
+        password (str): The base password to mutate.
+        suffixes, prefixes, base_words (list): Wordlists, as for iter_mutations.
+        depth (int): How many mutation layers to apply after leetspeak.
+        max_mutations (int): Optional cap on total number of mutations.
+        model (CandidateModel): Weights; default_model() if omitted.
+        scores (bool): Yield (candidate, log-probability) pairs instead of strings.
+
+    Yields:
+        Unique candidates in non-increasing probability.
+    """
+    model = model or default_model()
+    ranked = {
+        'suffix': model.ranked_entries('suffix', suffixes),
+        'prefix': model.ranked_entries('prefix', prefixes),
+        'baseword': model.ranked_entries('baseword', base_words),
+    }
+    strategy_logp = {strategy: model.strategy_logp(strategy) for strategy in STRATEGIES}
+    cap_logp = -math.log(5)
+
+    def children(pwd):
+        """One lazy, sorted stream of (log-probability delta, child) per strategy."""
+        yield strategy_logp['capitalization'], ((cap_logp, m) for m in iter_capitalization(pwd))
+        yield strategy_logp['suffix'], ((lp, pwd + s) for lp, s in ranked['suffix'])
+        yield strategy_logp['prefix'], ((lp, p + pwd) for lp, p in ranked['prefix'])
+        base_logp = strategy_logp['base_words'] - math.log(3)
+        yield base_logp, ((lp, m) for lp, word in ranked['baseword']
+                          for m in (word, word + pwd, pwd + word))
+
+    tiebreak = count()
+    # Heap entries are (-logp, tiebreak, layer, candidate, stream). For a
+    # plain candidate ``stream`` is None. For a stream entry ``candidate`` is
+    # the stream's next child and ``stream`` is (parent log-probability,
+    # remaining iterator); popping it queues that child and re-queues the
+    # stream at its following child.
+    heap = []
+
+    def push_stream(base, layer, stream):
+        for delta, child in stream:
+            heapq.heappush(heap, (-(base + delta), next(tiebreak), layer, child, (base, stream)))
+            return
+
+    push_stream(0.0, 0, best_first_product(_leet_options(password, model.leet_rate)))
+
+    seen = set()
+    emitted = 0
+    while heap:
+        neg_logp, _, layer, candidate, stream = heapq.heappop(heap)
+        if stream is not None:
+            base, rest = stream
+            push_stream(base, layer, rest)
+            # The child itself becomes a candidate entry with the same score.
+            heapq.heappush(heap, (neg_logp, next(tiebreak), layer, candidate, None))
+            continue
+        if candidate in seen:
+            continue
+        if max_mutations and emitted >= max_mutations:
+            return
+        seen.add(candidate)
+        emitted += 1
+        yield (candidate, -neg_logp) if scores else candidate
+
+        if layer < depth:
+            for strategy_delta, stream in children(candidate):
+                push_stream(-neg_logp + strategy_delta, layer + 1, stream)
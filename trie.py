@@ -1,4 +1,12 @@
+import mmap
+import struct
+from array import array
+from bisect import bisect_left
+
+
 class TrieNode:
+    __slots__ = ('children', 'end')
+
     def __init__(self):
         self.children = {}
         self.end = False
@@ -16,17 +24,28 @@ class Trie:
             node = node.children[char]
         node.end = True
 
-    def list_all(self):
-        results = []
-
-        def dfs(node, path):
-            if node.end:
-                results.append(''.join(path))
-            for char, child in node.children.items():
-                dfs(child, path + [char])
+    def __iter__(self):
+        # Explicit stack instead of recursion: no recursion limit on long
+        # strings. The word so far is a list of characters, joined only when
+        # a word is yielded, so a long chain is not copied at every step.
+        path = []
+        if self.root.end:
+            yield ''
+        stack = [iter(self.root.children.items())]
+        while stack:
+            for char, child in stack[-1]:
+                path.append(char)
+                if child.end:
+                    yield ''.join(path)
+                stack.append(iter(child.children.items()))
+                break
+            else:
+                stack.pop()
+                if stack:
+                    path.pop()
 
-        dfs(self.root, [])
-        return results
+    def list_all(self):
+        return list(self)
 
     def search(self, password):
         node = self.root
@@ -46,3 +65,202 @@ class Trie:
 
     def __str__(self):
         return '\n'.join(sorted(self.list_all()))
+
+
+class _BuildNode:
+    __slots__ = ('edges', 'final')
+
+    def __init__(self):
+        self.edges = {}
+        self.final = False
+
+    def signature(self):
+        return self.final, tuple((char, id(child)) for char, child in self.edges.items())
+
+
+class CompactTrie:
+    """
+    Read-only trie stored as a minimal DAWG in four flat arrays.
+
+    Common suffixes are shared as well as common prefixes, and each node is
+    a couple of array slots instead of a Python object with its own dict:
+
+        first_edge[n] .. first_edge[n + 1]   edge range of node n
+        final[n]                             1 if a word ends at node n
+        labels[e], targets[e]                code point and target of edge e
+
+    Edges of a node are sorted by label, so lookups bisect and enumeration
+    yields words in code point order. ``save``/``load`` write the arrays as
+    they are; loading memory-maps the file instead of rebuilding anything.
+    """
+
+    MAGIC = b'LETHEDAWG1'
+
+    def __init__(self, first_edge, final, labels, targets, size, _mmap=None):
+        self.first_edge = first_edge
+        self.final = final
+        self.labels = labels
+        self.targets = targets
+        self.size = size
+        self._mmap = _mmap
+
+    @classmethod
+    def from_words(cls, words):
+        """Builds the DAWG (Daciuk et al. incremental construction over sorted input)."""
+        root = _BuildNode()
+        register = {}
+        unchecked = []  # (parent, char, child) along the path of the previous word
+        previous = ''
+        size = 0
+
+        def minimize(down_to):
+            while len(unchecked) > down_to:
+                parent, char, child = unchecked.pop()
+                key = child.signature()
+                if key in register:
+                    parent.edges[char] = register[key]
+                else:
+                    register[key] = child
+
+        for word in sorted({word.strip() for word in words}):
+            common = 0
+            for a, b in zip(word, previous):
+                if a != b:
+                    break
+                common += 1
+            minimize(common)
+            node = unchecked[-1][2] if unchecked else root
+            for char in word[common:]:
+                child = _BuildNode()
+                node.edges[char] = child
+                unchecked.append((node, char, child))
+                node = child
+            node.final = True
+            previous = word
+            size += 1
+        minimize(0)
+        return cls._freeze(root, size)
+
+    @classmethod
+    def _freeze(cls, root, size):
+        ids = {id(root): 0}
+        order = [root]
+        first_edge = array('I', [0])
+        final = bytearray()
+        labels = array('I')
+        targets = array('I')
+        i = 0
+        while i < len(order):
+            node = order[i]
+            final.append(node.final)
+            for char in sorted(node.edges):
+                child = node.edges[char]
+                if id(child) not in ids:
+                    ids[id(child)] = len(order)
+                    order.append(child)
+                labels.append(ord(char))
+                targets.append(ids[id(child)])
+            first_edge.append(len(labels))
+            i += 1
+        return cls(first_edge, bytes(final), labels, targets, size)
+
+    def __len__(self):
+        return self.size
+
+    @property
+    def node_count(self):
+        return len(self.final)
+
+    def _child(self, node, char):
+        lo, hi = self.first_edge[node], self.first_edge[node + 1]
+        label = ord(char)
+        e = bisect_left(self.labels, label, lo, hi)
+        if e < hi and self.labels[e] == label:
+            return self.targets[e]
+        return None
+
+    def _walk(self, string):
+        node = 0
+        for char in string.strip():
+            node = self._child(node, char)
+            if node is None:
+                return None
+        return node
+
+    def search(self, password):
+        node = self._walk(password)
+        return node is not None and bool(self.final[node])
+
+    __contains__ = search
+
+    def starts_with(self, prefix):
+        return self._walk(prefix) is not None
+
+    def iter_words(self, prefix=''):
+        """Yields every stored word starting with ``prefix``, in code point order."""
+        start = self._walk(prefix)
+        if start is None:
+            return
+        first_edge, final, labels, targets = self.first_edge, self.final, self.labels, self.targets
+        prefix = prefix.strip()
+        if final[start]:
+            yield prefix
+        # Each frame is (next edge, end of edge range); the stack depth is
+        # the word length, never Python recursion. ``path`` holds the
+        # characters below ``prefix`` and is joined only for a yielded word.
+        path = []
+        stack = [(first_edge[start], first_edge[start + 1])]
+        while stack:
+            e, end = stack.pop()
+            if e == end:
+                if stack:
+                    path.pop()
+                continue
+            stack.append((e + 1, end))
+            child = targets[e]
+            path.append(chr(labels[e]))
+            if final[child]:
+                yield prefix + ''.join(path)
+            stack.append((first_edge[child], first_edge[child + 1]))
+
+    __iter__ = iter_words
+
+    def list_all(self):
+        return list(self)
+
+    def __str__(self):
+        return '\n'.join(self)
+
+    def save(self, path):
+        with open(path, 'wb') as f:
+            f.write(self.MAGIC)
+            f.write(struct.pack('=4Q', self.size, len(self.final), len(self.labels), 0))
+            array('I', self.first_edge).tofile(f)
+            array('I', self.labels).tofile(f)
+            array('I', self.targets).tofile(f)
+            f.write(self.final)
+
+    @classmethod
+    def load(cls, path):
+        """Memory-maps a file written by ``save``; nothing is rebuilt or copied."""
+        with open(path, 'rb') as f:
+            mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(mm)
+        if view[:len(cls.MAGIC)] != cls.MAGIC:
+            raise ValueError(f"{path} is not a saved CompactTrie")
+        pos = len(cls.MAGIC)
+        size, nodes, edges, _ = struct.unpack_from('=4Q', mm, pos)
+        pos += 32
+
+        def take(count, fmt=None):
+            nonlocal pos
+            width = struct.calcsize(fmt) if fmt else 1
+            part = view[pos:pos + count * width]
+            pos += count * width
+            return part.cast(fmt) if fmt else part
+
+        first_edge = take(nodes + 1, 'I')
+        labels = take(edges, 'I')
+        targets = take(edges, 'I')
+        final = take(nodes)
+        return cls(first_edge, final, labels, targets, size, _mmap=mm)
@@ -0,0 +1,31 @@
+from trie import Trie
+from utils.sampling import reservoir_sample, sample_lines
+
+
+def secure_sample(population, k):
+    """Securely sample k unique elements from population using secrets."""
+    return reservoir_sample(population, k)
+
+
+def load_wordlist_sample(filepath="commoncredentials.txt", sample_size=1000, seek=False):
+    trie = Trie()
+    for password in sample_lines(filepath, sample_size, seek=seek):
+        trie.insert(password)
+    return trie
+
+
+def load_and_print_trie(filepath, sample_size=None):
+    trie = Trie()
+    with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
+        lines = filter(None, map(str.strip, f))
+        if sample_size:
+            lines = reservoir_sample(lines, sample_size)
+        for word in lines:
+            trie.insert(word)
+    print(trie)  # This will call your __str__ method
+    return trie
+
+
+
+if __name__ == "__main__":
+    load_and_print_trie("commoncredentials.txt", sample_size=20)
@@ -0,0 +1,129 @@
+# utils/sampling.py
+"""
+Uniform samples of k items from streams and files too large to hold in memory.
+
+``reservoir_sample`` implements Li's Algorithm L. After the reservoir is
+filled it draws how many items to skip rather than one random number per
+item, so a pass over n items makes O(k log(n/k)) random draws and holds
+only k items. Skipped items are consumed with ``islice``, without running
+any Python code per item.
+
+``sample_lines(path, k)`` applies that to the non-empty lines of a file.
+With ``seek=True`` the file is memory-mapped and lines are picked by
+random byte offset instead, so the file is never read in full. A
+candidate line is then kept with probability 1/(its length), which cancels
+the bias towards long lines. ``sample_sequence`` samples from anything
+that supports len() and indexing (a list, a wordstore.StoredWordlist)
+with Floyd's algorithm, using k draws.
+
+Every function draws from ``secrets.SystemRandom`` unless given another
+``rng`` (e.g. a seeded random.Random in tests). The results are in no
+particular order.
+"""
+import mmap
+import os
+import secrets
+from itertools import islice
+from math import exp, floor, log, log1p
+
+_system_random = secrets.SystemRandom()
+
+
+def _uniform(rng):
+    """A float in (0, 1); random() can return exactly 0.0."""
+    u = rng.random()
+    while u == 0.0:
+        u = rng.random()
+    return u
+
+
+def reservoir_sample(iterable, k, rng=None):
+    """
+    k items chosen uniformly without replacement from ``iterable``.
+
+    Returns:
+        list: All items if there are k or fewer.
+    """
+    rng = rng or _system_random
+    items = iter(iterable)
+    reservoir = list(islice(items, k))
+    if len(reservoir) < k or k <= 0:
+        return reservoir
+    w = exp(log(_uniform(rng)) / k)
+    while w > 0.0:
+        skip = floor(log(_uniform(rng)) / log1p(-w))
+        # islice consumes the skipped items in C and yields the next one.
+        for item in islice(items, skip, skip + 1):
+            reservoir[rng.randrange(k)] = item
+            break
+        else:
+            return reservoir
+        w *= exp(log(_uniform(rng)) / k)
+    return reservoir
+
+
+def sample_indices(n, k, rng=None):
+    """k distinct indices in range(n), uniformly, with Floyd's algorithm."""
+    rng = rng or _system_random
+    chosen = set()
+    for j in range(max(n - k, 0), n):
+        i = rng.randrange(j + 1)
+        chosen.add(j if i in chosen else i)
+    return list(chosen)
+
+
+def sample_sequence(sequence, k, rng=None):
+    """k items of a random-access ``sequence``, reading only those items."""
+    return [sequence[i] for i in sample_indices(len(sequence), k, rng)]
+
+
+def sample_lines(path, k, seek=False, rng=None, encoding='utf-8'):
+    """
+    k non-empty lines of the file at ``path``, stripped, chosen uniformly.
+
+    Parameters:
+        seek (bool): Pick lines by random offset in a memory-mapped view of
+            the file instead of reading it through. Fast when k is small
+            next to the number of lines. When the file turns out to have
+            too few lines, this falls back to reading it through.
+        rng: Random source with random() and randrange(), secrets by default.
+    """
+    rng = rng or _system_random
+    if seek:
+        sample = _seek_sample(path, k, rng, encoding)
+        if sample is not None:
+            return sample
+    with open(path, 'r', encoding=encoding, errors='ignore') as f:
+        return reservoir_sample(filter(None, map(str.strip, f)), k, rng)
+
+
+def _seek_sample(path, k, rng, encoding):
+    """None if the file does not have comfortably more than k non-empty lines."""
+    if k <= 0:
+        return []
+    size = os.path.getsize(path)
+    if size == 0:
+        return None
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        chosen = {}
+        accepted = 0
+        while len(chosen) < k:
+            offset = rng.randrange(size)
+            start = data.rfind(b'\n', 0, offset) + 1
+            end = data.find(b'\n', offset)
+            if end < 0:
+                end = size
+            span = end - start + (end < size)  # offsets that land on this line, newline included
+            # Keeping a line with probability 1 / span makes every line
+            # equally likely, however long it is.
+            if rng.randrange(span):
+                continue
+            accepted += 1
+            # Mostly repeats or blank lines: k is close to the number of lines.
+            if accepted > 8 * k + 64:
+                return None
+            if start not in chosen:
+                line = data[start:end].decode(encoding, 'ignore').strip()
+                if line:
+                    chosen[start] = line
+        return list(chosen.values())
@@ -1,38 +1,169 @@
 # wordlists.py
+import hashlib
+import json
+import os
+import threading
+import warnings
+from collections.abc import Mapping
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+# Source files for each category, relative to DATA_DIR.
+CATEGORIES = {
+    'prefix': (
+        'commoncredentials.txt',
+        'colors.txt',
+        'basewords/names.txt',
+        'basewords/surnames.txt',
+    ),
+    'suffix': (
+        'zipcodes.txt',
+        'basewords/languages.txt',
+        'dates.txt',
+    ),
+    'baseword': (
+        'basewords/books.txt',
+        'basewords/fictional.txt',
+        'basewords/cities.txt',
+        'basewords/uscities.txt',
+        'basewords/world_cities.txt',
+        'basewords/religious_terms.txt',
+        'basewords/phrases.txt',
+    ),
+}
+
 
 def load_wordlist(filepath):
     with open(filepath, 'r', encoding='utf-8', errors='ignore') as f:
         return [line.strip().lower() for line in f if line.strip()]
 
+
+class WordlistRegistry(Mapping):
+    """
+    Lazily populated mapping of category -> wordlist.
+
+    Nothing is read when the registry is created. Each source file is parsed
+    the first time a category that uses it is accessed and is then cached,
+    so a process that only needs e.g. the suffixes never touches the other
+    files. Missing source files (commoncredentials.txt is not shipped with
+    the repo) are treated as empty with a warning.
+    """
+
+    def __init__(self, categories=CATEGORIES, data_dir=DATA_DIR):
+        self.categories = categories
+        self.data_dir = data_dir
+        # Parsed files, concatenated and deduplicated categories. clear()
+        # swaps in new dicts rather than emptying these, so a request
+        # thread still filling the old ones never writes into the new ones.
+        self._files = {}
+        self._combined = {}
+        self._unique = {}
+        # version() when the cached lists were last dropped, see refresh().
+        self._version = None
+        self._lock = threading.Lock()
+
+    def path(self, name):
+        return os.path.join(self.data_dir, name)
+
+    def file(self, name):
+        """Returns the parsed contents of a single source file."""
+        files = self._files
+        words = files.get(name)
+        if words is None:
+            path = self.path(name)
+            if os.path.exists(path):
+                words = load_wordlist(path)
+            else:
+                warnings.warn(f"wordlist {path} not found, treating it as empty")
+                words = []
+            files[name] = words
+        return words
+
+    def __getitem__(self, category):
+        """Concatenation of a category's files, duplicates included."""
+        combined = self._combined
+        words = combined.get(category)
+        if words is None:
+            words = []
+            for name in self.categories[category]:
+                words.extend(self.file(name))
+            combined[category] = words
+        return words
+
+    def unique(self, category):
+        """Deduplicated category, in first-seen order so it is stable across processes."""
+        unique = self._unique
+        words = unique.get(category)
+        if words is None:
+            words = unique[category] = list(dict.fromkeys(self[category]))
+        return words
+
+    def __iter__(self):
+        return iter(self.categories)
+
+    def __len__(self):
+        return len(self.categories)
+
+    def sources(self):
+        """Every source file used by any category, in category order."""
+        return list(dict.fromkeys(name for names in self.categories.values() for name in names))
+
+    def signature(self):
+        """(size, mtime_ns) per source file, None for missing ones. Cheap: only stats files."""
+        signature = {}
+        for name in self.sources():
+            try:
+                st = os.stat(self.path(name))
+            except FileNotFoundError:
+                signature[name] = None
+            else:
+                signature[name] = [st.st_size, st.st_mtime_ns]
+        return signature
+
+    def version(self):
+        """Short digest of the category layout and signature; changes whenever a source does."""
+        blob = json.dumps([self.categories, self.signature()], sort_keys=True).encode()
+        return hashlib.sha1(blob).hexdigest()[:12]
+
+    def refresh(self):
+        """
+        Drops the parsed lists if any source changed since the last refresh,
+        so they are read again on next access. Long-running processes call
+        this before using the lists.
+
+        Returns:
+            str: The version the lists will now be loaded from.
+        """
+        with self._lock:
+            version = self.version()
+            if version != self._version:
+                self._clear()
+                self._version = version
+            return version
+
+    def loaded_files(self):
+        return list(self._files)
+
+    def clear(self):
+        with self._lock:
+            self._clear()
+
+    def _clear(self):
+        self._files, self._combined, self._unique = {}, {}, {}
+
+
+registry = WordlistRegistry()
+
+
 def load_all_wordlists():
     """
-    Returns a dictionary of categorized wordlists for use in password mutation.
-    Categories: prefix, suffix, baseword
+    Returns the shared lazy registry of categorized wordlists for use in
+    password mutation. Categories: prefix, suffix, baseword
     """
-    return {
-        'prefix': (
-            load_wordlist('data/commoncredentials.txt') +
-            load_wordlist('data/colors.txt') +
-            load_wordlist('data/basewords/names.txt') +
-            load_wordlist('data/basewords/surnames.txt')
-        ),
-        'suffix': (
-            load_wordlist('data/zipcodes.txt') +
-            load_wordlist('data/basewords/languages.txt') +
-            load_wordlist('data/dates.txt')
-        ),
-        'baseword': (
-            load_wordlist('data/basewords/books.txt') +
-            load_wordlist('data/basewords/fictional.txt') +
-            load_wordlist('data/basewords/cities.txt') +
-            load_wordlist('data/basewords/uscities.txt') +
-            load_wordlist('data/basewords/world_cities.txt') +
-            load_wordlist('data/basewords/religious_terms.txt') +
-            load_wordlist('data/basewords/phrases.txt')
-        )
-    }
+    return registry
+
 
 if __name__ == '__main__':
     wordlists = load_all_wordlists()
     for role in ['prefix', 'suffix', 'baseword']:
-        print(f"{role}: {len(wordlists[role])} entries")
\ No newline at end of file
+        print(f"{role}: {len(wordlists[role])} entries")
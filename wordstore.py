@@ -0,0 +1,216 @@
+# wordstore.py
+"""
+Precompiled binary wordlist store.
+
+``compile_store`` turns the text wordlists under data/ into one file holding
+every distinct string exactly once, plus a per-category index into that
+string table. ``WordStore`` memory-maps the file read-only, so every process
+that opens it shares the same page-cache pages instead of holding its own
+copy of ~280k Python strings, and entries can be handed out as zero-copy
+memoryview slices.
+
+Layout (native byte order):
+
+    magic        8 bytes   b'LETHEWS1'
+    header_len   uint64
+    header       JSON, padded to a multiple of 8 bytes
+    offsets      uint64[count + 1]   start of each string in the blob
+    index        uint32[...]         string ids, one run per category
+    blob         utf-8 strings, back to back
+
+``open_store`` recompiles the file whenever a source .txt file changed.
+"""
+import json
+import mmap
+import os
+import struct
+from array import array
+from collections.abc import Sequence
+
+import wordlists
+
+MAGIC = b'LETHEWS1'
+FORMAT_VERSION = 1
+DEFAULT_STORE = os.path.join(wordlists.DATA_DIR, 'wordlists.bin')
+
+
+def _pad8(n):
+    return (n + 7) & ~7
+
+
+def compile_store(path=DEFAULT_STORE, registry=None):
+    """
+    Writes the binary store for ``registry`` (the shared one by default).
+
+    The file is written next to ``path`` and moved into place atomically, so
+    processes that still map an older version keep a consistent view.
+
+    Returns:
+        str: The path that was written.
+    """
+    if registry is None:
+        registry = wordlists.registry
+    # Drop lists parsed before a source changed, or the old words would be
+    # written under the new signature and the store would look fresh.
+    registry.refresh()
+    signature = registry.signature()
+
+    ids = {}
+    offsets = array('Q', [0])
+    blob = bytearray()
+    index = array('I')
+    categories = {}
+    for category in registry:
+        start = len(index)
+        for word in registry.unique(category):
+            word_id = ids.get(word)
+            if word_id is None:
+                word_id = ids[word] = len(ids)
+                blob += word.encode('utf-8')
+                offsets.append(len(blob))
+            index.append(word_id)
+        categories[category] = [start, len(index) - start]
+
+    header = {
+        'format': FORMAT_VERSION,
+        'sources': signature,
+        'count': len(ids),
+        'categories': categories,
+        'offsets': [0, offsets.itemsize * len(offsets)],
+    }
+    header['index'] = [header['offsets'][1], index.itemsize * len(index)]
+    header['blob'] = [_pad8(sum(header['index'])), len(blob)]
+    raw_header = json.dumps(header).encode()
+    raw_header += b' ' * (_pad8(len(raw_header)) - len(raw_header))
+
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC)
+        f.write(struct.pack('=Q', len(raw_header)))
+        f.write(raw_header)
+        offsets.tofile(f)
+        index.tofile(f)
+        f.write(b'\0' * (header['blob'][0] - sum(header['index'])))
+        f.write(blob)
+    os.replace(tmp_path, path)
+    return path
+
+
+def read_header(path):
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a Lethe wordlist store")
+        (header_len,) = struct.unpack('=Q', f.read(8))
+        return json.loads(f.read(header_len))
+
+
+def is_stale(path=DEFAULT_STORE, registry=None):
+    """True if the store is missing, unreadable or built from different sources."""
+    if registry is None:
+        registry = wordlists.registry
+    try:
+        header = read_header(path)
+    except (OSError, ValueError):
+        return True
+    return (header.get('format') != FORMAT_VERSION
+            or header.get('sources') != registry.signature()
+            or set(header.get('categories', ())) != set(registry))
+
+
+class WordStore:
+    """Read-only, memory-mapped view of a compiled store."""
+
+    def __init__(self, path=DEFAULT_STORE):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        if self._view[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a Lethe wordlist store")
+        (header_len,) = struct.unpack_from('=Q', self._mmap, len(MAGIC))
+        data_start = len(MAGIC) + 8 + header_len
+        self.header = json.loads(bytes(self._view[len(MAGIC) + 8:data_start]))
+
+        def section(name, fmt=None):
+            start, size = self.header[name]
+            view = self._view[data_start + start:data_start + start + size]
+            return view.cast(fmt) if fmt else view
+
+        self._offsets = section('offsets', 'Q')
+        self._index = section('index', 'I')
+        self._blob = section('blob')
+
+    def __len__(self):
+        return self.header['count']
+
+    def raw(self, word_id):
+        """Zero-copy memoryview over the utf-8 bytes of a string id."""
+        return self._blob[self._offsets[word_id]:self._offsets[word_id + 1]]
+
+    def word(self, word_id):
+        return str(self.raw(word_id), 'utf-8')
+
+    def categories(self):
+        return list(self.header['categories'])
+
+    def __getitem__(self, category):
+        start, length = self.header['categories'][category]
+        return StoredWordlist(self, self._index[start:start + length])
+
+    def close(self):
+        # Views handed out by StoredWordlist keep the mapping alive; only the
+        # store's own references are released here.
+        for name in ('_offsets', '_index', '_blob', '_view'):
+            view = self.__dict__.pop(name, None)
+            if view is not None:
+                view.release()
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class StoredWordlist(Sequence):
+    """One category of a WordStore. Slicing returns another view, never a copy."""
+
+    def __init__(self, store, ids):
+        self._store = store
+        self._ids = ids
+
+    def __len__(self):
+        return len(self._ids)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return StoredWordlist(self._store, self._ids[i])
+        return self._store.word(self._ids[i])
+
+    def raw(self, i):
+        return self._store.raw(self._ids[i])
+
+    def __iter__(self):
+        offsets, blob = self._store._offsets, self._store._blob
+        for word_id in self._ids:
+            yield str(blob[offsets[word_id]:offsets[word_id + 1]], 'utf-8')
+
+
+def open_store(path=DEFAULT_STORE, registry=None):
+    """Opens the store at ``path``, recompiling it first if any source changed."""
+    if is_stale(path, registry):
+        compile_store(path, registry)
+    return WordStore(path)
+
+
+if __name__ == '__main__':
+    store_path = compile_store()
+    with WordStore(store_path) as store:
+        print(f"{store_path}: {len(store)} distinct strings, {os.path.getsize(store_path)} bytes")
+        for category in store.categories():
+            print(f"{category}: {len(store[category])} entries")